@@ -0,0 +1,325 @@
+"""
+LEADGen AI - Benchmarks
+Offline latency and throughput benchmarks for extraction, parsing, reports and UI charts.
+
+    python benchmarks/run_benchmarks.py                 # 1, 100 and 10,000 companies
+    python benchmarks/run_benchmarks.py --sizes 1 100 --latency 0.05
+
+Every source (search results included) is served from recorded fixtures by
+a local stub server and non-loopback connections are refused, so a run
+needs no network. Each run appends one JSON record to ``bench_output.txt``
+and prints the change against the previous record for the same size.
+"""
+
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_server import StubServer  # noqa: E402
+
+DEFAULT_SIZES = (1, 100, 10000)
+
+DEFAULT_OUTPUT = os.path.join(ROOT, 'bench_output.txt')
+
+REPORT_FORMATS = ('markdown', 'text', 'html', 'json', 'csv')
+
+CHART_SAMPLE = 200
+
+PARSE_COMPANIES = 250
+
+NAME_PARTS = (
+    ('Acme', 'Bright', 'Cobalt', 'Delta', 'Ember', 'Falcon', 'Granite', 'Harbor', 'Ion', 'Juniper'),
+    ('Robotics', 'Analytics', 'Health', 'Labs', 'Systems', 'Pay', 'Cloud', 'Energy', 'Logistics', 'Security'),
+)
+
+def company_names(count):
+    """Deterministic, distinct company names ("Acme Robotics 1", ...)."""
+    first, second = NAME_PARTS
+    return [
+        f"{first[i % len(first)]} {second[(i // len(first)) % len(second)]} {i + 1}"
+        for i in range(count)
+    ]
+
+def block_network():
+    """Refuse every connection that does not go to the loopback interface."""
+    connect = socket.socket.connect
+
+    def loopback_only(sock, address):
+        host = address[0] if isinstance(address, tuple) else address
+        if sock.family in (socket.AF_INET, socket.AF_INET6) and host not in ('127.0.0.1', '::1', 'localhost'):
+            raise OSError(f"benchmark is offline: refused connection to {host}")
+        return connect(sock, address)
+
+    socket.socket.connect = loopback_only
+
+def timing_summary(seconds):
+    """Count, total, mean, p50, p95 and max of a list of durations."""
+    if not seconds:
+        return {'count': 0}
+    ordered = sorted(seconds)
+    return {
+        'count': len(ordered),
+        'total': round(sum(ordered), 4),
+        'mean': round(statistics.fmean(ordered), 5),
+        'p50': round(ordered[len(ordered) // 2], 5),
+        'p95': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 5),
+        'max': round(ordered[-1], 5),
+    }
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+def make_factory(stub, response_cache):
+    from leadgen_fetch import SourceFetcher
+    from leadgen_pipeline import SourcePipeline
+    from leadgen_sources import company_slug
+
+    class FixturePipeline(SourcePipeline):
+        """SourcePipeline whose website search queries the stub's recorded results."""
+
+        def discover_website(self, company_name):
+            response = self.get_fetcher().session.get(
+                f"{stub.base_url}/search", params={'q': company_slug(company_name)}, timeout=10
+            )
+            for url in response.json():
+                if url.startswith(f"{stub.base_url}/website/"):
+                    return url
+            return None
+
+    def factory():
+        fetcher = SourceFetcher(max_retries=0, response_cache=response_cache)
+        return FixturePipeline(max_retries=0, source_templates=stub.templates(), fetcher=fetcher)
+    return factory
+
+def bench_extraction(stub, names, workers, cache_dir):
+    """Extract every company through BatchRunner; returns (profiles, results)."""
+    from leadgen_batch import BatchRunner, BatchStats
+    from leadgen_httpcache import ResponseCache
+    from leadgen_metrics import get_metrics
+    get_metrics().reset()
+    response_cache = ResponseCache(path=os.path.join(cache_dir, f"responses-{len(names)}.sqlite"))
+    runner = BatchRunner(make_factory(stub, response_cache), max_workers=min(workers, len(names)))
+    stats = BatchStats(len(names))
+    latencies = []
+    profiles = []
+    failures = []
+    requests_before, bytes_before = stub.requests, stub.bytes_sent
+    started = time.perf_counter()
+    for event in runner.run(names, stats):
+        if event.status == 'done':
+            latencies.append(event.elapsed)
+            profiles.append(event.profile)
+        elif event.status == 'failed':
+            failures.append(event.error)
+    wall = time.perf_counter() - started
+    pages, parse_cpu = _counter_totals('leadgen_parsed_pages_total', 'leadgen_parse_cpu_seconds_total')
+    stages = {
+        f"{row['stage']}:{row['source']}" if row['source'] else row['stage']: {
+            'count': row['count'], 'mean': round(row['mean'], 5), 'p95': round(row['p95'], 5),
+        }
+        for row in get_metrics().histograms('leadgen_stage_seconds')
+    }
+    return profiles, {
+        'wall_seconds': round(wall, 3),
+        'companies_per_second': round(len(profiles) / wall, 2) if wall else None,
+        'latency': timing_summary(latencies),
+        'failed': len(failures),
+        'first_error': failures[0] if failures else None,
+        'requests': stub.requests - requests_before,
+        'bytes': stub.bytes_sent - bytes_before,
+        'pages_per_parse_cpu_second': round(pages / parse_cpu, 1) if parse_cpu else None,
+        'stages': stages,
+    }
+
+def _counter_totals(*names):
+    from leadgen_metrics import get_metrics
+    totals = dict.fromkeys(names, 0)
+    for row in get_metrics().counters():
+        if row['metric'] in totals:
+            totals[row['metric']] += row['value']
+    return [totals[name] for name in names]
+
+def bench_parsing(stub, workers):
+    """Parse rendered fixture pages in the calling thread and through the ParserPool."""
+    from concurrent.futures import ThreadPoolExecutor
+    from leadgen_metrics import get_metrics
+    from leadgen_parsing import ParserPool
+    from leadgen_sources import company_slug
+    companies = [
+        {source: stub.render(source, company_slug(name)) for source in ('crunchbase', 'linkedin', 'techcrunch', 'website')}
+        for name in company_names(PARSE_COMPANIES)
+    ]
+    pages = PARSE_COMPANIES * 4
+    results = {}
+    for label, pool in (('inline', ParserPool(0)), ('process_pool', ParserPool())):
+        pool.parse_many(companies[0])
+        get_metrics().reset()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as threads:
+            list(threads.map(pool.parse_many, companies))
+        wall = time.perf_counter() - started
+        parsed, cpu = _counter_totals('leadgen_parsed_pages_total', 'leadgen_parse_cpu_seconds_total')
+        results[label] = {
+            'processes': pool.max_workers,
+            'pages': parsed,
+            'pages_per_second': round(pages / wall, 1),
+            'pages_per_cpu_second': round(parsed / cpu, 1) if cpu else None,
+        }
+        pool.close()
+    return results
+
+def bench_reports(profiles):
+    """Time per-profile reports and one combined document for each format."""
+    from leadgen_reports import render_report, render_reports
+    results = {}
+    for fmt in REPORT_FORMATS:
+        per_profile = [timed(render_report, profile, fmt)[1] for profile in profiles]
+        document, combined = timed(render_reports, profiles, fmt)
+        results[fmt] = {
+            'per_profile': timing_summary(per_profile),
+            'combined_seconds': round(combined, 4),
+            'combined_bytes': len(document.encode('utf-8')),
+        }
+    return results
+
+def bench_charts(profiles):
+    """Time the UI chart builders on a sample and the comparison table on every profile."""
+    import leadgen_charts
+    from leadgen_compare import ComparisonTable
+    from leadgen_scoring import profile_score
+    sample = profiles[:CHART_SAMPLE]
+    builders = {
+        'investment_score_gauge': lambda p: leadgen_charts.create_investment_score_gauge(profile_score(p)),
+        'growth_signals_chart': lambda p: leadgen_charts.create_growth_signals_chart(p.get('growth_signals')),
+        'funding_timeline': lambda p: leadgen_charts.create_funding_timeline(p.get('funding_rounds', [])),
+    }
+    results = {
+        name: timing_summary([timed(build, profile)[1] for profile in sample])
+        for name, build in builders.items()
+    }
+    table, build = timed(ComparisonTable.from_profiles, profiles)
+    filtered, filtering = timed(table.filter, None, 50)
+    _, paging = timed(ComparisonTable.page, filtered)
+    _, aggregating = timed(ComparisonTable.aggregates, filtered)
+    _, yearly = timed(table.funding_by_year, filtered)
+    results['comparison_table'] = {
+        'build_seconds': round(build, 4),
+        'filter_seconds': round(filtering, 4),
+        'page_seconds': round(paging, 4),
+        'aggregate_seconds': round(aggregating, 4),
+        'funding_by_year_seconds': round(yearly, 4),
+    }
+    return results
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def previous_records(path):
+    """Earlier records from the output file, oldest first."""
+    if not os.path.exists(path):
+        return []
+    records = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+def _change(current, previous):
+    if not previous or current is None:
+        return ''
+    return f" ({(current - previous) / previous:+.0%} vs previous)"
+
+def print_summary(record, previous):
+    """Print the headline numbers of one size, compared with the previous run of that size."""
+    extraction = record['extraction']
+    before = (previous or {}).get('extraction', {})
+    latency = extraction['latency']
+    print(f"\n== {record['companies']} companies ({record['workers']} workers) ==")
+    print(f"extract_company_profile: {extraction['companies_per_second']} companies/s"
+          f"{_change(extraction['companies_per_second'], before.get('companies_per_second'))}, "
+          f"p50 {latency.get('p50')}s, p95 {latency.get('p95')}s"
+          f"{_change(latency.get('p95'), before.get('latency', {}).get('p95'))}, "
+          f"{extraction['failed']} failed")
+    for label, result in record.get('parsing', {}).items():
+        print(f"parse {label} ({result['processes']} processes): {result['pages_per_second']} pages/s, "
+              f"{result['pages_per_cpu_second']} pages/s per core")
+    for fmt, result in record['reports'].items():
+        print(f"report {fmt}: {result['per_profile'].get('mean')}s/profile, "
+              f"{result['combined_seconds']}s combined")
+    for name, result in record['charts'].items():
+        if name == 'comparison_table':
+            print(f"comparison table: build {result['build_seconds']}s, filter {result['filter_seconds']}s")
+        else:
+            print(f"chart {name}: {result.get('mean')}s mean over {result.get('count')} profiles")
+
+def run(sizes, workers=16, latency=0.0, output=DEFAULT_OUTPUT):
+    """Run every size and append one record per size to ``output``."""
+    block_network()
+    cache_dir = tempfile.mkdtemp(prefix='leadgen-bench-')
+    os.environ['LEADGEN_CACHE_DIR'] = cache_dir
+    from leadgen_ratelimit import get_rate_limiter
+    history = previous_records(output)
+    records = []
+    with StubServer(latency=latency) as stub:
+        get_rate_limiter().set_rate(stub.host, 1e6, burst=1e6)
+        parsing = bench_parsing(stub, workers)
+        for size in sizes:
+            names = company_names(size)
+            profiles, extraction = bench_extraction(stub, names, workers, cache_dir)
+            record = {
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'revision': git_revision(),
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'companies': size,
+                'workers': min(workers, size),
+                'stub_latency': latency,
+                'extraction': extraction,
+                'parsing': parsing,
+                'reports': bench_reports(profiles),
+                'charts': bench_charts(profiles),
+            }
+            previous = next((r for r in reversed(history) if r.get('companies') == size), None)
+            print_summary(record, previous)
+            records.append(record)
+            with open(output, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + '\n')
+    print(f"\nResults appended to {output}")
+    return records
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Offline LEADGen AI benchmarks.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help='Company counts to run (default: 1 100 10000)')
+    parser.add_argument('--workers', type=int, default=16, help='Batch workers (default: 16)')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Seconds the stub server waits before each response (default: 0)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT,
+                        help='File the JSON records are appended to (default: bench_output.txt)')
+    args = parser.parse_args(argv)
+    run(args.sizes, args.workers, args.latency, args.output)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+LEADGen AI - Benchmark Stub Server
+Serve the recorded source fixtures for any company from a local HTTP server.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+SOURCE_FIXTURES = {
+    'crunchbase': 'crunchbase.html',
+    'linkedin': 'linkedin.html',
+    'techcrunch': 'techcrunch.html',
+    'website': 'website.html',
+    'search': 'search.json',
+}
+
+INDUSTRIES = ('Artificial Intelligence', 'Fintech', 'Healthcare', 'Logistics', 'Cybersecurity',
+              'Climate Tech', 'Developer Tools', 'E-Commerce')
+CITIES = ('San Francisco, California', 'New York, New York', 'London, England', 'Berlin, Germany',
+          'Toronto, Ontario', 'Austin, Texas', 'Paris, France', 'Singapore')
+PRODUCTS = ('an analytics platform', 'a payments API', 'a workflow engine', 'a data warehouse',
+            'a security scanner', 'a carbon ledger', 'a developer portal', 'a storefront builder')
+EMPLOYEE_RANGES = ('11-50', '51-200', '201-500', '501-1000', '1001-5000')
+MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+def load_fixtures(directory=FIXTURE_DIR):
+    """Read every fixture as a ``string.Template``."""
+    fixtures = {}
+    for source, file_name in SOURCE_FIXTURES.items():
+        with open(os.path.join(directory, file_name), encoding='utf-8') as f:
+            fixtures[source] = Template(f.read())
+    return fixtures
+
+def company_values(slug, base_url):
+    """Deterministic per-company values substituted into the fixtures."""
+    seed = int(hashlib.sha1(slug.encode('utf-8')).hexdigest()[:12], 16)
+
+    def pick(options, shift):
+        return options[(seed >> shift) % len(options)]
+
+    year = 2005 + seed % 18
+    seed_amount = 1 + seed % 5
+    series_a = 8 + (seed >> 3) % 30
+    series_b = 40 + (seed >> 7) % 160
+    company = ' '.join(part.capitalize() for part in slug.split('-'))
+    return {
+        'company': company,
+        'slug': slug,
+        'year': year,
+        'industry': pick(INDUSTRIES, 4),
+        'city': pick(CITIES, 8),
+        'product': pick(PRODUCTS, 12),
+        'employees': pick(EMPLOYEE_RANGES, 16),
+        'followers': f"{(seed >> 20) % 90000 + 1000:,}",
+        'open_roles': (seed >> 24) % 120 + 1,
+        'total_funding': f"${seed_amount + series_a + series_b}M",
+        'revenue': f"${(seed >> 5) % 40 + 1}M to ${(seed >> 5) % 40 + 20}M",
+        'valuation': f"${((seed >> 9) % 40 + 5) / 10:.1f}B",
+        'seed_amount': f"${seed_amount}M",
+        'series_a_amount': f"${series_a}M",
+        'series_b_amount': f"${series_b}M",
+        'seed_date': f"{pick(MONTHS, 28)} {(seed >> 30) % 28 + 1}, {year + 1}",
+        'series_a_date': f"{pick(MONTHS, 32)} {year + 3}",
+        'series_b_date': f"{year + 5}-{(seed >> 36) % 12 + 1:02d}-{(seed >> 40) % 28 + 1:02d}",
+        'phone': f"{seed % 10000:04d}",
+        'website': f"{base_url}/website/{slug}",
+    }
+
+class StubServer:
+    """Threaded local server answering ``/<source>/<slug>`` and ``/search?q=<slug>``.
+
+    Every company gets its own page, filled in from the fixture templates
+    with deterministic values, so large runs never collapse onto a handful
+    of cached responses. ``latency`` adds a fixed delay per response to
+    stand in for a remote site.
+    """
+
+    def __init__(self, port=0, latency=0.0, fixtures=None):
+        self.latency = latency
+        self.fixtures = fixtures or load_fixtures()
+        self.requests = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def host(self):
+        host, port = self._server.server_address[:2]
+        return f"{host}:{port}"
+
+    def templates(self):
+        """URL templates pointing the pipeline's templated sources at this server."""
+        return {
+            source: f"{self.base_url}/{source}/{{slug}}"
+            for source in ('crunchbase', 'linkedin', 'techcrunch')
+        }
+
+    def render(self, source, slug):
+        template = self.fixtures.get(source)
+        if template is None or not slug:
+            return None
+        return template.substitute(company_values(slug, self.base_url))
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                if stub.latency:
+                    time.sleep(stub.latency)
+                parts = urlsplit(self.path)
+                segments = [segment for segment in parts.path.split('/') if segment]
+                if segments == ['search']:
+                    slug = parse_qs(parts.query).get('q', [''])[0]
+                    body, content_type = stub.render('search', slug), 'application/json'
+                elif len(segments) == 2:
+                    body, content_type = stub.render(segments[0], segments[1]), 'text/html; charset=utf-8'
+                else:
+                    body, content_type = None, 'text/plain'
+                payload = (body if body is not None else 'not found').encode('utf-8')
+                self.send_response(200 if body is not None else 404)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                with stub._lock:
+                    stub.requests += 1
+                    stub.bytes_sent += len(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name='leadgen-stub', daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Serve LEADGen AI benchmark fixtures locally.')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds to wait before each response')
+    args = parser.parse_args()
+    server = StubServer(args.port, args.latency).start()
+    print(f"Serving fixtures on {server.base_url} (e.g. {server.base_url}/crunchbase/acme-robotics)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,320 @@
+"""
+LEADGen AI - Batch Engine
+Concurrent batch profile extraction with bounded workers and per-source limits.
+"""
+
+import csv
+import io
+import queue
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from leadgen_metrics import get_metrics
+
+DEFAULT_SOURCE_LIMITS = {
+    'google': 2,
+    'crunchbase': 4,
+    'linkedin': 2,
+    'techcrunch': 6,
+}
+
+NAME_COLUMNS = ('company_name', 'company', 'name', 'organization')
+
+RECENT_RESULTS = 256
+
+BatchEvent = namedtuple('BatchEvent', 'index company_name status profile error elapsed')
+
+def _text_stream(uploaded_file):
+    """Wrap a binary upload in a text stream without reading it into memory."""
+    if hasattr(uploaded_file, 'seek') and (not hasattr(uploaded_file, 'seekable') or uploaded_file.seekable()):
+        uploaded_file.seek(0)
+    return io.TextIOWrapper(uploaded_file, encoding='utf-8-sig', errors='replace', newline='')
+
+def iter_company_names(uploaded_file, file_name=None):
+    """Yield company names from a txt or csv upload, one row at a time."""
+    file_name = file_name or getattr(uploaded_file, 'name', '') or ''
+    stream = _text_stream(uploaded_file)
+    seen = set()
+    try:
+        if file_name.lower().endswith('.csv'):
+            rows = csv.reader(stream)
+            header = next(rows, None)
+            if header is None:
+                return
+            column = 0
+            lowered = [cell.strip().lower() for cell in header]
+            for candidate in NAME_COLUMNS:
+                if candidate in lowered:
+                    column = lowered.index(candidate)
+                    break
+            else:
+                rows = _chain_row(header, rows)
+            values = (row[column] if len(row) > column else '' for row in rows)
+        else:
+            values = stream
+        for value in values:
+            name = value.strip()
+            if not name or name.startswith('#'):
+                continue
+            key = name.lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            yield name
+    finally:
+        stream.detach()
+
+def _chain_row(first, rows):
+    """Put back a CSV row that turned out not to be a header."""
+    yield first
+    yield from rows
+
+def count_company_names(uploaded_file, file_name=None):
+    """Count names in an upload with a streaming pass, then rewind it."""
+    total = sum(1 for _ in iter_company_names(uploaded_file, file_name))
+    uploaded_file.seek(0)
+    return total
+
+def parse_source_limits(text):
+    """Parse ``'google=4,linkedin=3'`` into ``{'google': 4, 'linkedin': 3}``.
+
+    Raises ``ValueError`` for anything but comma-separated ``source=N``
+    pairs with a positive ``N``.
+    """
+    limits = {}
+    for part in filter(None, (part.strip() for part in (text or '').split(','))):
+        source, _, limit = part.partition('=')
+        source = source.strip().lower()
+        try:
+            limits[source] = int(limit)
+        except ValueError:
+            limits[source] = 0
+        if not source or limits[source] < 1:
+            raise ValueError(f"invalid source limit {part!r}, expected SOURCE=N with N >= 1")
+    return limits
+
+def tightest_limit(limits, sources):
+    """Return ``(source, limit)`` for the lowest of ``limits`` among ``sources``, or None."""
+    known = [(limits[source], source) for source in sources if source in limits]
+    if not known:
+        return None
+    limit, source = min(known)
+    return source, limit
+
+class SourceLimiter:
+    """Per-source concurrency limits shared by all batch workers."""
+
+    def __init__(self, limits=None):
+        self.limits = dict(DEFAULT_SOURCE_LIMITS)
+        self.limits.update(limits or {})
+        self._semaphores = {
+            source: threading.BoundedSemaphore(max(1, limit))
+            for source, limit in self.limits.items()
+        }
+
+    @contextmanager
+    def slot(self, source):
+        """Hold one concurrency slot for a single source."""
+        semaphore = self._semaphores.get(source)
+        if semaphore is None:
+            yield
+            return
+        with semaphore:
+            yield
+
+    @contextmanager
+    def slots(self, sources=None):
+        """Hold a slot on every listed source (all sources by default)."""
+        acquired = []
+        try:
+            for source in sorted(sources or self._semaphores):
+                semaphore = self._semaphores.get(source)
+                if semaphore is not None:
+                    semaphore.acquire()
+                    acquired.append(semaphore)
+            yield
+        finally:
+            for semaphore in reversed(acquired):
+                semaphore.release()
+
+class BatchStats:
+    """Running totals and throughput for a batch run."""
+
+    def __init__(self, total=None):
+        self.total = total
+        self.started_at = time.monotonic()
+        self.done = 0
+        self.failed = 0
+        self.running = 0
+        self.coalesced = 0
+
+    @property
+    def finished(self):
+        return self.done + self.failed
+
+    @property
+    def companies_per_minute(self):
+        elapsed = time.monotonic() - self.started_at
+        if elapsed <= 0:
+            return 0.0
+        return self.finished * 60.0 / elapsed
+
+    def record(self, event):
+        """Update totals from a batch event."""
+        if event.status == 'running':
+            self.running += 1
+        elif event.status == 'done':
+            self.running -= 1
+            self.done += 1
+            get_metrics().inc('leadgen_companies_total', outcome='done')
+        elif event.status == 'failed':
+            self.running -= 1
+            self.failed += 1
+            get_metrics().inc('leadgen_companies_total', outcome='failed')
+
+class BatchRunner:
+    """Run profile extraction over many companies through a bounded worker pool.
+
+    ``factory`` builds one extractor (e.g. ``LeadGenAI``) per worker thread so
+    scrapers never share session state across threads. Each extractor gets the
+    shared ``source_limiter`` to take per-source slots around its own requests;
+    passing ``sources`` makes the runner hold those slots around the whole
+    extraction instead, for extractors that cannot do it themselves (such as
+    ``LeadGenAI`` with the source pipeline off; pass
+    ``DEFAULT_SOURCE_LIMITS.keys()``). Companies in flight are then capped at
+    the tightest of those limits, since any more would only wait for a slot;
+    when that is below ``max_workers``, ``limiting_source`` names the source
+    responsible so callers can tell the user (raise it through the
+    limiter's ``limits``).
+
+    With a ``resolver`` (a ``leadgen_resolve.CompanyIndex``) every input name
+    is resolved first and extraction runs on the canonical name. Inputs that
+    resolve to a company already in flight, or finished recently, share its
+    result instead of starting another scrape; each still gets its own events.
+
+    An ``executor`` (anything with ``submit()`` and ``shutdown()``, such as
+    ``leadgen_queue.QueueExecutor``) runs the work instead of a private
+    thread pool; at most ``max_workers`` companies are handed to it at once.
+    """
+
+    def __init__(self, factory, max_workers=8, source_limiter=None, max_in_flight=None,
+                 sources=None, resolver=None, executor=None):
+        self.factory = factory
+        self.max_workers = max(1, int(max_workers))
+        self.executor = executor
+        self.max_in_flight = max_in_flight or (self.max_workers if executor else self.max_workers * 2)
+        self.source_limiter = source_limiter or SourceLimiter()
+        self.sources = tuple(sources or ())
+        self.limiting_source = None
+        tightest = tightest_limit(self.source_limiter.limits, self.sources)
+        if tightest is not None:
+            source, limit = tightest
+            self.max_in_flight = max(1, min(self.max_in_flight, limit))
+            if limit < self.max_workers:
+                self.limiting_source = source
+        self.resolver = resolver
+        self._local = threading.local()
+
+    def _extractor(self):
+        extractor = getattr(self._local, 'extractor', None)
+        if extractor is None:
+            extractor = self.factory()
+            extractor.source_limiter = self.source_limiter
+            self._local.extractor = extractor
+        return extractor
+
+    def _work(self, index, company_name, events, resolved_name=None):
+        started = time.monotonic()
+        resolved_name = resolved_name or company_name
+        try:
+            extractor = self._extractor()
+            if self.sources:
+                with self.source_limiter.slots(self.sources):
+                    events.put(BatchEvent(index, company_name, 'running', None, None, 0.0))
+                    profile = extractor.extract_company_profile(resolved_name)
+            else:
+                events.put(BatchEvent(index, company_name, 'running', None, None, 0.0))
+                profile = extractor.extract_company_profile(resolved_name)
+            if isinstance(profile, dict):
+                profile.setdefault('company_name', resolved_name)
+            events.put(BatchEvent(index, company_name, 'done', profile, None,
+                                  time.monotonic() - started))
+        except Exception as e:
+            events.put(BatchEvent(index, company_name, 'failed', None, str(e),
+                                  time.monotonic() - started))
+
+    def run(self, company_names, stats=None):
+        """Yield BatchEvents as companies are queued, started and finished."""
+        return self.run_items(enumerate(company_names), stats)
+
+    def run_items(self, items, stats=None):
+        """Like ``run()``, but over ``(index, company_name)`` pairs chosen by the caller."""
+        stats = stats if stats is not None else BatchStats()
+        events = queue.Queue()
+        items = iter(items)
+        pool = self.executor or ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix='leadgen-batch'
+        )
+        in_flight = 0
+        exhausted = False
+        leaders = {}
+        followers = {}
+        recent = OrderedDict()
+        try:
+            while True:
+                while not exhausted and in_flight < self.max_in_flight:
+                    try:
+                        index, company_name = next(items)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    yield BatchEvent(index, company_name, 'pending', None, None, 0.0)
+                    if self.resolver is None:
+                        pool.submit(self._work, index, company_name, events)
+                        in_flight += 1
+                        continue
+                    resolved_name = self.resolver.resolve(company_name).name
+                    if resolved_name in followers or resolved_name in recent:
+                        stats.coalesced += 1
+                        get_metrics().inc('leadgen_companies_total', outcome='coalesced')
+                        running = BatchEvent(index, company_name, 'running', None, None, 0.0)
+                        stats.record(running)
+                        yield running
+                        if resolved_name in followers:
+                            followers[resolved_name].append((index, company_name))
+                        else:
+                            recent.move_to_end(resolved_name)
+                            event = BatchEvent(index, company_name, 'done', dict(recent[resolved_name]),
+                                               None, 0.0)
+                            stats.record(event)
+                            yield event
+                        continue
+                    leaders[index] = resolved_name
+                    followers[resolved_name] = []
+                    pool.submit(self._work, index, company_name, events, resolved_name)
+                    in_flight += 1
+                if in_flight == 0:
+                    break
+                event = events.get()
+                if event.status in ('done', 'failed'):
+                    in_flight -= 1
+                stats.record(event)
+                yield event
+                if event.status in ('done', 'failed') and event.index in leaders:
+                    resolved_name = leaders.pop(event.index)
+                    if event.status == 'done' and isinstance(event.profile, dict):
+                        recent[resolved_name] = event.profile
+                        if len(recent) > RECENT_RESULTS:
+                            recent.popitem(last=False)
+                    for index, company_name in followers.pop(resolved_name):
+                        shared = event._replace(
+                            index=index, company_name=company_name,
+                            profile=dict(event.profile) if isinstance(event.profile, dict) else event.profile
+                        )
+                        stats.record(shared)
+                        yield shared
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,268 @@
+"""
+LEADGen AI - Profile Cache
+Process-wide SQLite profile cache with per-field-group TTLs and LRU eviction.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from leadgen_metrics import get_metrics
+from leadgen_progress import ProgressReporter, accepts_keyword
+
+DAY = 24 * 60 * 60
+
+FIELD_GROUPS = {
+    'funding': ('funding_rounds', 'total_funding_raised', 'valuation', 'revenue_est'),
+    'growth': ('growth_signals', 'team_size', 'why_invest'),
+    'contact': ('contact_info', 'social_links', 'locations'),
+    'company': ('company_name', 'founded_year', 'company_age', 'industry', 'summary'),
+}
+
+DEFAULT_GROUP = 'company'
+
+DEFAULT_TTLS = {
+    'funding': 1 * DAY,
+    'growth': 3 * DAY,
+    'contact': 7 * DAY,
+    'company': 30 * DAY,
+}
+
+DEFAULT_MAX_ENTRIES = 5000
+
+LEGAL_SUFFIXES = (
+    'inc', 'incorporated', 'llc', 'ltd', 'limited', 'corp', 'corporation',
+    'co', 'company', 'gmbh', 'plc', 'sa', 'ag', 'bv', 'pty',
+)
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+def default_cache_dir():
+    """Directory for on-disk caches, overridable with LEADGEN_CACHE_DIR."""
+    return os.environ.get(
+        'LEADGEN_CACHE_DIR',
+        os.path.join(os.path.expanduser('~'), '.cache', 'leadgen')
+    )
+
+def normalize_company_name(company_name):
+    """Normalize a company name into a cache key ("Open AI, Inc." -> "open ai")."""
+    words = _NON_ALNUM.sub(' ', company_name.lower()).split()
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+def field_group(field):
+    """Return the TTL group a profile field belongs to."""
+    for group, fields in FIELD_GROUPS.items():
+        if field in fields:
+            return group
+    return DEFAULT_GROUP
+
+def split_profile(profile):
+    """Split a profile dict into {group: {field: value}}."""
+    groups = {}
+    for field, value in profile.items():
+        groups.setdefault(field_group(field), {})[field] = value
+    return groups
+
+class ProfileCache:
+    """Persistent profile cache keyed by normalized company name.
+
+    Each profile is stored as one row per field group so that groups expire
+    independently. A profile only counts as a hit when every stored group is
+    still within its TTL; the least recently used companies are evicted once
+    ``max_entries`` is exceeded.
+    """
+
+    def __init__(self, path=None, ttls=None, max_entries=DEFAULT_MAX_ENTRIES):
+        if path is None:
+            path = os.path.join(default_cache_dir(), 'profiles.sqlite')
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                company_name TEXT NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+            CREATE TABLE IF NOT EXISTS field_groups (
+                key TEXT NOT NULL,
+                field_group TEXT NOT NULL,
+                data TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (key, field_group)
+            );
+        """)
+        self._conn.commit()
+
+    def get_groups(self, company_name, now=None):
+        """Return {group: (fields, fetched_at, fresh)} without touching counters."""
+        now = time.time() if now is None else now
+        key = normalize_company_name(company_name)
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT field_group, data, fetched_at FROM field_groups WHERE key = ?', (key,)
+            ).fetchall()
+        groups = {}
+        for group, data, fetched_at in rows:
+            ttl = self.ttls.get(group, self.ttls[DEFAULT_GROUP])
+            groups[group] = (json.loads(data), fetched_at, now - fetched_at < ttl)
+        return groups
+
+    def get(self, company_name):
+        """Return the cached profile, or None if it is missing or any group is stale."""
+        groups = self.get_groups(company_name)
+        if not groups:
+            self.misses += 1
+            get_metrics().inc('leadgen_profile_cache_total', outcome='miss')
+            return None
+        if not all(fresh for _, _, fresh in groups.values()):
+            self.misses += 1
+            self.stale += 1
+            get_metrics().inc('leadgen_profile_cache_total', outcome='stale')
+            return None
+        self.hits += 1
+        get_metrics().inc('leadgen_profile_cache_total', outcome='hit')
+        self._touch(company_name)
+        profile = {}
+        for fields, _, _ in groups.values():
+            profile.update(fields)
+        return profile
+
+    def peek(self, company_name):
+        """Return the stored profile even if stale, without touching counters or LRU order."""
+        groups = self.get_groups(company_name)
+        if not groups:
+            return None
+        profile = {}
+        for fields, _, _ in groups.values():
+            profile.update(fields)
+        return profile
+
+    def put(self, company_name, profile, groups=None):
+        """Store a profile; ``groups`` limits the write to those field groups."""
+        key = normalize_company_name(company_name)
+        now = time.time()
+        rows = [
+            (key, group, json.dumps(fields, default=str), now)
+            for group, fields in split_profile(profile).items()
+            if groups is None or group in groups
+        ]
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO entries (key, company_name, last_access) VALUES (?, ?, ?)',
+                (key, company_name, now)
+            )
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO field_groups (key, field_group, data, fetched_at) '
+                'VALUES (?, ?, ?, ?)',
+                rows
+            )
+            self._evict()
+            self._conn.commit()
+
+    def invalidate(self, company_name):
+        """Drop a company from the cache."""
+        key = normalize_company_name(company_name)
+        with self._lock:
+            self._conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+            self._conn.execute('DELETE FROM field_groups WHERE key = ?', (key,))
+            self._conn.commit()
+
+    def _touch(self, company_name):
+        with self._lock:
+            self._conn.execute(
+                'UPDATE entries SET last_access = ? WHERE key = ?',
+                (time.time(), normalize_company_name(company_name))
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        (count,) = self._conn.execute('SELECT COUNT(*) FROM entries').fetchone()
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+        keys = self._conn.execute(
+            'SELECT key FROM entries ORDER BY last_access LIMIT ?', (overflow,)
+        ).fetchall()
+        self._conn.executemany('DELETE FROM entries WHERE key = ?', keys)
+        self._conn.executemany('DELETE FROM field_groups WHERE key = ?', keys)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def company_names(self):
+        """Return the names of every cached company, most recently used first."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT company_name FROM entries ORDER BY last_access DESC'
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def stats(self):
+        """Return hit/miss counters and the current entry count."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale': self.stale,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self),
+            'max_entries': self.max_entries,
+        }
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+def get_profile_cache():
+    """Return the process-wide profile cache shared by all sessions and workers."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ProfileCache()
+        return _shared_cache
+
+class ProfileCacheMixin:
+    """Serve ``extract_company_profile()`` from a ProfileCache.
+
+    Mix in ahead of ``ProgressMixin`` and ``LeadGenAI``; ``generate_lead_report()``
+    goes through ``self.extract_company_profile()`` and therefore reads from the
+    cache too. When a cached profile has gone stale and the extractor below
+    supports incremental refresh, the stale profile is passed down as
+    ``previous`` so only expired sources are fetched again.
+    """
+
+    profile_cache = None
+
+    def extract_company_profile(self, company_name, *args, refresh=False, progress=None, **kwargs):
+        progress = progress if progress is not None else ProgressReporter()
+        cache = self.profile_cache
+        if cache is not None and not refresh:
+            progress.plan(('cache',) + tuple(self.planned_stages()))
+            with progress.stage('cache'):
+                profile = cache.get(company_name)
+            if profile is not None:
+                progress.complete()
+                return profile
+            base = super().extract_company_profile
+            if 'previous' not in kwargs and accepts_keyword(base, 'previous'):
+                kwargs['previous'] = cache.peek(company_name)
+        profile = super().extract_company_profile(company_name, *args, progress=progress, **kwargs)
+        if cache is not None and profile:
+            cache.put(company_name, profile)
+        return profile
@@ -0,0 +1,146 @@
+"""
+LEADGen AI - Charts
+Plotly figures for a company profile, independent of Streamlit.
+"""
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from leadgen_funding import FundingTable
+from leadgen_money import format_money
+
+def create_investment_score_gauge(score):
+    """Create an investment score gauge chart."""
+    fig = go.Figure(go.Indicator(
+        mode = "gauge+number+delta",
+        value = score,
+        domain = {'x': [0, 1], 'y': [0, 1]},
+        title = {'text': "Investment Score", 'font': {'size': 24}},
+        delta = {'reference': 50},
+        gauge = {
+            'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
+            'bar': {'color': "darkblue"},
+            'bgcolor': "white",
+            'borderwidth': 2,
+            'bordercolor': "gray",
+            'steps': [
+                {'range': [0, 40], 'color': '#ff6b6b'},
+                {'range': [40, 60], 'color': '#feca57'},
+                {'range': [60, 80], 'color': '#48dbfb'},
+                {'range': [80, 100], 'color': '#1dd1a1'}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 90
+            }
+        }
+    ))
+
+    fig.update_layout(
+        height=300,
+        margin=dict(l=20, r=20, t=40, b=20),
+        font={'color': "#2c3e50"}
+    )
+
+    return fig
+
+def create_growth_signals_chart(growth_signals):
+    """Create a growth signals visualization."""
+    if not growth_signals or growth_signals == "N/A":
+        return None
+
+    signals = growth_signals.split(', ')
+    signal_counts = {}
+
+    for signal in signals:
+        signal_counts[signal] = signal_counts.get(signal, 0) + 1
+
+    if not signal_counts:
+        return None
+
+    fig = px.bar(
+        x=list(signal_counts.keys()),
+        y=list(signal_counts.values()),
+        title="Growth Signals Analysis",
+        labels={'x': 'Growth Signal', 'y': 'Frequency'},
+        color=list(signal_counts.values()),
+        color_continuous_scale='Viridis'
+    )
+
+    fig.update_layout(
+        height=400,
+        margin=dict(l=20, r=20, t=40, b=20),
+        font={'color': "#2c3e50"},
+        plot_bgcolor='white',
+        paper_bgcolor='white'
+    )
+
+    return fig
+
+def create_funding_timeline(funding_rounds):
+    """Create a funding timeline visualization.
+
+    Dated rounds are placed on a real date axis (marker size follows the
+    amount, with a cumulative line when every round is in one currency);
+    without any dates the rounds are shown in disclosure order instead of
+    on invented years.
+    """
+    if not funding_rounds:
+        return None
+
+    rounds = FundingTable()
+    rounds.add_profile({'funding_rounds': funding_rounds})
+    frame = rounds.to_frame()
+    frame['label'] = [
+        f"{row['round']}: {format_money(row['amount'], row['currency']) if pd.notna(row['currency']) else 'N/A'}"
+        for _, row in frame.iterrows()
+    ]
+    dated = frame.dropna(subset=['date']).sort_values('date', kind='stable')
+
+    if len(dated):
+        fig = go.Figure(go.Scatter(
+            x=dated['date'],
+            y=dated['round'].astype(str),
+            mode='markers+text',
+            text=dated['label'],
+            textposition='top center',
+            marker=dict(
+                size=(dated['amount'].fillna(0) ** 0.5 / 200).clip(10, 40),
+                color='#667eea'
+            ),
+            name='Rounds'
+        ))
+        currencies = dated['currency'].dropna().unique()
+        if len(currencies) == 1 and dated['amount'].notna().any():
+            fig.add_trace(go.Scatter(
+                x=dated['date'],
+                y=dated['amount'].fillna(0).cumsum(),
+                mode='lines',
+                line=dict(color='#f093fb', shape='hv'),
+                name=f'Cumulative ({currencies[0]})',
+                yaxis='y2'
+            ))
+            fig.update_layout(yaxis2=dict(overlaying='y', side='right', showgrid=False))
+        fig.update_layout(title='Funding Timeline', xaxis_title='Date', yaxis_title='Round')
+    else:
+        fig = px.bar(
+            frame,
+            x='label',
+            y='amount',
+            title='Funding Rounds (undated, in disclosure order)',
+            color='amount',
+            color_continuous_scale='Viridis'
+        )
+        fig.update_layout(xaxis_title='Round', yaxis_title='Amount')
+
+    fig.update_layout(
+        height=400,
+        margin=dict(l=20, r=20, t=40, b=20),
+        font={'color': "#2c3e50"},
+        plot_bgcolor='white',
+        paper_bgcolor='white'
+    )
+
+    return fig
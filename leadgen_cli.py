@@ -0,0 +1,205 @@
+"""
+LEADGen AI - Command Line
+Headless batch enrichment for cron jobs and ETL, without Streamlit or Plotly.
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+DEFAULT_WORKERS = 8
+
+SINK_CHOICES = ('csv', 'jsonl', 'parquet')
+
+REPORT_CHOICES = ('json', 'markdown', 'text', 'html', 'csv')
+
+METRICS_DUMP_INTERVAL = 15.0
+
+_UNSAFE_FILE_CHARS = re.compile(r'[^\w.-]+')
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='leadgen_cli',
+        description='Enrich a list of companies with LEADGen AI profiles.',
+    )
+    parser.add_argument('input', nargs='?',
+                        help="Company list (.txt, one name per line, or .csv); '-' reads stdin")
+    parser.add_argument('-o', '--output',
+                        help='Result file (default: a new file under the cache directory)')
+    parser.add_argument('-f', '--format', choices=SINK_CHOICES,
+                        help='Result format (default: from the --output extension, else csv)')
+    parser.add_argument('-w', '--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Concurrent extractions (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--cache-dir',
+                        help='Directory for the profile, HTTP and job caches (sets LEADGEN_CACHE_DIR)')
+    parser.add_argument('--reports', metavar='DIR',
+                        help='Also write one report per company into DIR')
+    parser.add_argument('--report-format', choices=REPORT_CHOICES, default='markdown',
+                        help='Format of the per-company reports (default: markdown)')
+    parser.add_argument('--resume', metavar='JOB_ID',
+                        help='Continue an interrupted job instead of starting a new one')
+    parser.add_argument('--list-jobs', action='store_true',
+                        help='List unfinished jobs and exit')
+    parser.add_argument('--load-domains', metavar='CSV',
+                        help='Bulk-load known company URLs (website/domain and per-source columns) '
+                             'into the discovery index first')
+    parser.add_argument('--no-resolve', action='store_true',
+                        help='Scrape every input name as given, without merging name variants')
+    parser.add_argument('--pipeline', action='store_true',
+                        help="Use the concurrent source pipeline instead of LeadGenAI's own extractor")
+    parser.add_argument('--source-limits', metavar='SOURCE=N[,...]',
+                        help='Concurrent requests per source, e.g. google=4,linkedin=3 '
+                             '(default: google=2,crunchbase=4,linkedin=2,techcrunch=6). Without '
+                             '--pipeline the lowest limit also caps --workers')
+    parser.add_argument('--metrics-file', metavar='PATH',
+                        help='Write Prometheus metrics to PATH during and after the run')
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help='Serve Prometheus metrics on http://127.0.0.1:PORT/metrics while running')
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='Only print the final summary')
+    return parser
+
+def _sink_format(args):
+    if args.format:
+        return args.format
+    if args.output:
+        extension = os.path.splitext(args.output.rstrip(os.sep))[1].lstrip('.').lower()
+        if extension in SINK_CHOICES:
+            return extension
+    return 'csv'
+
+def _write_report(directory, profile, fmt):
+    from leadgen_reports import render_report, report_file_info
+    company_name = _UNSAFE_FILE_CHARS.sub('_', str(profile.get('company_name') or 'company'))
+    file_name, _ = report_file_info(company_name, fmt)
+    with open(os.path.join(directory, file_name), 'w', encoding='utf-8') as f:
+        f.write(render_report(profile, fmt))
+
+def _factory(use_source_pipeline):
+    from leadgen_service import LeadGenService
+
+    def factory():
+        service = LeadGenService()
+        service.use_source_pipeline = use_source_pipeline
+        return service
+    return factory
+
+def _create_job(store, args, sink_format):
+    from leadgen_batch import iter_company_names
+    if args.output and os.path.isfile(args.output):
+        os.remove(args.output)
+    elif args.output and os.path.isdir(args.output):
+        raise SystemExit(f"leadgen_cli: output {args.output} is an existing directory")
+    if args.input == '-':
+        stream, name = sys.stdin.buffer, 'stdin'
+    else:
+        stream, name = open(args.input, 'rb'), os.path.basename(args.input)
+    try:
+        names = iter_company_names(stream, args.input if args.input != '-' else '')
+        return store.create_job(name, names, sink_format, sink_path=args.output)
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+
+def run(args, out=sys.stdout, err=sys.stderr):
+    """Run one CLI invocation from parsed ``args``; returns the exit status."""
+    if args.cache_dir:
+        os.environ['LEADGEN_CACHE_DIR'] = os.path.abspath(args.cache_dir)
+    from leadgen_batch import DEFAULT_SOURCE_LIMITS, BatchRunner, BatchStats, SourceLimiter, parse_source_limits
+    from leadgen_jobs import get_job_store, run_job
+    from leadgen_metrics import get_metrics, serve_metrics
+    try:
+        source_limiter = SourceLimiter(parse_source_limits(args.source_limits))
+    except ValueError as e:
+        print(f"leadgen_cli: --source-limits: {e}", file=err)
+        return 2
+    store = get_job_store()
+
+    if args.list_jobs:
+        for job in store.list_jobs(unfinished_only=True):
+            print(f"{job['job_id']}\t{job['name']}\t{store.count_pending(job['job_id'])}"
+                  f"/{job['total']} pending\t{job['sink_path']}", file=out)
+        return 0
+
+    if args.load_domains:
+        from leadgen_discovery import get_discovery_index
+        with open(args.load_domains, 'rb') as f:
+            try:
+                loaded = get_discovery_index().load_csv(f)
+            except ValueError as e:
+                print(f"leadgen_cli: {args.load_domains}: {e}", file=err)
+                return 2
+        print(f"Loaded {loaded} known URLs from {args.load_domains}", file=err)
+        if not args.input and not args.resume:
+            return 0
+
+    if args.resume:
+        job = store.get_job(args.resume)
+        if job is None:
+            print(f"leadgen_cli: unknown job {args.resume}", file=err)
+            return 2
+        job_id = job['job_id']
+    elif args.input:
+        job_id = _create_job(store, args, _sink_format(args))
+        job = store.get_job(job_id)
+    else:
+        print("leadgen_cli: an input file, --resume, --load-domains or --list-jobs is required", file=err)
+        return 2
+
+    if args.reports:
+        os.makedirs(args.reports, exist_ok=True)
+    resolver = None
+    if not args.no_resolve:
+        from leadgen_resolve import batch_company_index
+        resolver = batch_company_index()
+    runner = BatchRunner(
+        _factory(args.pipeline), max_workers=args.workers, resolver=resolver,
+        source_limiter=source_limiter, sources=None if args.pipeline else DEFAULT_SOURCE_LIMITS.keys(),
+    )
+    if runner.limiting_source and not args.quiet:
+        source = runner.limiting_source
+        print(f"leadgen_cli: only {runner.max_in_flight} of {args.workers} workers can run at once: "
+              f"each company holds a {source} slot and --source-limits allows {source}="
+              f"{source_limiter.limits[source]} (or use --pipeline)", file=err)
+    metrics = get_metrics()
+    if args.metrics_port:
+        serve_metrics(metrics, args.metrics_port)
+    last_dump = time.monotonic()
+    pending = store.count_pending(job_id)
+    stats = BatchStats(pending)
+    started = time.monotonic()
+    if not args.quiet:
+        print(f"{job['job_id']}: {pending} of {job['total']} companies to analyze", file=err)
+    for event in run_job(store, job_id, runner, stats):
+        if event.status not in ('done', 'failed'):
+            continue
+        if event.status == 'done' and args.reports and isinstance(event.profile, dict):
+            _write_report(args.reports, event.profile, args.report_format)
+        if not args.quiet:
+            detail = event.error if event.status == 'failed' else f"{event.elapsed:.1f}s"
+            print(f"[{stats.finished}/{pending}] {event.status} {event.company_name} ({detail})", file=err)
+        if args.metrics_file and time.monotonic() - last_dump >= METRICS_DUMP_INTERVAL:
+            metrics.write_prometheus(args.metrics_file)
+            last_dump = time.monotonic()
+    if args.metrics_file:
+        metrics.write_prometheus(args.metrics_file)
+
+    elapsed = time.monotonic() - started
+    print(
+        f"{stats.done} done, {stats.failed} failed, {stats.coalesced} shared a duplicate's result "
+        f"in {elapsed:.1f}s ({stats.companies_per_minute:.1f} companies/min) -> {job['sink_path']}",
+        file=out
+    )
+    return 1 if stats.failed else 0
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+    return run(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+LEADGen AI - Comparison Table
+Columnar DataFrame of many profiles with numeric columns parsed once at ingestion.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from leadgen_funding import FundingTable
+from leadgen_money import SIZE_FIELDS, money_frame, size_frame
+from leadgen_sink import _format_of, _parts, flatten_profile
+
+NUMERIC_COLUMNS = {
+    'revenue_est': 'revenue_usd',
+    'total_funding_raised': 'funding_usd',
+    'valuation': 'valuation_usd',
+    'team_size': 'employees',
+}
+
+CURRENCY_COLUMNS = {
+    'revenue_est': 'revenue_currency',
+    'total_funding_raised': 'funding_currency',
+    'valuation': 'valuation_currency',
+}
+
+SORT_COLUMNS = {
+    'investment_score': 'Score',
+    'funding_usd': 'Total Funding',
+    'valuation_usd': 'Valuation',
+    'revenue_usd': 'Revenue',
+    'employees': 'Team Size',
+    'founded_year': 'Founded',
+    'company_name': 'Company',
+}
+
+MAX_PLOT_POINTS = 2000
+
+def ingest(frame):
+    """Add typed columns to a frame of flattened profiles, in place, and return it.
+
+    Money columns hold the midpoint of a parsed range converted to US
+    dollars at ``leadgen_money.USD_RATES``, so sorting, filtering and
+    medians compare like with like; ``CURRENCY_COLUMNS`` keep the currency
+    each amount was given in.
+    """
+    for column, numeric in NUMERIC_COLUMNS.items():
+        if column not in frame:
+            frame[column] = pd.NA
+        if column in SIZE_FIELDS:
+            frame[numeric] = size_frame(frame[column])['value']
+            continue
+        parsed = money_frame(frame[column])
+        frame[numeric] = parsed['usd']
+        frame[CURRENCY_COLUMNS[column]] = parsed['currency'].astype('category')
+    frame['investment_score'] = pd.to_numeric(frame.get('investment_score'), errors='coerce')
+    frame['founded_year'] = pd.to_numeric(frame.get('founded_year'), errors='coerce')
+    frame['industry'] = frame.get('industry', pd.Series(index=frame.index, dtype=object)).fillna('N/A').astype('category')
+    frame['company_name'] = frame['company_name'].astype(str)
+    return frame
+
+def read_results(path):
+    """Load a whole batch result file (CSV, JSONL or Parquet) into a DataFrame of strings."""
+    fmt = _format_of(path)
+    if fmt == 'parquet':
+        return pd.concat([pd.read_parquet(part) for part in _parts(path)], ignore_index=True)
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    if fmt == 'csv':
+        return pd.read_csv(path, dtype=str, keep_default_na=False)
+    return pd.read_json(path, lines=True, dtype=False)
+
+class ComparisonTable:
+    """Sort, filter, page and aggregate many profiles held as one DataFrame.
+
+    Build it with ``from_profiles()`` or ``from_results()``; financial and
+    head-count strings are parsed into numeric columns once, so every later
+    sort and filter is a vectorized pandas operation. Views only hand the
+    UI one page of rows or a downsampled set of plot points.
+    """
+
+    def __init__(self, frame):
+        self.frame = ingest(frame)
+        self._funding = None
+
+    @classmethod
+    def from_profiles(cls, profiles):
+        return cls(pd.DataFrame([flatten_profile(profile) for profile in profiles]))
+
+    @classmethod
+    def from_results(cls, path):
+        return cls(read_results(path))
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def industries(self):
+        return sorted(self.frame['industry'].cat.categories)
+
+    @property
+    def funding(self):
+        """FundingTable of every row's rounds, parsed from the flattened column on first use."""
+        if self._funding is None:
+            self._funding = FundingTable()
+            if 'funding_rounds' in self.frame:
+                for company_name, text in zip(self.frame['company_name'], self.frame['funding_rounds']):
+                    if isinstance(text, str):
+                        self._funding.add_lines(company_name, text)
+        return self._funding
+
+    def funding_by_year(self, frame):
+        """Dated rounds per year (count and summed amount) for the companies in ``frame``."""
+        return self.funding.yearly_totals(frame['company_name'].unique())
+
+    def filter(self, industries=None, min_score=None, max_score=None, search=None, ranges=None):
+        """Return the rows matching every given condition."""
+        frame = self.frame
+        mask = np.ones(len(frame), dtype=bool)
+        if industries:
+            mask &= frame['industry'].isin(industries).to_numpy()
+        if min_score is not None:
+            mask &= (frame['investment_score'] >= min_score).to_numpy()
+        if max_score is not None:
+            mask &= (frame['investment_score'] <= max_score).to_numpy()
+        if search:
+            mask &= frame['company_name'].str.contains(search, case=False, regex=False).to_numpy()
+        for column, (low, high) in (ranges or {}).items():
+            values = frame[column]
+            if low is not None:
+                mask &= (values >= low).to_numpy()
+            if high is not None:
+                mask &= (values <= high).to_numpy()
+        return frame[mask]
+
+    @staticmethod
+    def page(frame, sort_by='investment_score', ascending=False, page=0, page_size=50):
+        """Sort ``frame`` and return one page of it, missing values last."""
+        start = page * page_size
+        ordered = frame.sort_values(sort_by, ascending=ascending, na_position='last', kind='stable')
+        return ordered.iloc[start:start + page_size]
+
+    @staticmethod
+    def aggregates(frame, by='industry', top=15):
+        """Per-group company count, mean score and median funding for the largest groups."""
+        grouped = frame.groupby(by, observed=True).agg(
+            companies=('company_name', 'size'),
+            mean_score=('investment_score', 'mean'),
+            median_funding_usd=('funding_usd', 'median'),
+        )
+        return grouped.sort_values('companies', ascending=False).head(top).reset_index()
+
+    @staticmethod
+    def histogram(frame, column, bins=20):
+        """Bin a numeric column server-side; returns a frame of bin edges and counts."""
+        values = frame[column].dropna().to_numpy(dtype=float)
+        if not len(values):
+            return pd.DataFrame(columns=['low', 'high', 'companies'])
+        counts, edges = np.histogram(values, bins=bins)
+        return pd.DataFrame({'low': edges[:-1], 'high': edges[1:], 'companies': counts})
+
+    @staticmethod
+    def plot_points(frame, columns, max_points=MAX_PLOT_POINTS):
+        """Rows to plot, downsampled to at most ``max_points`` with both extremes of each column kept."""
+        points = frame.dropna(subset=list(columns))
+        if len(points) <= max_points:
+            return points
+        keep = set()
+        for column in columns:
+            keep.update(points[column].nlargest(1).index)
+            keep.update(points[column].nsmallest(1).index)
+        rest = points.drop(index=list(keep)).sample(n=max_points - len(keep), random_state=0)
+        return pd.concat([points.loc[list(keep)], rest])
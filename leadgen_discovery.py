@@ -0,0 +1,221 @@
+"""
+LEADGen AI - URL Discovery Index
+Persistent company -> canonical source URL index consulted before live search.
+"""
+
+import csv
+import io
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from leadgen_batch import NAME_COLUMNS
+from leadgen_cache import DAY, default_cache_dir
+from leadgen_metrics import get_metrics
+from leadgen_resolve import resolution_key
+from leadgen_sources import SOURCES
+
+CONFIDENCE = {
+    'csv': 1.0,
+    'search': 0.8,
+}
+
+MIN_CONFIDENCE = 0.5
+
+DEFAULT_MAX_AGE = 90 * DAY
+
+WEBSITE_COLUMNS = ('website', 'domain', 'url', 'homepage')
+
+CSV_BATCH_ROWS = 5000
+
+Discovery = namedtuple('Discovery', 'source url confidence verified_at origin')
+
+def _url(value):
+    value = value.strip()
+    if not value:
+        return None
+    return value if '//' in value else f"https://{value}"
+
+def _csv_columns(header):
+    """Return (name column, {source: column}, confidence column) for a CSV header."""
+    lowered = [cell.strip().lower() for cell in header]
+    name = next((lowered.index(c) for c in NAME_COLUMNS if c in lowered), None)
+    urls = {}
+    for index, cell in enumerate(lowered):
+        if cell in WEBSITE_COLUMNS:
+            urls.setdefault('website', index)
+        elif cell in SOURCES:
+            urls.setdefault(cell, index)
+    confidence = lowered.index('confidence') if 'confidence' in lowered else None
+    return name, urls, confidence
+
+class DiscoveryIndex:
+    """Company -> URL index for every source, keyed by resolution key.
+
+    Entries carry a confidence (1.0 for curated CSV imports, 0.8 for search
+    results) and the time the URL was last seen answering 200. ``lookup()``
+    only serves entries above ``MIN_CONFIDENCE`` and verified within
+    ``max_age``; anything else is a miss and the caller falls back to live
+    search. A URL that returns 404/410 is dropped so the next analysis
+    discovers it again.
+    """
+
+    def __init__(self, path=None, max_age=DEFAULT_MAX_AGE):
+        if path is None:
+            path = os.path.join(default_cache_dir(), 'discovery.sqlite')
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS urls (
+                key TEXT NOT NULL,
+                source TEXT NOT NULL,
+                url TEXT NOT NULL,
+                confidence REAL NOT NULL,
+                verified_at REAL NOT NULL,
+                origin TEXT NOT NULL,
+                PRIMARY KEY (key, source)
+            );
+        """)
+        self._conn.commit()
+
+    def lookup_all(self, company_name, now=None):
+        """Return {source: Discovery} of usable entries for a company."""
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT source, url, confidence, verified_at, origin FROM urls WHERE key = ?',
+                (resolution_key(company_name),)
+            ).fetchall()
+        return {
+            row[0]: Discovery(*row) for row in rows
+            if row[2] >= MIN_CONFIDENCE and now - row[3] < self.max_age
+        }
+
+    def lookup(self, company_name, source='website'):
+        """Return the usable Discovery for one source, counting the hit or miss."""
+        found = self.lookup_all(company_name).get(source)
+        get_metrics().inc('leadgen_discovery_total', outcome='hit' if found else 'miss')
+        return found
+
+    def record(self, company_name, source, url, origin='search', confidence=None, verified_at=None):
+        """Store a URL unless a higher-confidence one is already known for that source."""
+        confidence = CONFIDENCE.get(origin, MIN_CONFIDENCE) if confidence is None else confidence
+        row = (resolution_key(company_name), source, url, confidence,
+               time.time() if verified_at is None else verified_at, origin)
+        with self._lock:
+            self._upsert([row])
+            self._conn.commit()
+
+    def _upsert(self, rows):
+        self._conn.executemany(
+            'INSERT INTO urls (key, source, url, confidence, verified_at, origin) '
+            'VALUES (?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT (key, source) DO UPDATE SET '
+            'url = excluded.url, confidence = excluded.confidence, '
+            'verified_at = excluded.verified_at, origin = excluded.origin '
+            'WHERE excluded.confidence >= urls.confidence OR excluded.url = urls.url',
+            rows
+        )
+
+    def observe(self, company_name, results):
+        """Update entries from fetch results {source: (url, status)}.
+
+        A 200 or 304 marks the stored URL verified now; a 404 or 410 drops it.
+        """
+        key = resolution_key(company_name)
+        now = time.time()
+        verified = [
+            (now, key, source, url) for source, (url, status) in results.items() if status in (200, 304)
+        ]
+        gone = [(key, source, url) for source, (url, status) in results.items() if status in (404, 410)]
+        if not verified and not gone:
+            return
+        with self._lock:
+            self._conn.executemany(
+                'UPDATE urls SET verified_at = ? WHERE key = ? AND source = ? AND url = ?', verified
+            )
+            self._conn.executemany('DELETE FROM urls WHERE key = ? AND source = ? AND url = ?', gone)
+            self._conn.commit()
+
+    def forget(self, company_name):
+        """Drop every URL known for a company."""
+        with self._lock:
+            self._conn.execute('DELETE FROM urls WHERE key = ?', (resolution_key(company_name),))
+            self._conn.commit()
+
+    def load_csv(self, uploaded_file, confidence=None):
+        """Bulk-load known URLs from a CSV; returns the number of URLs stored.
+
+        The header needs a website/domain/url column or a column per source
+        (crunchbase, linkedin, techcrunch); a company/name column is
+        optional, the domain stands in for the name without one. An optional
+        confidence column overrides ``confidence`` (default 1.0) per row.
+        """
+        if isinstance(uploaded_file, io.TextIOBase):
+            stream = uploaded_file
+        else:
+            stream = io.TextIOWrapper(uploaded_file, encoding='utf-8-sig', errors='replace', newline='')
+        default = CONFIDENCE['csv'] if confidence is None else confidence
+        now = time.time()
+        stored = 0
+        try:
+            rows = csv.reader(stream)
+            name_column, url_columns, confidence_column = _csv_columns(next(rows, []))
+            if not url_columns:
+                raise ValueError('CSV needs a website, domain, url or per-source column')
+            batch = []
+            for row in rows:
+                cells = {source: _url(row[i]) if len(row) > i else None for source, i in url_columns.items()}
+                name = row[name_column].strip() if name_column is not None and len(row) > name_column else ''
+                name = name or cells.get('website') or ''
+                if not name:
+                    continue
+                try:
+                    row_confidence = float(row[confidence_column]) if confidence_column is not None else default
+                except (IndexError, ValueError):
+                    row_confidence = default
+                key = resolution_key(name)
+                batch += [(key, source, url, row_confidence, now, 'csv') for source, url in cells.items() if url]
+                if len(batch) >= CSV_BATCH_ROWS:
+                    stored += self._store_batch(batch)
+                    batch = []
+            stored += self._store_batch(batch)
+        finally:
+            if stream is not uploaded_file:
+                stream.detach()
+        return stored
+
+    def _store_batch(self, rows):
+        if rows:
+            with self._lock:
+                self._upsert(rows)
+                self._conn.commit()
+        return len(rows)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(DISTINCT key) FROM urls').fetchone()[0]
+
+    def stats(self):
+        """Return the number of companies and URLs known, per origin."""
+        with self._lock:
+            rows = self._conn.execute('SELECT origin, COUNT(*) FROM urls GROUP BY origin').fetchall()
+        return {'companies': len(self), 'urls': dict(rows)}
+
+_shared_index = None
+_shared_lock = threading.Lock()
+
+def get_discovery_index():
+    """Return the process-wide discovery index."""
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = DiscoveryIndex()
+        return _shared_index
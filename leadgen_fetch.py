@@ -0,0 +1,213 @@
+"""
+LEADGen AI - Fetch Layer
+Asyncio multi-source fetcher with pooled keep-alive connections, per-host
+token-bucket rate limiting, conditional HTTP caching and jittered retries.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from leadgen_httpcache import get_response_cache
+from leadgen_metrics import get_metrics
+from leadgen_progress import ProgressReporter
+from leadgen_ratelimit import get_rate_limiter
+from leadgen_sources import host_of
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+FetchResult = namedtuple('FetchResult', 'source url status text headers elapsed attempts error cache')
+
+def _validators_match(headers, cached):
+    if not headers:
+        return False
+    etag = headers.get('If-None-Match')
+    if etag:
+        return etag == cached.headers.get('ETag')
+    since = headers.get('If-Modified-Since')
+    return bool(since) and since == cached.headers.get('Last-Modified')
+
+def backoff_delay(attempt, base=0.5, cap=8.0):
+    """Full-jitter exponential backoff for retry ``attempt`` (starting at 1)."""
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
+
+class SourceFetcher:
+    """Fetch every source for one company concurrently.
+
+    Requests go through one pooled ``requests.Session`` so connections to each
+    host are kept alive; the blocking calls run on a small thread pool driven
+    from an asyncio event loop. Each attempt first waits for its host's token
+    bucket, every response is fed back to the limiter so 429/503 and
+    Retry-After slow that host down, and failures are retried with jittered
+    exponential backoff. Responses go through ``response_cache``: fresh
+    entries skip the network, stale ones are revalidated, and in replay-only
+    mode nothing is fetched at all. Pass ``response_cache=False`` to disable it.
+    """
+
+    def __init__(self, max_retries=3, timeout=10.0, pool_size=16, rate_limiter=None,
+                 source_limiter=None, backoff_base=0.5, backoff_cap=8.0, response_cache=None):
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.source_limiter = source_limiter
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        if response_cache is None:
+            response_cache = get_response_cache()
+        self.response_cache = response_cache or None
+        self._session = None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers['User-Agent'] = USER_AGENT
+                self._session = session
+            return self._session
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.pool_size, thread_name_prefix='leadgen-fetch'
+                )
+            return self._executor
+
+    def _request(self, source, url, headers=None):
+        if self.source_limiter is not None:
+            with self.source_limiter.slot(source):
+                return self.session.get(url, headers=headers, timeout=self.timeout)
+        return self.session.get(url, headers=headers, timeout=self.timeout)
+
+    async def fetch(self, source, url, headers=None):
+        """Fetch one URL with rate limiting and retries.
+
+        ``headers`` may carry If-None-Match/If-Modified-Since, in which case an
+        unchanged page comes back as status 304 with empty text. With
+        ``Cache-Control: no-cache`` a fresh cached response is not served
+        without asking the origin first (replay-only mode still serves it).
+        """
+        loop = asyncio.get_running_loop()
+        host = host_of(url)
+        started = time.monotonic()
+        cache = self.response_cache
+        cached = cache.lookup(url) if cache is not None else None
+        no_cache = 'no-cache' in (headers or {}).get('Cache-Control', '')
+        if cached is not None and (cache.replay_only or (cached.fresh and not no_cache)):
+            cache.record('hit', len(cached.body))
+            if _validators_match(headers, cached):
+                return FetchResult(source, url, 304, '', cached.headers,
+                                   time.monotonic() - started, 0, None, 'hit')
+            return FetchResult(source, url, cached.status, cached.body, cached.headers,
+                               time.monotonic() - started, 0, None, 'hit')
+        if cache is not None and cache.replay_only:
+            cache.record('miss')
+            return FetchResult(source, url, None, '', {}, time.monotonic() - started, 0,
+                               'not in replay cache', 'miss')
+        request_headers = dict(headers or {})
+        if cached is not None and not request_headers:
+            request_headers = cached.validators()
+
+        attempts = 0
+        status = None
+        error = None
+        while True:
+            attempts += 1
+            wait = self.rate_limiter.reserve(host)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                response = await loop.run_in_executor(
+                    self.executor, self._request, source, url, request_headers or None
+                )
+            except requests.RequestException as e:
+                status, error = None, str(e)
+            else:
+                status = response.status_code
+                self.rate_limiter.observe(host, status, response.headers.get('Retry-After'))
+                if status not in RETRY_STATUSES:
+                    return self._result(source, url, response, headers, cached,
+                                        time.monotonic() - started, attempts)
+                error = f"HTTP {status}"
+            if attempts > self.max_retries:
+                self._count(source, status, attempts)
+                return FetchResult(source, url, status, '', {}, time.monotonic() - started,
+                                   attempts, error, None)
+            await asyncio.sleep(backoff_delay(attempts, self.backoff_base, self.backoff_cap))
+
+    def _count(self, source, status, attempts, size=None):
+        metrics = get_metrics()
+        metrics.inc('leadgen_fetch_requests_total', source=source, status=status or 'error')
+        if attempts > 1:
+            metrics.inc('leadgen_fetch_retries_total', attempts - 1, source=source)
+        if size is not None:
+            metrics.inc('leadgen_fetch_downloaded_bytes_total', size, source=source)
+            metrics.observe('leadgen_fetch_bytes', size, source=source)
+
+    def _result(self, source, url, response, headers, cached, elapsed, attempts):
+        """Turn a final response into a FetchResult, updating the response cache."""
+        cache = self.response_cache
+        status = response.status_code
+        self._count(source, status, attempts, len(response.content))
+        response_headers = dict(response.headers)
+        if status == 304 and cached is not None and (not headers or _validators_match(headers, cached)):
+            cache.refresh(url, response_headers)
+            cache.record('revalidated', len(cached.body))
+            if not headers:
+                return FetchResult(source, url, cached.status, cached.body,
+                                   dict(cached.headers, **response_headers), elapsed, attempts,
+                                   None, 'revalidated')
+        elif cache is not None and status == 200:
+            cache.record('miss')
+            cache.store(url, status, response_headers, response.text)
+        error = None if response.ok else f"HTTP {status}"
+        return FetchResult(source, url, status, response.text, response_headers, elapsed,
+                           attempts, error, None)
+
+    async def fetch_many(self, urls, progress=None, headers=None):
+        """Fetch {source: url} concurrently and return {source: FetchResult}.
+
+        ``headers`` optionally maps a source to extra request headers.
+        """
+        progress = progress if progress is not None else ProgressReporter()
+        headers = headers or {}
+
+        async def fetch_one(source, url):
+            with progress.stage('fetch', source):
+                return await self.fetch(source, url, headers.get(source))
+
+        results = await asyncio.gather(*(fetch_one(s, u) for s, u in urls.items()))
+        return {result.source: result for result in results}
+
+    def fetch_all(self, urls, progress=None, headers=None):
+        """Blocking wrapper around ``fetch_many()``."""
+        return asyncio.run(self.fetch_many(urls, progress, headers))
+
+    def close(self):
+        """Close pooled connections and worker threads."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
@@ -0,0 +1,245 @@
+"""
+LEADGen AI - Funding Rounds
+Dated funding rounds in a compact, array-backed table shared across profiles.
+"""
+
+import re
+from array import array
+from datetime import date
+
+from leadgen_money import USD_RATES, parse_money
+
+ROUND_TYPES = (
+    'Unknown', 'Pre-Seed', 'Angel', 'Seed', 'Series A', 'Series B', 'Series C', 'Series D',
+    'Series E', 'Series F', 'Series G', 'Series H', 'Venture Round', 'Private Equity',
+    'Debt Financing', 'IPO',
+)
+
+ROUND_CODES = {name.lower(): code for code, name in enumerate(ROUND_TYPES)}
+
+PRECISIONS = ('none', 'year', 'month', 'day')
+
+MONTHS = {
+    name: number
+    for number, names in enumerate((
+        ('jan', 'january'), ('feb', 'february'), ('mar', 'march'), ('apr', 'april'),
+        ('may',), ('jun', 'june'), ('jul', 'july'), ('aug', 'august'),
+        ('sep', 'sept', 'september'), ('oct', 'october'), ('nov', 'november'), ('dec', 'december'),
+    ), start=1)
+    for name in names
+}
+
+_MONTH = r'(?P<month>' + '|'.join(sorted(MONTHS, key=len, reverse=True)) + r')\.?'
+
+ISO_DATE_RE = re.compile(r'\b(?P<year>(?:19|20)\d{2})-(?P<month>\d{2})(?:-(?P<day>\d{2}))?\b')
+MONTH_DATE_RE = re.compile(_MONTH + r'\s+(?:(?P<day>\d{1,2})(?:st|nd|rd|th)?,?\s+)?(?P<year>(?:19|20)\d{2})\b', re.I)
+DAY_MONTH_DATE_RE = re.compile(r'\b(?P<day>\d{1,2})\s+' + _MONTH + r'\s+(?P<year>(?:19|20)\d{2})\b', re.I)
+YEAR_RE = re.compile(r'\b(?:in\s+)?(?P<year>(?:19|20)\d{2})\b')
+
+FUNDING_LINE_RE = re.compile(r'\s*(?P<type>[^:;]+?):\s*(?P<amount>[^;(]*?)\s*(?:\((?P<date>[^)]*)\))?\s*(?:;|$)')
+
+def parse_round_date(text):
+    """Return ``(date, precision)`` for the first date in ``text``, or ``(None, 'none')``.
+
+    Missing parts default to the first of the month or year; ``precision``
+    says which of 'day', 'month' or 'year' was actually given.
+    """
+    for pattern in (ISO_DATE_RE, DAY_MONTH_DATE_RE, MONTH_DATE_RE):
+        match = pattern.search(text or '')
+        if match:
+            month = match.group('month')
+            month = int(month) if month.isdigit() else MONTHS[month.lower().rstrip('.')]
+            day = match.group('day')
+            try:
+                return date(int(match.group('year')), month, int(day or 1)), 'day' if day else 'month'
+            except ValueError:
+                continue
+    match = YEAR_RE.search(text or '')
+    if match:
+        return date(int(match.group('year')), 1, 1), 'year'
+    return None, 'none'
+
+def format_round_date(value, precision):
+    """Render a round date at the precision it was given."""
+    if value is None:
+        return None
+    if precision == 'year':
+        return str(value.year)
+    if precision == 'month':
+        return value.strftime('%Y-%m')
+    return value.isoformat()
+
+def round_code(round_type):
+    """Index of ``round_type`` in ROUND_TYPES (0 for anything unrecognized)."""
+    return ROUND_CODES.get(str(round_type or '').strip().lower(), 0)
+
+class FundingRound:
+    """One funding round: type, amount in ``currency`` and date with its precision."""
+
+    __slots__ = ('round_type', 'amount', 'currency', 'date', 'precision')
+
+    def __init__(self, round_type, amount=None, currency=None, date=None, precision='none'):
+        self.round_type = round_type
+        self.amount = amount
+        self.currency = currency
+        self.date = date
+        self.precision = precision
+
+    @classmethod
+    def from_dict(cls, round_data, index=0):
+        """Build a round from a profile's ``funding_rounds`` entry."""
+        amount = parse_money(str(round_data.get('amount') or ''))
+        value, precision = parse_round_date(str(round_data.get('date') or ''))
+        return cls(
+            round_data.get('type') or f'Round {index + 1}',
+            amount.low if amount else None,
+            amount.currency if amount else None,
+            value,
+            precision,
+        )
+
+    def __repr__(self):
+        return (f"FundingRound({self.round_type!r}, {self.amount!r}, {self.currency!r}, "
+                f"{format_round_date(self.date, self.precision)!r})")
+
+class FundingTable:
+    """Funding rounds of many companies in parallel typed arrays.
+
+    Each round costs a few dozen bytes (company id, round type code,
+    amount, currency code, date ordinal and precision) instead of a dict
+    per round, and ``to_frame()`` hands the columns to pandas without
+    copying them round by round. Company names and currencies are interned
+    once per table.
+    """
+
+    def __init__(self):
+        self.companies = []
+        self._company_ids = {}
+        self.currencies = [None]
+        self._currency_ids = {None: 0}
+        self.labels = {}
+        self.company = array('I')
+        self.round_type = array('B')
+        self.amount = array('d')
+        self.currency = array('B')
+        self.day = array('i')
+        self.precision = array('B')
+
+    def __len__(self):
+        return len(self.company)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the round arrays."""
+        return sum(
+            column.itemsize * len(column)
+            for column in (self.company, self.round_type, self.amount, self.currency,
+                           self.day, self.precision)
+        )
+
+    def _intern(self, values, ids, value):
+        if value not in ids:
+            ids[value] = len(values)
+            values.append(value)
+        return ids[value]
+
+    def append(self, company_name, funding_round):
+        """Add one FundingRound for ``company_name``."""
+        code = round_code(funding_round.round_type)
+        row = len(self.company)
+        if code == 0 and funding_round.round_type:
+            self.labels[row] = str(funding_round.round_type)
+        self.company.append(self._intern(self.companies, self._company_ids, str(company_name)))
+        self.round_type.append(code)
+        self.amount.append(float('nan') if funding_round.amount is None else funding_round.amount)
+        self.currency.append(self._intern(self.currencies, self._currency_ids, funding_round.currency))
+        self.day.append(funding_round.date.toordinal() if funding_round.date else 0)
+        self.precision.append(PRECISIONS.index(funding_round.precision))
+
+    def add_profile(self, profile):
+        """Add every round of a profile; returns the number of rounds added."""
+        company_name = profile.get('company_name')
+        rounds = profile.get('funding_rounds') or []
+        for index, round_data in enumerate(rounds):
+            self.append(company_name, FundingRound.from_dict(round_data, index))
+        return len(rounds)
+
+    def add_lines(self, company_name, text):
+        """Add rounds from a flattened "Seed: $1M (2021-03); Series A: ..." export column."""
+        added = 0
+        for match in FUNDING_LINE_RE.finditer(text or ''):
+            if not match.group('type').strip():
+                continue
+            self.append(company_name, FundingRound.from_dict({
+                'type': match.group('type').strip(),
+                'amount': match.group('amount'),
+                'date': match.group('date'),
+            }, added))
+            added += 1
+        return added
+
+    def _row(self, row):
+        code = self.round_type[row]
+        day = self.day[row]
+        amount = self.amount[row]
+        return FundingRound(
+            self.labels.get(row, ROUND_TYPES[code]),
+            None if amount != amount else amount,
+            self.currencies[self.currency[row]],
+            date.fromordinal(day) if day else None,
+            PRECISIONS[self.precision[row]],
+        )
+
+    def rounds(self, company_name=None):
+        """FundingRound records, for one company or all of them, in insertion order."""
+        if company_name is None:
+            return [self._row(row) for row in range(len(self))]
+        company_id = self._company_ids.get(str(company_name))
+        if company_id is None:
+            return []
+        return [self._row(row) for row, owner in enumerate(self.company) if owner == company_id]
+
+    def to_frame(self):
+        """Columns as a pandas DataFrame with ``company``, ``round``, ``amount``, ``currency``, ``date``."""
+        import numpy as np
+        import pandas as pd
+        days = np.frombuffer(self.day, dtype=np.int32)
+        dates = np.full(len(days), np.datetime64('NaT'), dtype='datetime64[D]')
+        dated = days > 0
+        dates[dated] = (days[dated] - date(1970, 1, 1).toordinal()).astype('datetime64[D]')
+        frame = pd.DataFrame({
+            'company': pd.Categorical.from_codes(np.frombuffer(self.company, dtype=np.uint32), self.companies),
+            'round': pd.Categorical.from_codes(np.frombuffer(self.round_type, dtype=np.uint8), ROUND_TYPES),
+            'amount': np.frombuffer(self.amount, dtype=np.float64),
+            'currency': pd.Categorical.from_codes(
+                np.frombuffer(self.currency, dtype=np.uint8).astype(np.int16) - 1, self.currencies[1:]
+            ),
+            'date': dates,
+            'precision': pd.Categorical.from_codes(np.frombuffer(self.precision, dtype=np.uint8), PRECISIONS),
+        })
+        if self.labels:
+            frame['round'] = frame['round'].astype(str)
+            frame.loc[list(self.labels), 'round'] = list(self.labels.values())
+        return frame
+
+    def yearly_totals(self, companies=None):
+        """Dated rounds per year: round count and amount summed in US dollars, optionally for some companies.
+
+        Rounds in an unknown currency count as rounds but add nothing to the
+        amount; a year with no convertible round has a NaN amount, not 0.
+        """
+        frame = self.to_frame()
+        if companies is not None:
+            frame = frame[frame['company'].isin(list(companies))]
+        frame = frame.dropna(subset=['date'])
+        frame = frame.assign(amount=frame['amount'] * frame['currency'].map(USD_RATES).astype(float))
+        grouped = frame.groupby(frame['date'].dt.year).agg(
+            rounds=('round', 'size'), amount=('amount', lambda amounts: amounts.sum(min_count=1))
+        )
+        return grouped.rename_axis('year').reset_index()
+
+def funding_table(profile):
+    """FundingTable holding a single profile's rounds."""
+    table = FundingTable()
+    table.add_profile(profile)
+    return table
@@ -0,0 +1,217 @@
+"""
+LEADGen AI - HTTP Cache
+On-disk conditional HTTP response cache with compressed bodies and replay mode.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from email.utils import parsedate_to_datetime
+
+from leadgen_cache import default_cache_dir
+from leadgen_metrics import get_metrics
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Expires', 'Date')
+
+_MAX_AGE = re.compile(r'(?:s-maxage|max-age)\s*=\s*(\d+)')
+
+def freshness_lifetime(headers, now=None):
+    """Seconds a response may be served without revalidation, or None if it must not be stored."""
+    cache_control = (headers.get('Cache-Control') or '').lower()
+    if 'no-store' in cache_control:
+        return None
+    if 'no-cache' in cache_control:
+        return 0
+    match = _MAX_AGE.search(cache_control)
+    if match:
+        return int(match.group(1))
+    expires = headers.get('Expires')
+    if expires:
+        try:
+            return max(0, int(parsedate_to_datetime(expires).timestamp() - (now or time.time())))
+        except (TypeError, ValueError):
+            return 0
+    return 0
+
+class CachedResponse:
+    """A stored response: decompressed body plus the headers needed for revalidation."""
+
+    __slots__ = ('url', 'status', 'headers', 'body', 'stored_at', 'expires_at')
+
+    def __init__(self, url, status, headers, body, stored_at, expires_at):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self):
+        return time.time() < self.expires_at
+
+    def validators(self):
+        """Conditional request headers for revalidating this response."""
+        headers = {}
+        if self.headers.get('ETag'):
+            headers['If-None-Match'] = self.headers['ETag']
+        if self.headers.get('Last-Modified'):
+            headers['If-Modified-Since'] = self.headers['Last-Modified']
+        return headers
+
+class ResponseCache:
+    """URL-keyed response store shared by every fetcher in the process.
+
+    Bodies are zlib-compressed into SQLite. Freshness follows Cache-Control /
+    Expires; stale entries are revalidated with If-None-Match /
+    If-Modified-Since so an unchanged page costs a 304. Least recently used
+    entries are evicted once the stored bodies exceed ``max_bytes``. With
+    ``replay_only`` the fetcher never touches the network and serves
+    whatever is stored, which makes runs deterministic for benchmarking.
+    """
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES, replay_only=False):
+        if path is None:
+            path = os.path.join(default_cache_dir(), 'responses.sqlite')
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.replay_only = replay_only
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+        """)
+        self._conn.commit()
+
+    def lookup(self, url):
+        """Return the CachedResponse for ``url`` (fresh or stale), or None."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status, headers, body, stored_at, expires_at FROM responses WHERE url = ?',
+                (url,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    'UPDATE responses SET last_access = ? WHERE url = ?', (time.time(), url)
+                )
+                self._conn.commit()
+        if row is None:
+            return None
+        status, headers, body, stored_at, expires_at = row
+        return CachedResponse(url, status, json.loads(headers),
+                              zlib.decompress(body).decode('utf-8', errors='replace'),
+                              stored_at, expires_at)
+
+    def store(self, url, status, headers, text):
+        """Store a 200 response unless its Cache-Control forbids it."""
+        if status != 200:
+            return
+        lifetime = freshness_lifetime(headers)
+        if lifetime is None:
+            return
+        kept = {name: headers[name] for name in STORED_HEADERS if headers.get(name)}
+        body = zlib.compress(text.encode('utf-8'), 6)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(url, status, headers, body, size, stored_at, expires_at, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, status, json.dumps(kept), body, len(body), now, now + lifetime, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, url, headers):
+        """Extend a stored response after a 304, taking updated validators from ``headers``."""
+        lifetime = freshness_lifetime(headers) or 0
+        with self._lock:
+            row = self._conn.execute('SELECT headers FROM responses WHERE url = ?', (url,)).fetchone()
+            if row is None:
+                return
+            kept = json.loads(row[0])
+            kept.update({name: headers[name] for name in STORED_HEADERS if headers.get(name)})
+            now = time.time()
+            self._conn.execute(
+                'UPDATE responses SET headers = ?, stored_at = ?, expires_at = ?, last_access = ? '
+                'WHERE url = ?',
+                (json.dumps(kept), now, now + lifetime, now, url)
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        (total,) = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()
+        if total <= self.max_bytes:
+            return
+        for url, size in self._conn.execute(
+            'SELECT url, size FROM responses ORDER BY last_access'
+        ).fetchall():
+            self._conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def record(self, outcome, saved_bytes=0):
+        """Count a 'hit', 'miss' or 'revalidated' lookup and the body bytes it saved."""
+        get_metrics().inc('leadgen_http_cache_total', outcome=outcome)
+        with self._lock:
+            if outcome == 'hit':
+                self.hits += 1
+            elif outcome == 'revalidated':
+                self.revalidated += 1
+            else:
+                self.misses += 1
+            self.bytes_saved += saved_bytes
+
+    def stats(self):
+        """Return hit/revalidation counters and stored size."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses'
+            ).fetchone()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidated': self.revalidated,
+            'bytes_saved': self.bytes_saved,
+            'entries': entries,
+            'stored_bytes': size,
+            'max_bytes': self.max_bytes,
+            'replay_only': self.replay_only,
+        }
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+def get_response_cache():
+    """Return the process-wide response cache (replay-only if LEADGEN_REPLAY_ONLY=1)."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache(
+                replay_only=os.environ.get('LEADGEN_REPLAY_ONLY') == '1'
+            )
+        return _shared_cache
@@ -0,0 +1,53 @@
+"""
+LEADGen AI - Incremental Refresh
+Source freshness checks and field-level diffs between profile versions.
+"""
+
+import time
+
+from leadgen_money import PARSED_KEY
+from leadgen_sources import SOURCES, sources_for_field
+
+SOURCES_KEY = '_sources'
+
+METADATA_KEYS = (SOURCES_KEY, PARSED_KEY)
+
+def source_is_fresh(meta, now=None):
+    """Return True if a source's stored result is still within its TTL."""
+    source = SOURCES.get(meta.get('source'))
+    if source is None or 'fetched_at' not in meta:
+        return False
+    now = time.time() if now is None else now
+    return now - meta['fetched_at'] < source.ttl
+
+def validator_headers(meta):
+    """Conditional request headers for a stored source result."""
+    headers = {}
+    if meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+    return headers
+
+def diff_profiles(old, new):
+    """Return field-level changes between two profiles.
+
+    Each change is ``{'field', 'old', 'new', 'sources'}`` where ``sources``
+    lists the sources that feed that field. Source metadata and cached
+    parsed values are ignored.
+    """
+    old = old or {}
+    changes = []
+    for field in sorted(set(old) | set(new)):
+        if field in METADATA_KEYS:
+            continue
+        before = old.get(field)
+        after = new.get(field)
+        if before != after:
+            changes.append({
+                'field': field,
+                'old': before,
+                'new': after,
+                'sources': sources_for_field(field),
+            })
+    return changes
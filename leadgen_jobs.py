@@ -0,0 +1,286 @@
+"""
+LEADGen AI - Batch Jobs
+Checkpointed batch jobs: a persistent manifest and per-company status.
+"""
+
+import itertools
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from leadgen_batch import BatchStats
+from leadgen_cache import default_cache_dir
+from leadgen_sink import ResultSink, batch_results_path
+
+ITEM_STATUSES = ('pending', 'running', 'done', 'failed')
+
+DEFAULT_MAX_ATTEMPTS = 3
+
+INSERT_CHUNK = 1000
+
+class JobStore:
+    """SQLite store of batch jobs and the status of every company in them.
+
+    A job is resumable at any point: ``pending_items()`` yields companies
+    that are pending, were left ``running`` by an interrupted run, or failed
+    with attempts to spare, so finished companies are never scraped twice.
+    """
+
+    def __init__(self, path=None, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        if path is None:
+            path = os.path.join(default_cache_dir(), 'jobs.sqlite')
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                sink_path TEXT NOT NULL,
+                sink_format TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS job_items (
+                job_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                company_name TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (job_id, idx)
+            );
+            CREATE INDEX IF NOT EXISTS job_items_status ON job_items (job_id, status);
+        """)
+        self._conn.commit()
+
+    def create_job(self, name, company_names, sink_format='csv', sink_path=None):
+        """Create a job from an iterable of names, inserted in chunks; returns the job id.
+
+        Results go to ``sink_path``, by default a new file under the cache directory.
+        """
+        job_id = time.strftime('job-%Y%m%d-%H%M%S-') + uuid.uuid4().hex[:6]
+        now = time.time()
+        sink_path = os.path.abspath(sink_path) if sink_path else batch_results_path(sink_format, job_id)
+        total = 0
+        names = iter(company_names)
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO jobs (job_id, name, sink_path, sink_format, total, status, '
+                'created_at, updated_at) VALUES (?, ?, ?, ?, 0, ?, ?, ?)',
+                (job_id, name, sink_path, sink_format, 'pending', now, now)
+            )
+            while True:
+                chunk = list(itertools.islice(names, INSERT_CHUNK))
+                if not chunk:
+                    break
+                self._conn.executemany(
+                    'INSERT INTO job_items (job_id, idx, company_name, status, updated_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    [(job_id, total + i, company_name, 'pending', now)
+                     for i, company_name in enumerate(chunk)]
+                )
+                total += len(chunk)
+            self._conn.execute('UPDATE jobs SET total = ? WHERE job_id = ?', (total, job_id))
+            self._conn.commit()
+        return job_id
+
+    def get_job(self, job_id):
+        """Return the job manifest as a dict, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT job_id, name, sink_path, sink_format, total, status, created_at, updated_at '
+                'FROM jobs WHERE job_id = ?', (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ('job_id', 'name', 'sink_path', 'sink_format', 'total', 'status',
+                'created_at', 'updated_at')
+        return dict(zip(keys, row))
+
+    def list_jobs(self, unfinished_only=False):
+        """Return job manifests, newest first."""
+        query = 'SELECT job_id FROM jobs'
+        if unfinished_only:
+            query += " WHERE status != 'done'"
+        with self._lock:
+            job_ids = [row[0] for row in self._conn.execute(query + ' ORDER BY created_at DESC')]
+        return [self.get_job(job_id) for job_id in job_ids]
+
+    def counts(self, job_id):
+        """Return {status: count} for a job's companies."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT status, COUNT(*) FROM job_items WHERE job_id = ? GROUP BY status', (job_id,)
+            ).fetchall()
+        counts = dict.fromkeys(ITEM_STATUSES, 0)
+        counts.update(rows)
+        return counts
+
+    def count_pending(self, job_id):
+        """Number of companies ``pending_items()`` would yield."""
+        with self._lock:
+            (pending,) = self._conn.execute(
+                'SELECT COUNT(*) FROM job_items WHERE job_id = ? AND '
+                "(status IN ('pending', 'running') OR (status = 'failed' AND attempts < ?))",
+                (job_id, self.max_attempts)
+            ).fetchone()
+        return pending
+
+    def pending_items(self, job_id):
+        """Yield (idx, company_name) for companies that still need a run."""
+        last = -1
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    'SELECT idx, company_name FROM job_items WHERE job_id = ? AND idx > ? AND '
+                    "(status IN ('pending', 'running') OR (status = 'failed' AND attempts < ?)) "
+                    'ORDER BY idx LIMIT ?',
+                    (job_id, last, self.max_attempts, INSERT_CHUNK)
+                ).fetchall()
+            if not rows:
+                return
+            for idx, company_name in rows:
+                yield idx, company_name
+            last = rows[-1][0]
+
+    def failed_items(self, job_id):
+        """Return failed companies with their error and attempt count."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT company_name, attempts, error FROM job_items "
+                "WHERE job_id = ? AND status = 'failed' ORDER BY idx", (job_id,)
+            ).fetchall()
+        return [{'company_name': n, 'attempts': a, 'error': e} for n, a, e in rows]
+
+    def recent_items(self, job_id, statuses=('running', 'failed'), limit=50):
+        """Return the most recently updated companies in ``statuses``, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT company_name, status, attempts, error, updated_at FROM job_items '
+                f"WHERE job_id = ? AND status IN ({', '.join('?' * len(statuses))}) "
+                'ORDER BY updated_at DESC LIMIT ?', (job_id, *statuses, limit)
+            ).fetchall()
+        keys = ('company_name', 'status', 'attempts', 'error', 'updated_at')
+        return [dict(zip(keys, row)) for row in rows]
+
+    def mark(self, job_id, idx, status, error=None):
+        """Record a company's status; 'running' counts as a new attempt."""
+        now = time.time()
+        with self._lock:
+            if status == 'running':
+                self._conn.execute(
+                    'UPDATE job_items SET status = ?, attempts = attempts + 1, updated_at = ? '
+                    'WHERE job_id = ? AND idx = ?', (status, now, job_id, idx)
+                )
+            else:
+                self._conn.execute(
+                    'UPDATE job_items SET status = ?, error = ?, updated_at = ? '
+                    'WHERE job_id = ? AND idx = ?', (status, error, now, job_id, idx)
+                )
+            self._conn.commit()
+
+    def set_status(self, job_id, status):
+        """Update the job-level status (pending/running/done)."""
+        with self._lock:
+            self._conn.execute(
+                'UPDATE jobs SET status = ?, updated_at = ? WHERE job_id = ?',
+                (status, time.time(), job_id)
+            )
+            self._conn.commit()
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+def get_job_store():
+    """Return the process-wide job store."""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = JobStore()
+        return _shared_store
+
+def run_job(store, job_id, runner, stats=None):
+    """Run (or resume) a job, yielding BatchEvents while checkpointing each company.
+
+    A company is marked done only once its row is on disk (for Parquet,
+    once its row group's part file is written), so a restart never loses a
+    completed result; rows still buffered at a crash are scraped again.
+    """
+    job = store.get_job(job_id)
+    stats = stats if stats is not None else BatchStats(job['total'])
+    store.set_status(job_id, 'running')
+    sink = ResultSink(job['sink_path'], job['sink_format'], append=True)
+    try:
+        for event in runner.run_items(store.pending_items(job_id), stats):
+            if event.status == 'running':
+                store.mark(job_id, event.index, 'running')
+            elif event.status == 'done':
+                for idx in sink.write(event.profile, event.index):
+                    store.mark(job_id, idx, 'done')
+            elif event.status == 'failed':
+                store.mark(job_id, event.index, 'failed', event.error)
+            yield event
+    finally:
+        for idx in sink.close():
+            store.mark(job_id, idx, 'done')
+    store.set_status(job_id, 'pending' if store.count_pending(job_id) else 'done')
+
+class BackgroundJob:
+    """Drive ``run_job()`` for one job on a daemon thread and keep its live stats.
+
+    The thread only coordinates: it resolves names, hands companies to the
+    runner's executor and checkpoints results, so it does not take a worker
+    of the shared analysis queue while the job's companies wait for one.
+    """
+
+    def __init__(self, store, job_id, runner):
+        self.store = store
+        self.job_id = job_id
+        self.runner = runner
+        self.stats = BatchStats()
+        self.status = 'running'
+        self.error = None
+        self.started_at = time.time()
+        self.finished_at = None
+        self._thread = threading.Thread(target=self._run, name=f"leadgen-job-{job_id}", daemon=True)
+
+    def _run(self):
+        try:
+            for _ in run_job(self.store, self.job_id, self.runner, self.stats):
+                pass
+        except Exception as e:
+            self.status, self.error = 'failed', str(e)
+        else:
+            self.status = 'done'
+        finally:
+            self.finished_at = time.time()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+_background_jobs = {}
+_background_lock = threading.Lock()
+
+def start_background_job(store, job_id, runner):
+    """Run a job in the background unless it already is; returns its BackgroundJob."""
+    with _background_lock:
+        job = _background_jobs.get(job_id)
+        if job is None or job.status != 'running':
+            job = _background_jobs[job_id] = BackgroundJob(store, job_id, runner).start()
+        return job
+
+def background_job(job_id):
+    """Return the BackgroundJob last started for ``job_id``, or None."""
+    with _background_lock:
+        return _background_jobs.get(job_id)
@@ -0,0 +1,218 @@
+"""
+LEADGen AI - Metrics
+Process-wide counters and histograms with a Prometheus text exposition.
+"""
+
+import math
+import os
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+BYTES_BUCKETS = (1e3, 1e4, 5e4, 1e5, 2.5e5, 5e5, 1e6, 5e6)
+
+METRICS = {
+    'leadgen_stage_seconds': ('histogram', 'Time spent in each pipeline stage, per source for fetch.', SECONDS_BUCKETS),
+    'leadgen_fetch_bytes': ('histogram', 'Body size of fetched source pages.', BYTES_BUCKETS),
+    'leadgen_fetch_requests_total': ('counter', 'Source requests by final HTTP status.', None),
+    'leadgen_fetch_retries_total': ('counter', 'Source request attempts beyond the first.', None),
+    'leadgen_fetch_downloaded_bytes_total': ('counter', 'Response bytes downloaded from sources.', None),
+    'leadgen_parsed_pages_total': ('counter', 'Source pages parsed, by source.', None),
+    'leadgen_parse_cpu_seconds_total': ('counter', 'CPU time spent parsing source pages, by source.', None),
+    'leadgen_parse_payload_bytes_total': ('counter', 'Compressed page bytes handed to parser processes.', None),
+    'leadgen_discovery_total': ('counter', 'Website discovery index lookups by outcome.', None),
+    'leadgen_http_cache_total': ('counter', 'HTTP response cache lookups by outcome.', None),
+    'leadgen_profile_cache_total': ('counter', 'Profile cache lookups by outcome.', None),
+    'leadgen_rate_limit_throttled_total': ('counter', 'Responses that made a host back off (429/503).', None),
+    'leadgen_rate_limit_wait_seconds_total': ('counter', 'Time requests waited for a rate-limit token.', None),
+    'leadgen_companies_total': ('counter', 'Companies processed by batch runs, by outcome.', None),
+}
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class Histogram:
+    """Cumulative bucket counts, sum and count for one label set."""
+
+    __slots__ = ('buckets', 'counts', 'total', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Estimate the ``q`` quantile by interpolating within its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for bound, count in zip(self.buckets, self.counts):
+            if count and seen + count >= rank:
+                return lower + (bound - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return self.buckets[-1] if self.buckets else None
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms keyed by metric name and labels.
+
+    Instrumented code calls ``inc()`` and ``observe()`` with label keywords
+    (kept to small fixed sets such as stage, source and outcome).
+    ``render_prometheus()`` produces the text exposition format for a
+    scrape endpoint (``serve_metrics()``) or a node_exporter textfile
+    (``write_prometheus()``); ``counters()`` and ``histograms()`` feed the
+    UI diagnostics panel.
+    """
+
+    def __init__(self, definitions=None):
+        self.definitions = dict(METRICS if definitions is None else definitions)
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        """Add ``value`` to a counter."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """Record one observation in a histogram."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                definition = self.definitions.get(name)
+                buckets = definition[2] if definition and definition[2] else SECONDS_BUCKETS
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def counters(self):
+        """Return one row per counter and label set."""
+        with self._lock:
+            items = sorted(self._counters.items())
+        return [
+            {'metric': name, 'labels': ', '.join(f"{k}={v}" for k, v in key), 'value': value}
+            for (name, key), value in items
+        ]
+
+    def histograms(self, name=None):
+        """Return count, mean and estimated p50/p95 per histogram and label set."""
+        with self._lock:
+            items = sorted(
+                (key, (h.count, h.total, h.quantile(0.5), h.quantile(0.95)))
+                for key, h in self._histograms.items() if name is None or key[0] == name
+            )
+        return [
+            dict(metric=metric, **dict(labels), count=count, mean=total / count if count else None,
+                 p50=p50, p95=p95)
+            for (metric, labels), (count, total, p50, p95) in items
+        ]
+
+    def render_prometheus(self):
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                (key, (list(h.buckets), list(h.counts), h.total, h.count))
+                for key, h in self._histograms.items()
+            )
+        lines = []
+        described = set()
+
+        def describe(name, kind):
+            if name in described:
+                return
+            described.add(name)
+            definition = self.definitions.get(name)
+            if definition:
+                lines.append(f"# HELP {name} {definition[1]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        for (name, key), value in counters:
+            describe(name, 'counter')
+            lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+        for (name, key), (buckets, counts, total, count) in histograms:
+            describe(name, 'histogram')
+            cumulative = 0
+            for bound, bucket_count in zip(list(buckets) + [math.inf], counts):
+                cumulative += bucket_count
+                le = (('le', _format_value(bound)),)
+                lines.append(f"{name}_bucket{_format_labels(key, le)} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(key)} {_format_value(total)}")
+            lines.append(f"{name}_count{_format_labels(key)} {count}")
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        """Atomically write the exposition to ``path`` (e.g. for a textfile collector)."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render_prometheus())
+        os.replace(temp_path, path)
+
+def serve_metrics(registry, port, host='127.0.0.1'):
+    """Serve ``/metrics`` from a daemon thread; returns the HTTP server."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    thread = threading.Thread(target=server.serve_forever, name='leadgen-metrics', daemon=True)
+    thread.start()
+    return server
+
+_shared_registry = None
+_shared_lock = threading.Lock()
+
+def get_metrics():
+    """Return the process-wide metrics registry."""
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = MetricsRegistry()
+        return _shared_registry
@@ -0,0 +1,230 @@
+"""
+LEADGen AI - Money and Size Parsing
+Normalize "$1.2B", "€10-20M", "50M USD" or "50-100 employees" into numbers with currency and range bounds.
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+CURRENCY_SYMBOLS = {
+    '$': 'USD', 'US$': 'USD', 'USD': 'USD',
+    '€': 'EUR', 'EUR': 'EUR',
+    '£': 'GBP', 'GBP': 'GBP',
+    '¥': 'JPY', 'JPY': 'JPY',
+    '₹': 'INR', 'INR': 'INR', 'RS': 'INR', 'RS.': 'INR',
+}
+
+UNKNOWN_CURRENCY = 'XXX'
+
+USD_RATES = {
+    'USD': 1.0,
+    'EUR': 1.08,
+    'GBP': 1.27,
+    'JPY': 0.0067,
+    'INR': 0.012,
+}
+
+CURRENCY_PREFIXES = {code: symbol for symbol, code in CURRENCY_SYMBOLS.items() if len(symbol) == 1}
+CURRENCY_PREFIXES[UNKNOWN_CURRENCY] = ''
+
+UNIT_MULTIPLIERS = {
+    'k': 1e3, 'thousand': 1e3,
+    'lakh': 1e5, 'lac': 1e5,
+    'm': 1e6, 'mm': 1e6, 'mn': 1e6, 'mln': 1e6, 'million': 1e6,
+    'cr': 1e7, 'crore': 1e7,
+    'b': 1e9, 'bn': 1e9, 'bln': 1e9, 'billion': 1e9,
+    't': 1e12, 'trillion': 1e12, 'lakhcrore': 1e12,
+}
+
+MONEY_FIELDS = ('revenue_est', 'total_funding_raised', 'valuation')
+
+SIZE_FIELDS = ('team_size',)
+
+PARSED_KEY = '_parsed'
+
+_CURRENCY = r'US\$|\$|€|£|¥|₹|USD|EUR|GBP|JPY|INR|(?<![a-z])Rs\.?'
+_CURRENCY_CODE = r'USD|EUR|GBP|JPY|INR'
+_NUMBER = r'\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?'
+_UNIT = (r'(?:lakh\s?crores?|(?:thousand|lakh|lac|million|crore|billion|trillion)s?'
+         r'|mln|mn|mm|cr|bln|bn|[KMBT])(?![a-z])')
+
+MONEY_PATTERN = (
+    rf'(?P<currency>{_CURRENCY})\s?(?P<low>{_NUMBER})\s?(?P<low_unit>{_UNIT})?'
+    rf'(?:\s?(?:to|-|–)\s?(?:{_CURRENCY})?\s?(?P<high>{_NUMBER})\s?(?P<high_unit>{_UNIT})?)?'
+)
+
+SUFFIX_MONEY_PATTERN = (
+    rf'(?<![\w.,])(?P<low>{_NUMBER})\s?(?P<low_unit>{_UNIT})?'
+    rf'(?:\s?(?:to|-|–)\s?(?P<high>{_NUMBER})\s?(?P<high_unit>{_UNIT})?)?'
+    rf'(?:\s?(?P<currency>{_CURRENCY_CODE})\b)?'
+)
+
+SIZE_PATTERN = rf'(?P<low>{_NUMBER})\s?(?:(?P<plus>\+)|(?:-|–|to)\s?(?P<high>{_NUMBER}))?'
+
+MONEY_RE = re.compile(MONEY_PATTERN, re.I)
+
+SUFFIX_MONEY_RE = re.compile(SUFFIX_MONEY_PATTERN, re.I)
+
+SIZE_RE = re.compile(SIZE_PATTERN, re.I)
+
+Amount = namedtuple('Amount', 'low high currency')
+
+def _number(text):
+    return float(text.replace(',', ''))
+
+def _multiplier(unit):
+    unit = ''.join((unit or '').lower().split())
+    if len(unit) > 3:
+        unit = unit.rstrip('s')
+    return UNIT_MULTIPLIERS.get(unit, 1.0)
+
+@lru_cache(maxsize=65536)
+def parse_money(text):
+    """Parse the first money amount or range in ``text``; returns an Amount or None.
+
+    The currency may come first ("$50M", "USD 50M") or as a trailing ISO
+    code ("50M USD"). A bare amount counts only with a unit ("1.2B",
+    "10-20M") and gets ``UNKNOWN_CURRENCY``. A unit given only on the upper
+    bound applies to both ("$10-20M"). Indian units are understood too
+    ("INR 500 crore", "₹2.5 lakh crore"). Values stay in their own currency;
+    nothing is converted.
+    """
+    text = text or ''
+    match = MONEY_RE.search(text)
+    for suffixed in SUFFIX_MONEY_RE.finditer(text, 0, match.start() if match else len(text)):
+        if suffixed.group('currency') or suffixed.group('low_unit') or suffixed.group('high_unit'):
+            match = suffixed
+            break
+    if match is None:
+        return None
+    low_unit = match.group('low_unit') or match.group('high_unit')
+    low = _number(match.group('low')) * _multiplier(low_unit)
+    high = low
+    if match.group('high'):
+        high = _number(match.group('high')) * _multiplier(match.group('high_unit') or low_unit)
+    currency = CURRENCY_SYMBOLS.get((match.group('currency') or '').upper(), UNKNOWN_CURRENCY)
+    return Amount(low, max(low, high), currency)
+
+@lru_cache(maxsize=16384)
+def parse_size(text):
+    """Parse a head count such as "50-100 employees" or "200+"; returns an Amount or None.
+
+    An open-ended "200+" has no upper bound (``high`` is None).
+    """
+    match = SIZE_RE.search(text or '')
+    if match is None:
+        return None
+    low = _number(match.group('low'))
+    if match.group('plus'):
+        return Amount(low, None, None)
+    high = _number(match.group('high')) if match.group('high') else low
+    return Amount(low, max(low, high), None)
+
+def midpoint(amount):
+    """Single representative value of an Amount (the lower bound for open ranges)."""
+    if amount is None:
+        return None
+    if amount.high is None:
+        return amount.low
+    return (amount.low + amount.high) / 2
+
+def format_money(value, currency='USD'):
+    """Short label such as "$1.2B" for an amount ("N/A" if missing)."""
+    if value is None or value != value:
+        return 'N/A'
+    symbol = CURRENCY_PREFIXES.get(currency or 'USD', f"{currency} ")
+    for threshold, suffix in ((1e12, 'T'), (1e9, 'B'), (1e6, 'M'), (1e3, 'K')):
+        if abs(value) >= threshold:
+            scaled = f"{value / threshold:.1f}".rstrip('0').rstrip('.')
+            return f"{symbol}{scaled}{suffix}"
+    return f"{symbol}{value:,.0f}"
+
+def format_amount(amount):
+    """Label for an Amount, showing both bounds of a range."""
+    if amount is None:
+        return 'N/A'
+    if amount.currency is None:
+        if amount.high is None:
+            return f"{amount.low:,.0f}+"
+        if amount.high == amount.low:
+            return f"{amount.low:,.0f}"
+        return f"{amount.low:,.0f}-{amount.high:,.0f}"
+    if amount.high == amount.low:
+        return format_money(amount.low, amount.currency)
+    return f"{format_money(amount.low, amount.currency)}-{format_money(amount.high, amount.currency)}"
+
+def _stored(text, amount):
+    if amount is None:
+        return {'text': text, 'low': None, 'high': None, 'currency': None}
+    return {'text': text, 'low': amount.low, 'high': amount.high, 'currency': amount.currency}
+
+def _amount(stored):
+    if stored.get('low') is None:
+        return None
+    return Amount(stored['low'], stored['high'], stored['currency'])
+
+def parsed_fields(profile):
+    """Parsed financial and size fields of a profile, cached on it under ``_parsed``.
+
+    Returns ``{field: Amount or None}`` for ``MONEY_FIELDS``, ``SIZE_FIELDS``
+    and ``funding_rounds`` (a list, one per round). Each cached entry keeps
+    the text it was parsed from, so a changed field is re-parsed and an
+    unchanged one never is.
+    """
+    cache = profile.get(PARSED_KEY)
+    if not isinstance(cache, dict):
+        cache = profile[PARSED_KEY] = {}
+    result = {}
+    for field in MONEY_FIELDS + SIZE_FIELDS:
+        text = profile.get(field)
+        text = None if text is None else str(text)
+        stored = cache.get(field)
+        if stored is None or stored.get('text') != text:
+            parse = parse_size if field in SIZE_FIELDS else parse_money
+            stored = cache[field] = _stored(text, parse(text) if text else None)
+        result[field] = _amount(stored)
+    amounts = [str(round_data.get('amount') or '') for round_data in profile.get('funding_rounds') or []]
+    stored = cache.get('funding_rounds')
+    if stored is None or [entry.get('text') for entry in stored] != amounts:
+        stored = cache['funding_rounds'] = [_stored(text, parse_money(text)) for text in amounts]
+    result['funding_rounds'] = [_amount(entry) for entry in stored]
+    return result
+
+def _amount_frame(series, parse):
+    """Parse each distinct value once and broadcast the results back by position."""
+    import numpy as np
+    import pandas as pd
+    codes, uniques = pd.factorize(series.astype(object).where(series.notna(), None))
+    table = np.full((len(uniques) + 1, 2), np.nan)
+    currencies = np.full(len(uniques) + 1, None, dtype=object)
+    for i, text in enumerate(uniques):
+        amount = parse(str(text))
+        if amount is not None:
+            table[i] = (amount.low, np.nan if amount.high is None else amount.high)
+            currencies[i] = amount.currency
+    rows = table[codes]
+    frame = pd.DataFrame({'low': rows[:, 0], 'high': rows[:, 1]}, index=series.index)
+    frame['value'] = frame['high'].add(frame['low']).div(2).fillna(frame['low'])
+    return frame, currencies[codes]
+
+def money_frame(series):
+    """Vectorized ``parse_money`` over a pandas Series.
+
+    Returns a DataFrame aligned to ``series.index`` with float ``low``,
+    ``high`` and ``value`` (midpoint) columns, a ``currency`` column and
+    ``usd``, the midpoint converted at ``USD_RATES``. Amounts in
+    ``UNKNOWN_CURRENCY`` have no rate, so their ``usd`` is NaN rather
+    than a guess.
+    Each distinct string is parsed once, which is what makes large batches
+    cheap: result sets repeat the same few hundred amounts over and over.
+    """
+    frame, currencies = _amount_frame(series, parse_money)
+    frame['currency'] = currencies
+    frame['usd'] = frame['value'] * frame['currency'].map(USD_RATES).astype(float)
+    return frame
+
+def size_frame(series):
+    """Vectorized ``parse_size`` over a pandas Series (``high`` is NaN for "200+")."""
+    frame, _ = _amount_frame(series, parse_size)
+    return frame
@@ -0,0 +1,313 @@
+"""
+LEADGen AI - Parsing
+Extract profile fields from fetched source pages and merge them per field.
+"""
+
+import html
+import multiprocessing
+import os
+import re
+import threading
+import time
+import zlib
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlsplit
+
+from leadgen_funding import format_round_date, parse_round_date
+from leadgen_metrics import get_metrics
+from leadgen_sources import SOURCES
+
+MONEY = r'\$\s?\d+(?:[.,]\d+)?\s?(?:[KMBT]\b|thousand|million|billion|trillion)?'
+
+EMAIL_RE = re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}')
+PHONE_RE = re.compile(r'\+?\d{1,3}[\s.-]?\(?\d{3}\)?[\s.-]\d{3}[\s.-]\d{4}')
+FOUNDED_RE = re.compile(r'[Ff]ounded(?:\s+(?:in|on|date))?[:\s]+(?:[A-Za-z]+\s+)?(?:\d{1,2},?\s+)?((?:19|20)\d{2})')
+TEAM_SIZE_RE = re.compile(r'(\d[\d,]*\s?-\s?\d[\d,]*|\d[\d,]*\+?)\s+employees', re.I)
+INDUSTRY_RE = re.compile(r'Industr(?:y|ies)[:\s]+([A-Z][\w&/ ,-]{2,60}?)(?:\s{2,}|\.|\||$|\s(?=[A-Z][a-z]+:))')
+LOCATION_RE = re.compile(r'(?:Headquarters(?: Regions?)?|Location|Based in)[:\s]+([A-Z][\w .,-]{2,60}?)(?:\s{2,}|\.|\||$|\s(?=[A-Z][a-z]+:))')
+TOTAL_FUNDING_RE = re.compile(r'Total Funding(?: Amount)?[:\s]+(' + MONEY + ')', re.I)
+VALUATION_RE = re.compile(r'valu(?:ation|ed at)(?: of)?[:\s]+(' + MONEY + ')', re.I)
+REVENUE_RE = re.compile(r'(?:Estimated )?Revenue(?: Range)?[:\s]+(' + MONEY + r'(?:\s?(?:to|-)\s?' + MONEY + ')?)', re.I)
+ROUND_RE = re.compile(
+    r'(Pre-Seed|Seed|Angel|Series [A-H]|Venture Round|Private Equity|Debt Financing|IPO)'
+    r'[^$]{0,60}?(' + MONEY + ')',
+    re.I
+)
+ROUND_DATE_WINDOW = 80
+SENTENCE_END_RE = re.compile(r'(?<=[a-z0-9])[.;]\s+(?=[A-Z])')
+
+HIDDEN_RE = re.compile(r'<!--.*?-->|<(script|style|noscript)\b[^>]*>.*?</\1\s*>', re.S | re.I)
+TAG_RE = re.compile(r'<[^>]*>')
+META_RE = re.compile(r'<meta\s[^>]*>', re.I)
+ANCHOR_RE = re.compile(r'<a\s[^>]*>', re.I)
+ATTR_RE = re.compile(r'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))')
+
+SOCIAL_HOSTS = {
+    'twitter.com': 'twitter',
+    'x.com': 'twitter',
+    'linkedin.com': 'linkedin',
+    'facebook.com': 'facebook',
+    'github.com': 'github',
+    'instagram.com': 'instagram',
+    'youtube.com': 'youtube',
+}
+
+GROWTH_KEYWORDS = {
+    'Hiring': ('hiring', 'job openings', 'headcount', 'is growing its team'),
+    'Funding': ('raises', 'raised', 'funding round', 'led by'),
+    'Expansion': ('expands', 'expansion', 'new office', 'enters'),
+    'Product Launch': ('launches', 'launched', 'unveils', 'releases'),
+    'Partnership': ('partners with', 'partnership', 'teams up'),
+    'Acquisition': ('acquires', 'acquired', 'acquisition'),
+}
+
+FIELD_PRIORITY = {
+    'founded_year': ('crunchbase', 'website', 'linkedin'),
+    'industry': ('crunchbase', 'linkedin'),
+    'locations': ('crunchbase', 'linkedin'),
+    'team_size': ('linkedin', 'crunchbase'),
+    'total_funding_raised': ('crunchbase', 'techcrunch'),
+    'valuation': ('crunchbase', 'techcrunch'),
+    'revenue_est': ('crunchbase',),
+    'funding_rounds': ('crunchbase', 'techcrunch'),
+    'summary': ('website', 'linkedin', 'crunchbase', 'techcrunch'),
+}
+
+DEFAULT_PARSE_WORKERS = min(4, os.cpu_count() or 1)
+
+PAYLOAD_COMPRESSION = 1
+
+CONTACT_FIELDS = ('emails', 'phones', 'social_links')
+
+TEXT_FIELDS = {
+    'founded_year': FOUNDED_RE,
+    'team_size': TEAM_SIZE_RE,
+    'industry': INDUSTRY_RE,
+    'locations': LOCATION_RE,
+    'total_funding_raised': TOTAL_FUNDING_RE,
+    'valuation': VALUATION_RE,
+    'revenue_est': REVENUE_RE,
+}
+
+def _page_fields(name, source):
+    fields = {'contact_info': CONTACT_FIELDS}
+    wanted = set(CONTACT_FIELDS)
+    for field in source.fields:
+        wanted.update(fields.get(field, (field,)))
+    wanted.update(field for field, names in FIELD_PRIORITY.items() if name in names)
+    return frozenset(wanted)
+
+PAGE_FIELDS = {name: _page_fields(name, source) for name, source in SOURCES.items()}
+
+def _first(pattern, text):
+    match = pattern.search(text)
+    return match.group(1).strip() if match else None
+
+def _round_date(text, match, previous_end, next_start):
+    """Date announced with a round in the same sentence: just after it, else just before it."""
+    after = text[match.end():min(next_start, match.end() + ROUND_DATE_WINDOW)]
+    value, precision = parse_round_date(SENTENCE_END_RE.split(after)[0])
+    if value is None:
+        start = max(previous_end, match.start() - ROUND_DATE_WINDOW)
+        value, precision = parse_round_date(SENTENCE_END_RE.split(text[start:match.start()])[-1])
+    return format_round_date(value, precision)
+
+def _funding_rounds(text):
+    rounds = []
+    seen = set()
+    matches = list(ROUND_RE.finditer(text))
+    for i, match in enumerate(matches):
+        round_type = match.group(1).title().replace('Ipo', 'IPO')
+        amount = match.group(2).replace(' ', '')
+        if (round_type, amount) in seen:
+            continue
+        seen.add((round_type, amount))
+        round_data = {'type': round_type, 'amount': amount}
+        previous_end = matches[i - 1].end() if i else 0
+        next_start = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        date = _round_date(text, match, previous_end, next_start)
+        if date:
+            round_data['date'] = date
+        rounds.append(round_data)
+    return rounds
+
+def _growth_signals(text):
+    lowered = text.lower()
+    return [
+        signal for signal, keywords in GROWTH_KEYWORDS.items()
+        if any(keyword in lowered for keyword in keywords)
+    ]
+
+def _attributes(tag):
+    return {
+        name.lower(): html.unescape(double or single or bare)
+        for name, double, single, bare in ATTR_RE.findall(tag)
+    }
+
+def _meta_description(markup):
+    metas = [_attributes(tag) for tag in META_RE.findall(markup)]
+    for key, value in (('name', 'description'), ('property', 'og:description')):
+        for attributes in metas:
+            if attributes.get(key) == value:
+                return attributes.get('content', '').strip()
+    return None
+
+def _social_links(markup):
+    links = {}
+    for tag in ANCHOR_RE.findall(markup):
+        href = _attributes(tag).get('href')
+        if not href:
+            continue
+        host = urlsplit(href).netloc.lower()
+        if host.startswith('www.'):
+            host = host[4:]
+        platform = SOCIAL_HOSTS.get(host)
+        if platform and platform not in links:
+            links[platform] = href
+    return links
+
+def page_text(markup):
+    """Visible text of a page, joined like BeautifulSoup's ``get_text(' ', strip=True)``."""
+    pieces = (html.unescape(piece).strip() for piece in TAG_RE.split(markup))
+    return ' '.join(piece for piece in pieces if piece)
+
+def parse_page(source, markup):
+    """Return the profile fields found on one source page.
+
+    Pages are scanned with precompiled patterns instead of a full DOM, and
+    only for the fields ``source`` feeds (``PAGE_FIELDS``); unknown sources
+    get every field.
+    """
+    wanted = PAGE_FIELDS.get(source)
+    markup = HIDDEN_RE.sub(' ', markup)
+    text = page_text(markup)
+    fields = {}
+    if wanted is None or 'summary' in wanted:
+        fields['summary'] = _meta_description(markup)
+    for field, pattern in TEXT_FIELDS.items():
+        if wanted is None or field in wanted:
+            fields[field] = _first(pattern, text)
+    if wanted is None or 'funding_rounds' in wanted:
+        fields['funding_rounds'] = _funding_rounds(text)
+    if source == 'techcrunch':
+        fields['growth_signals'] = _growth_signals(text)
+    fields['emails'] = sorted(set(EMAIL_RE.findall(text)))
+    fields['phones'] = sorted(set(PHONE_RE.findall(text)))
+    fields['social_links'] = _social_links(markup)
+    return {key: value for key, value in fields.items() if value}
+
+def parse_compressed(source, payload):
+    """Worker entry point: parse one zlib-compressed page; returns (fields, cpu_seconds)."""
+    started = time.thread_time()
+    fields = parse_page(source, zlib.decompress(payload).decode('utf-8'))
+    return fields, time.thread_time() - started
+
+class ParserPool:
+    """Parse fetched pages in worker processes, off the fetchers' GIL.
+
+    Pages travel to the workers zlib-compressed, and every batch worker and
+    UI session shares the same processes. ``max_workers=0`` (or
+    LEADGEN_PARSE_WORKERS=0) parses in the calling thread instead, which is
+    also the fallback when worker processes cannot be started or die.
+    Parsed pages and worker CPU time are counted per source, so pages/sec
+    per core is ``leadgen_parsed_pages_total / leadgen_parse_cpu_seconds_total``.
+    """
+
+    def __init__(self, max_workers=None):
+        if max_workers is None:
+            max_workers = int(os.environ.get('LEADGEN_PARSE_WORKERS', DEFAULT_PARSE_WORKERS))
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def _parse_inline(self, source, text):
+        started = time.thread_time()
+        fields = parse_page(source, text)
+        return fields, time.thread_time() - started
+
+    def parse_many(self, pages):
+        """Parse {source: html} concurrently; returns {source: fields}.
+
+        Pages whose worker job failed to submit, died with its process or
+        was cancelled (by this or another thread closing a broken pool)
+        are parsed inline, so a sick pool never loses a page.
+        """
+        metrics = get_metrics()
+        futures = {}
+        if self.max_workers > 0:
+            try:
+                executor = self.executor
+                for source, text in pages.items():
+                    payload = zlib.compress(text.encode('utf-8'), PAYLOAD_COMPRESSION)
+                    futures[source] = executor.submit(parse_compressed, source, payload)
+                    metrics.inc('leadgen_parse_payload_bytes_total', len(payload), source=source)
+            except (BrokenProcessPool, OSError, RuntimeError):
+                self.close()
+                futures = {}
+        parsed = {}
+        for source, text in pages.items():
+            future = futures.get(source)
+            try:
+                fields, cpu_seconds = future.result() if future else self._parse_inline(source, text)
+            except BrokenProcessPool:
+                self.close()
+                fields, cpu_seconds = self._parse_inline(source, text)
+            except CancelledError:
+                fields, cpu_seconds = self._parse_inline(source, text)
+            metrics.inc('leadgen_parsed_pages_total', source=source)
+            metrics.inc('leadgen_parse_cpu_seconds_total', cpu_seconds, source=source)
+            parsed[source] = fields
+        return parsed
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+_shared_pool = None
+_shared_lock = threading.Lock()
+
+def get_parser_pool():
+    """Return the process-wide parser pool."""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = ParserPool()
+        return _shared_pool
+
+def merge_fields(parsed):
+    """Merge {source: fields} into one field dict using FIELD_PRIORITY."""
+    merged = {}
+    for field, sources in FIELD_PRIORITY.items():
+        for source in sources:
+            value = parsed.get(source, {}).get(field)
+            if value:
+                merged[field] = value
+                break
+
+    growth_signals = []
+    emails = set()
+    phones = set()
+    social_links = {}
+    for source, fields in parsed.items():
+        growth_signals += [s for s in fields.get('growth_signals', []) if s not in growth_signals]
+        emails.update(fields.get('emails', []))
+        phones.update(fields.get('phones', []))
+        for platform, link in fields.get('social_links', {}).items():
+            social_links.setdefault(platform, link)
+
+    merged['growth_signals'] = growth_signals
+    merged['contact_info'] = {'emails': sorted(emails), 'phones': sorted(phones)}
+    merged['social_links'] = social_links
+    return merged
@@ -0,0 +1,273 @@
+"""
+LEADGen AI - Source Pipeline
+Search, fetch, parse and score stages behind ``extract_company_profile()``.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+
+from leadgen_discovery import get_discovery_index
+from leadgen_fetch import SourceFetcher
+from leadgen_incremental import SOURCES_KEY, diff_profiles, source_is_fresh, validator_headers
+from leadgen_metrics import get_metrics
+from leadgen_money import parsed_fields
+from leadgen_parsing import get_parser_pool, merge_fields
+from leadgen_progress import STAGES, ProgressReporter
+from leadgen_scoring import SCORE_KEY, score_dict, score_profile
+from leadgen_sources import SEARCH_SOURCE, SOURCES, guess_website, host_of, source_urls
+
+AGGREGATOR_HOSTS = (
+    'crunchbase.com', 'linkedin.com', 'techcrunch.com', 'wikipedia.org', 'twitter.com',
+    'x.com', 'facebook.com', 'youtube.com', 'instagram.com', 'bloomberg.com', 'glassdoor.com',
+)
+
+def _is_aggregator(url):
+    host = host_of(url)
+    return any(host == h or host.endswith('.' + h) for h in AGGREGATOR_HOSTS)
+
+def build_profile(company_name, fields, weights=None):
+    """Assemble merged source fields into the profile dict the UI renders."""
+    founded_year = fields.get('founded_year')
+    founded_year = int(founded_year) if founded_year else None
+    score = score_profile(dict(fields, founded_year=founded_year), weights)
+    why_invest = (
+        f"{company_name} shows {'; '.join(score.reasons)}." if score.reasons
+        else f"Limited public data found for {company_name}."
+    )
+    signals = fields.get('growth_signals') or []
+    profile = {
+        'company_name': company_name,
+        'founded_year': founded_year or 'N/A',
+        'company_age': datetime.now().year - founded_year if founded_year else 'N/A',
+        'industry': fields.get('industry', 'N/A'),
+        'summary': fields.get('summary', 'No summary available'),
+        'locations': fields.get('locations', 'N/A'),
+        'team_size': fields.get('team_size', 'N/A'),
+        'revenue_est': fields.get('revenue_est', 'N/A'),
+        'total_funding_raised': fields.get('total_funding_raised', 'N/A'),
+        'valuation': fields.get('valuation', 'N/A'),
+        'funding_rounds': fields.get('funding_rounds', []),
+        'growth_signals': ', '.join(signals) if signals else 'N/A',
+        'contact_info': fields.get('contact_info', {'emails': [], 'phones': []}),
+        'social_links': fields.get('social_links', {}),
+        'why_invest': f"{why_invest} Investment score: {score.total}/100",
+        SCORE_KEY: score_dict(score),
+    }
+    parsed_fields(profile)
+    return profile
+
+class SourcePipelineMixin:
+    """Run extraction as concurrent search/fetch/parse/score stages.
+
+    Every templated source is fetched at once, while website discovery runs
+    alongside them, so one company costs roughly its slowest source. The
+    pipeline is opt-in: unless ``use_source_pipeline`` is set, extraction
+    falls through to the next extractor in the MRO (``LeadGenAI``). ``source_templates`` overrides source URL
+    templates, e.g. to point every source at a local stub server. Pages are
+    parsed by ``parser_pool``, or the process-wide ``ParserPool`` when unset.
+    Source URLs come from ``discovery_index`` (default: the process-wide
+    ``DiscoveryIndex``) before templates and live search, and fetch results
+    keep that index verified.
+
+    Profiles keep per-source metadata (URL, validators, fetch time and parsed
+    fields) under ``_sources`` so a later run can pass them back as
+    ``previous`` and only refresh what expired or changed.
+    """
+
+    use_source_pipeline = False
+    source_templates = None
+    source_limiter = None
+    fetcher = None
+    parser_pool = None
+    discovery_index = None
+
+    def planned_stages(self):
+        if self.use_source_pipeline:
+            return STAGES
+        return super().planned_stages()
+
+    def get_fetcher(self):
+        """Return this extractor's fetcher, created on first use."""
+        if self.fetcher is None:
+            self.fetcher = SourceFetcher(source_limiter=self.source_limiter)
+        self.fetcher.max_retries = getattr(self, 'max_retries', self.fetcher.max_retries)
+        self.fetcher.source_limiter = self.source_limiter
+        return self.fetcher
+
+    def get_discovery_index(self):
+        return self.discovery_index or get_discovery_index()
+
+    def discover_website(self, company_name):
+        """Find the company's own website in the discovery index, else through search, else a guess."""
+        if self.source_templates and 'website' in self.source_templates:
+            return source_urls(company_name, self.source_templates).get('website')
+        index = self.get_discovery_index()
+        known = index.lookup(company_name, 'website')
+        if known is not None:
+            return known.url
+        fetcher = self.get_fetcher()
+        if fetcher.response_cache is not None and fetcher.response_cache.replay_only:
+            return guess_website(company_name)
+        try:
+            from googlesearch import search
+        except ImportError:
+            return guess_website(company_name)
+        wait = fetcher.rate_limiter.reserve('www.google.com')
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            if self.source_limiter is not None:
+                with self.source_limiter.slot(SEARCH_SOURCE):
+                    results = list(search(f"{company_name} official website", num_results=5))
+            else:
+                results = list(search(f"{company_name} official website", num_results=5))
+        except Exception:
+            return guess_website(company_name)
+        for url in results:
+            if url.startswith('http') and not _is_aggregator(url):
+                index.record(company_name, 'website', url, origin='search')
+                return url
+        return guess_website(company_name)
+
+    async def gather_pages(self, company_name, progress, previous=None, revalidate=False):
+        """Fetch sources for one company concurrently; returns (pages, reused).
+
+        ``pages`` maps source to FetchResult for everything requested now.
+        With a ``previous`` profile, sources still within their TTL are not
+        requested at all and come back in ``reused``; expired ones are
+        revalidated with their stored ETag/Last-Modified. ``revalidate``
+        treats every source as expired and asks each origin again, even
+        where the response cache holds a fresh copy.
+        """
+        fetcher = self.get_fetcher()
+        loop = asyncio.get_running_loop()
+        prior = (previous or {}).get(SOURCES_KEY, {})
+        templates = self.source_templates or {}
+        known = {
+            name: found.url for name, found in self.get_discovery_index().lookup_all(company_name).items()
+            if name not in templates
+        }
+        urls = {
+            name: known.get(name, url)
+            for name, url in source_urls(company_name, self.source_templates).items()
+            if name != 'website'
+        }
+        if 'website' in prior:
+            urls['website'] = prior['website']['url']
+        elif 'website' in known:
+            urls['website'] = known['website']
+            get_metrics().inc('leadgen_discovery_total', outcome='hit')
+        reused = {}
+        headers = {}
+        for name in list(urls):
+            meta = prior.get(name)
+            if not meta:
+                continue
+            if not revalidate and source_is_fresh(meta):
+                reused[name] = meta
+                del urls[name]
+            elif revalidate:
+                headers[name] = dict(validator_headers(meta), **{'Cache-Control': 'no-cache'})
+            else:
+                headers[name] = validator_headers(meta)
+        discover = 'website' not in urls and 'website' not in reused
+        progress.expect_sources('fetch', list(urls) + (['website'] if discover else []))
+
+        async def website():
+            with progress.stage('search'):
+                url = await loop.run_in_executor(fetcher.executor, self.discover_website, company_name)
+            return await fetcher.fetch_many({'website': url}, progress)
+
+        tasks = [fetcher.fetch_many(urls, progress, headers)]
+        if discover:
+            tasks.append(website())
+        pages = {}
+        for result in await asyncio.gather(*tasks):
+            pages.update(result)
+        return pages, reused
+
+    def extract_company_profile(self, company_name, *args, progress=None, previous=None,
+                                revalidate=False, pipeline=None, **kwargs):
+        """Extract a profile; with ``previous``, re-fetch only stale or changed sources.
+
+        ``revalidate`` re-requests every source of ``previous``, fresh or
+        not, with its stored validators. ``pipeline`` overrides
+        ``use_source_pipeline`` for this call only, so a shared extractor
+        can serve both kinds of request without being reconfigured.
+        """
+        if not (self.use_source_pipeline if pipeline is None else pipeline):
+            return super().extract_company_profile(company_name, *args, progress=progress, **kwargs)
+        progress = progress if progress is not None else ProgressReporter()
+        progress.plan(STAGES)
+        pages, reused = asyncio.run(self.gather_pages(company_name, progress, previous, revalidate))
+        self.get_discovery_index().observe(
+            company_name, {source: (result.url, result.status) for source, result in pages.items()}
+        )
+        sources = {source: dict(meta, status='fresh') for source, meta in reused.items()}
+        prior = (previous or {}).get(SOURCES_KEY, {})
+        now = time.time()
+        with progress.stage('parse'):
+            parsed = (self.parser_pool or get_parser_pool()).parse_many({
+                source: result.text for source, result in pages.items()
+                if source in SOURCES and result.status == 200 and result.text
+            })
+            for source, result in pages.items():
+                if source not in SOURCES:
+                    continue
+                if source in parsed:
+                    fields = parsed[source]
+                    status = 'updated'
+                elif source in prior and (result.status == 304 or result.error):
+                    fields = prior[source]['fields']
+                    status = 'not_modified' if result.status == 304 else 'stale'
+                else:
+                    continue
+                sources[source] = {
+                    'source': source,
+                    'url': result.url,
+                    'etag': result.headers.get('ETag') or prior.get(source, {}).get('etag'),
+                    'last_modified': (result.headers.get('Last-Modified')
+                                      or prior.get(source, {}).get('last_modified')),
+                    'fetched_at': now if status != 'stale' else prior[source]['fetched_at'],
+                    'status': status,
+                    'fields': fields,
+                }
+            fields = merge_fields({source: meta['fields'] for source, meta in sources.items()})
+        with progress.stage('score'):
+            profile = build_profile(company_name, fields, getattr(self, 'score_weights', None))
+        profile[SOURCES_KEY] = sources
+        progress.complete()
+        return profile
+
+    def refresh_company_profile(self, previous, progress=None, revalidate=False):
+        """Re-enrich a stored profile, touching only stale or changed sources.
+
+        With ``revalidate``, sources still within their TTL are revalidated
+        too, so an unchanged source costs a 304 and a changed one is picked
+        up now rather than when its TTL runs out. The refresh always runs
+        the pipeline, whatever ``use_source_pipeline`` says. Returns
+        ``(profile, changes)`` where ``changes`` is the field-level diff from
+        ``diff_profiles()``.
+        """
+        company_name = previous.get('company_name')
+        profile = self.extract_company_profile(
+            company_name, progress=progress, previous=previous, refresh=True,
+            revalidate=revalidate, pipeline=True
+        )
+        return profile, diff_profiles(previous, profile)
+
+class SourcePipeline(SourcePipelineMixin):
+    """Standalone extractor that uses only the in-tree source pipeline."""
+
+    use_source_pipeline = True
+
+    def __init__(self, max_retries=3, source_templates=None, fetcher=None):
+        self.max_retries = max_retries
+        self.source_templates = source_templates
+        self.fetcher = fetcher
+
+    def generate_lead_report(self, company_name, format_type="markdown"):
+        """Extract a profile and render it as a report."""
+        from leadgen_reports import render_report
+        return render_report(self.extract_company_profile(company_name), format_type)
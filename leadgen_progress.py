@@ -0,0 +1,158 @@
+"""
+LEADGen AI - Progress
+Pipeline progress events with per-stage timings.
+"""
+
+import inspect
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+from leadgen_metrics import get_metrics
+
+STAGES = ('search', 'fetch', 'parse', 'score')
+
+STAGE_WEIGHTS = {
+    'cache': 0.05,
+    'search': 0.2,
+    'fetch': 0.5,
+    'parse': 0.15,
+    'score': 0.1,
+    'extract': 1.0,
+}
+
+STAGE_LABELS = {
+    'cache': "🗄️ Checking profile cache...",
+    'search': "🔍 Searching for company information...",
+    'fetch': "🌐 Fetching source data...",
+    'parse': "📊 Extracting company data...",
+    'score': "📈 Analyzing investment potential...",
+    'extract': "📊 Extracting company data...",
+}
+
+ProgressEvent = namedtuple('ProgressEvent', 'stage status source elapsed fraction message')
+
+class ProgressReporter:
+    """Collect stage timings and forward ProgressEvents to a callback.
+
+    Layers of the extraction pipeline wrap their work in ``stage()``; the
+    reporter turns completed stages (and completed sources within a stage)
+    into an overall completion fraction.
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.started_at = time.monotonic()
+        self.timings = {}
+        self.source_timings = {}
+        self.events = []
+        self._planned = {}
+        self._sources = {}
+        self._progress = 0.0
+        self._lock = threading.Lock()
+
+    def plan(self, stages):
+        """Declare stages the current run will go through, in addition to earlier ones."""
+        with self._lock:
+            for stage in stages:
+                self._planned.setdefault(stage, STAGE_WEIGHTS.get(stage, 0.1))
+
+    def expect_sources(self, stage, sources):
+        """Declare how many sources a stage will report individually."""
+        with self._lock:
+            self._sources[stage] = max(1, len(sources))
+
+    @property
+    def fraction(self):
+        total = sum(self._planned.values())
+        if not total:
+            return 0.0
+        return min(1.0, self._progress / total)
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started_at
+
+    def _emit(self, stage, status, source, elapsed):
+        label = STAGE_LABELS.get(stage, stage)
+        message = f"{label} ({source})" if source else label
+        event = ProgressEvent(stage, status, source, elapsed, self.fraction, message)
+        self.events.append(event)
+        if self.callback is not None:
+            self.callback(event)
+
+    @contextmanager
+    def stage(self, stage, source=None):
+        """Time a stage (or one source within it) and report start/finish."""
+        started = time.monotonic()
+        self._emit(stage, 'started', source, 0.0)
+        status = 'done'
+        try:
+            yield
+        except Exception:
+            status = 'failed'
+            raise
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                if source is None:
+                    self.timings[stage] = self.timings.get(stage, 0.0) + elapsed
+                    if stage not in self._sources:
+                        self._progress += self._planned.get(stage, 0.0)
+                else:
+                    self.source_timings[(stage, source)] = elapsed
+                    self._progress += self._planned.get(stage, 0.0) / self._sources.get(stage, 1)
+            get_metrics().observe('leadgen_stage_seconds', elapsed, stage=stage, source=source or '')
+            self._emit(stage, status, source, elapsed)
+
+    def complete(self):
+        """Mark the run finished, skipping any planned stages that did not run."""
+        with self._lock:
+            self._progress = sum(self._planned.values())
+        self._emit('done', 'done', None, self.elapsed)
+
+    def summary(self):
+        """Return one row per stage and per source with elapsed seconds."""
+        rows = [
+            {'Stage': stage, 'Source': '', 'Seconds': round(seconds, 3)}
+            for stage, seconds in self.timings.items()
+        ]
+        rows += [
+            {'Stage': stage, 'Source': source, 'Seconds': round(seconds, 3)}
+            for (stage, source), seconds in self.source_timings.items()
+        ]
+        return rows
+
+def accepts_keyword(method, name):
+    """Return True if ``method`` takes ``name`` as a keyword argument."""
+    try:
+        parameters = inspect.signature(method).parameters
+    except (TypeError, ValueError):
+        return False
+    return name in parameters or any(
+        p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters.values()
+    )
+
+class ProgressMixin:
+    """Adapt ``LeadGenAI.extract_company_profile()`` to the ``progress`` keyword.
+
+    Extractors that accept ``progress`` receive the reporter and emit their own
+    search/fetch/parse/score stages; others are timed as one ``extract`` stage.
+    Outer layers call ``planned_stages()`` to declare the whole run up front.
+    """
+
+    def planned_stages(self):
+        base = super().extract_company_profile
+        if accepts_keyword(base, 'progress'):
+            return STAGES
+        return ('extract',)
+
+    def extract_company_profile(self, company_name, *args, progress=None, **kwargs):
+        progress = progress if progress is not None else ProgressReporter()
+        progress.plan(self.planned_stages())
+        base = super().extract_company_profile
+        if accepts_keyword(base, 'progress'):
+            return base(company_name, *args, progress=progress, **kwargs)
+        with progress.stage('extract'):
+            return base(company_name, *args, **kwargs)
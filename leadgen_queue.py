@@ -0,0 +1,255 @@
+"""
+LEADGen AI - Analysis Queue
+Process-wide background worker pool that Streamlit sessions submit work to and poll.
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque, namedtuple
+
+from leadgen_progress import ProgressReporter
+
+DEFAULT_WORKERS = int(os.environ.get('LEADGEN_QUEUE_WORKERS', 16))
+
+DEFAULT_KEEP_FINISHED = 256
+
+JobInfo = namedtuple(
+    'JobInfo',
+    'job_id owner label status fraction message result error position '
+    'submitted_at started_at finished_at timings'
+)
+
+class _Job:
+    __slots__ = ('job_id', 'owner', 'key', 'label', 'task', 'keep_result', 'status', 'reporter',
+                 'message', 'result', 'error', 'submitted_at', 'started_at', 'finished_at')
+
+    def __init__(self, job_id, owner, key, label, task, keep_result=True):
+        self.job_id = job_id
+        self.owner = owner
+        self.key = key
+        self.label = label
+        self.task = task
+        self.keep_result = keep_result
+        self.status = 'queued'
+        self.reporter = None
+        self.message = 'Queued'
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+class AnalysisQueue:
+    """Run analyses on a shared thread pool, outside any Streamlit script run.
+
+    ``submit(owner, key, task)`` returns a job id straight away; the UI polls
+    ``status(job_id)`` on later reruns. ``task(extractor, progress)`` runs on
+    a worker with that worker's own extractor from ``factory`` and a
+    ``ProgressReporter`` whose fraction and latest message show up in the
+    job status. Each owner (one per browser session) has its own FIFO and
+    workers take from owners round-robin, so one analyst's long batch never
+    starves another's single lookup. Submitting a ``key`` that is already
+    queued or running returns the existing job instead of duplicating it.
+    Jobs submitted with ``keep_result=False`` (e.g. batch items, whose
+    results travel another way) are forgotten as soon as they finish.
+    """
+
+    def __init__(self, factory, max_workers=DEFAULT_WORKERS, keep_finished=DEFAULT_KEEP_FINISHED):
+        self.factory = factory
+        self.max_workers = max(1, int(max_workers))
+        self.keep_finished = keep_finished
+        self._jobs = {}
+        self._active = {}
+        self._finished = OrderedDict()
+        self._owners = OrderedDict()
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._threads = []
+
+    def _start_workers(self):
+        while len(self._threads) < self.max_workers:
+            thread = threading.Thread(
+                target=self._worker, name=f"leadgen-queue-{len(self._threads)}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, owner, key, task, label=None, keep_result=True):
+        """Queue ``task`` for ``owner``; returns the job id (an existing one for a duplicate key)."""
+        with self._cond:
+            if key is not None and key in self._active:
+                return self._active[key]
+            job = _Job(uuid.uuid4().hex, owner, key, label or str(key), task, keep_result)
+            self._jobs[job.job_id] = job
+            if key is not None:
+                self._active[key] = job.job_id
+            self._owners.setdefault(owner, deque()).append(job)
+            self._start_workers()
+            self._cond.notify()
+            return job.job_id
+
+    def _next_job(self):
+        """Pop the next job, rotating through owners round-robin."""
+        while self._owners:
+            owner, jobs = next(iter(self._owners.items()))
+            job = jobs.popleft()
+            if jobs:
+                self._owners.move_to_end(owner)
+            else:
+                del self._owners[owner]
+            if job.status == 'queued':
+                return job
+        return None
+
+    def _extractor(self):
+        extractor = getattr(self._local, 'extractor', None)
+        if extractor is None:
+            extractor = self._local.extractor = self.factory()
+        return extractor
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None:
+                    self._cond.wait()
+                    job = self._next_job()
+                job.status = 'running'
+                job.started_at = time.time()
+                job.message = 'Starting'
+
+            def on_progress(event, job=job):
+                if event.status == 'started':
+                    job.message = event.message
+
+            job.reporter = ProgressReporter(on_progress)
+            try:
+                result = job.task(self._extractor(), job.reporter)
+            except Exception as e:
+                status, result, error = 'failed', None, str(e)
+            else:
+                status, error = 'done', None
+            with self._cond:
+                job.status = status
+                job.result = result
+                job.error = error
+                job.finished_at = time.time()
+                job.task = None
+                self._retire(job)
+
+    def _retire(self, job):
+        if self._active.get(job.key) == job.job_id:
+            del self._active[job.key]
+        if not job.keep_result:
+            self._jobs.pop(job.job_id, None)
+            return
+        self._finished[job.job_id] = None
+        while len(self._finished) > self.keep_finished:
+            old_id, _ = self._finished.popitem(last=False)
+            self._jobs.pop(old_id, None)
+
+    def _position(self, job):
+        """Number of queued jobs a worker will start before this one under round-robin."""
+        if job.status != 'queued':
+            return 0
+        mine = [queued for queued in self._owners[job.owner] if queued.status == 'queued']
+        depth = mine.index(job)
+        ahead = depth
+        before = True
+        for owner, jobs in self._owners.items():
+            if owner == job.owner:
+                before = False
+                continue
+            waiting = sum(1 for queued in jobs if queued.status == 'queued')
+            ahead += min(waiting, depth + 1 if before else depth)
+        return ahead
+
+    def status(self, job_id):
+        """Return a JobInfo snapshot, or None for an unknown or expired job."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            reporter = job.reporter
+            return JobInfo(
+                job.job_id, job.owner, job.label, job.status,
+                1.0 if job.status == 'done' else (reporter.fraction if reporter else 0.0),
+                job.error or job.message, job.result, job.error, self._position(job),
+                job.submitted_at, job.started_at, job.finished_at,
+                reporter.summary() if reporter and job.finished_at else [],
+            )
+
+    def cancel(self, job_id):
+        """Cancel a job that has not started yet; returns True if it was cancelled."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != 'queued':
+                return False
+            job.status = 'cancelled'
+            job.message = 'Cancelled'
+            job.finished_at = time.time()
+            job.task = None
+            self._retire(job)
+            return True
+
+    def stats(self):
+        """Return queued/running counts for the whole pool."""
+        with self._cond:
+            statuses = [job.status for job in self._jobs.values()]
+            return {
+                'queued': statuses.count('queued'),
+                'running': statuses.count('running'),
+                'finished': len(self._finished),
+                'owners': len(self._owners),
+                'workers': self.max_workers,
+            }
+
+class QueueExecutor:
+    """Executor-style front for an AnalysisQueue: each ``submit()`` is one job of ``owner``.
+
+    Lets a ``BatchRunner`` run its companies on the shared pool under the
+    analyst's own FIFO, so batch items take turns with everyone else's
+    lookups instead of running on a private pool. ``shutdown(cancel_futures=True)``
+    cancels the items that have not started. Only those ids are kept: an
+    item's id is dropped as soon as it starts, so a long batch holds no
+    more ids than it has items waiting.
+    """
+
+    def __init__(self, queue, owner, label=None):
+        self.queue = queue
+        self.owner = owner
+        self.label = label
+        self._queued = set()
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        """Queue ``fn(*args, **kwargs)``; returns the queue job id."""
+        def task(extractor, progress):
+            with self._lock:
+                self._queued.discard(job_id)
+            return fn(*args, **kwargs)
+        with self._lock:
+            job_id = self.queue.submit(self.owner, None, task, label=self.label, keep_result=False)
+            self._queued.add(job_id)
+        return job_id
+
+    def shutdown(self, wait=False, cancel_futures=False):
+        with self._lock:
+            queued, self._queued = self._queued, set()
+        if cancel_futures:
+            for job_id in queued:
+                self.queue.cancel(job_id)
+
+_shared_queue = None
+_shared_lock = threading.Lock()
+
+def get_analysis_queue():
+    """Return the process-wide analysis queue, building ``LeadGenService`` extractors."""
+    global _shared_queue
+    with _shared_lock:
+        if _shared_queue is None:
+            from leadgen_service import LeadGenService
+            _shared_queue = AnalysisQueue(LeadGenService)
+        return _shared_queue
@@ -0,0 +1,172 @@
+"""
+LEADGen AI - Rate Limiting
+Process-wide per-host token buckets with adaptive backoff on 429/503.
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from leadgen_metrics import get_metrics
+
+DEFAULT_RATE = 1.0
+DEFAULT_BURST = 2
+
+HOST_RATES = {
+    'www.google.com': (0.2, 1),
+    'www.linkedin.com': (0.5, 1),
+    'www.crunchbase.com': (1.0, 2),
+    'techcrunch.com': (2.0, 4),
+}
+
+THROTTLE_STATUSES = {429, 503}
+
+MIN_RATE_FACTOR = 0.05
+RECOVERY_FACTOR = 1.1
+
+def parse_retry_after(value, now=None):
+    """Return the Retry-After header as seconds, or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at - (time.time() if now is None else now))
+
+class TokenBucket:
+    """Token bucket for one host; ``factor`` scales the rate down after throttling."""
+
+    def __init__(self, rate, burst):
+        self.base_rate = rate
+        self.burst = burst
+        self.factor = 1.0
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.wait_time = 0.0
+
+    @property
+    def rate(self):
+        return self.base_rate * self.factor
+
+    def reserve(self, now):
+        """Take one token, going into debt if needed; return the wait in seconds."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        wait = max(0.0, -self.tokens / self.rate, self.blocked_until - now)
+        self.requests += 1
+        self.wait_time += wait
+        return wait
+
+class RateLimiter:
+    """Per-host token buckets shared by every session, batch worker and fetcher.
+
+    ``reserve(host)`` returns how long the caller must wait before sending.
+    ``observe()`` feeds responses back: 429/503 halve that host's rate and
+    honour Retry-After, while successful responses slowly restore it.
+    """
+
+    def __init__(self, host_rates=None, default_rate=DEFAULT_RATE, default_burst=DEFAULT_BURST):
+        self.host_rates = dict(HOST_RATES)
+        self.host_rates.update(host_rates or {})
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host):
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate, burst = self.host_rates.get(host, (self.default_rate, self.default_burst))
+            bucket = TokenBucket(rate, burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    def set_rate(self, host, rate, burst=None):
+        """Change the base rate (requests/second) for a host."""
+        with self._lock:
+            bucket = self._bucket(host)
+            bucket.base_rate = rate
+            if burst is not None:
+                bucket.burst = burst
+            self.host_rates[host] = (rate, bucket.burst)
+
+    def reserve(self, host):
+        """Reserve the next request slot for ``host`` and return the wait in seconds."""
+        with self._lock:
+            wait = self._bucket(host).reserve(time.monotonic())
+        if wait > 0:
+            get_metrics().inc('leadgen_rate_limit_wait_seconds_total', wait)
+        return wait
+
+    def observe(self, host, status, retry_after=None):
+        """Adapt a host's rate to a response status and optional Retry-After value."""
+        with self._lock:
+            bucket = self._bucket(host)
+            now = time.monotonic()
+            if status in THROTTLE_STATUSES:
+                bucket.throttled += 1
+                get_metrics().inc('leadgen_rate_limit_throttled_total')
+                bucket.factor = max(MIN_RATE_FACTOR, bucket.factor / 2)
+                delay = parse_retry_after(retry_after)
+                if delay is None:
+                    delay = 1.0 / bucket.rate
+                bucket.blocked_until = max(bucket.blocked_until, now + delay)
+                bucket.tokens = min(bucket.tokens, 0.0)
+            elif status is not None and status < 400:
+                bucket.factor = min(1.0, bucket.factor * RECOVERY_FACTOR)
+
+    def metrics(self):
+        """Return one row per host with effective rate, wait time and throttle counts."""
+        with self._lock:
+            now = time.monotonic()
+            return [
+                {
+                    'host': host,
+                    'rate_per_sec': round(bucket.rate, 3),
+                    'base_rate_per_sec': bucket.base_rate,
+                    'requests': bucket.requests,
+                    'throttled': bucket.throttled,
+                    'wait_seconds': round(bucket.wait_time, 2),
+                    'blocked_for': round(max(0.0, bucket.blocked_until - now), 1),
+                }
+                for host, bucket in sorted(self._buckets.items())
+            ]
+
+class RateLimitMixin:
+    """Throttle an extractor that sends its own requests, such as ``LeadGenAI``.
+
+    Its scrapers bypass ``SourceFetcher`` and so the shared limiter. Each
+    extraction therefore reserves one token on every host in
+    ``rate_limited_hosts`` first and waits for the slowest of them, which
+    keeps such extractors within the same per-host rates as the source
+    pipeline and shows their traffic in ``RateLimiter.metrics()``.
+    """
+
+    rate_limiter = None
+    rate_limited_hosts = tuple(HOST_RATES)
+
+    def extract_company_profile(self, company_name, *args, **kwargs):
+        limiter = self.rate_limiter or get_rate_limiter()
+        wait = max((limiter.reserve(host) for host in self.rate_limited_hosts), default=0.0)
+        if wait > 0:
+            time.sleep(wait)
+        return super().extract_company_profile(company_name, *args, **kwargs)
+
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+def get_rate_limiter():
+    """Return the process-wide rate limiter."""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter()
+        return _shared_limiter
@@ -0,0 +1,231 @@
+"""
+LEADGen AI - Reports
+Render lead reports from already-extracted profiles, with no network I/O.
+"""
+
+import csv
+import html
+import io
+import json
+from string import Template
+
+from leadgen_scoring import profile_score
+
+REPORT_FIELDS = (
+    ('company_name', 'Company'),
+    ('industry', 'Industry'),
+    ('founded_year', 'Founded Year'),
+    ('company_age', 'Company Age'),
+    ('locations', 'Locations'),
+    ('team_size', 'Team Size'),
+    ('revenue_est', 'Revenue Estimate'),
+    ('total_funding_raised', 'Total Funding'),
+    ('valuation', 'Valuation'),
+    ('growth_signals', 'Growth Signals'),
+    ('why_invest', 'Investment Analysis'),
+)
+
+CSV_COLUMNS = tuple(key for key, _ in REPORT_FIELDS) + (
+    'investment_score', 'funding_rounds', 'emails', 'phones', 'social_links', 'summary',
+)
+
+FORMATS = {
+    'json': ('json', 'application/json'),
+    'markdown': ('md', 'text/markdown'),
+    'text': ('txt', 'text/plain'),
+    'html': ('html', 'text/html'),
+    'csv': ('csv', 'text/csv'),
+}
+
+MARKDOWN_TEMPLATE = Template("""# $company_name — Lead Report
+
+| Field | Value |
+|---|---|
+$field_rows
+
+## Summary
+
+$summary
+
+## Funding Rounds
+
+$funding_rounds
+
+## Contact
+
+$contact
+""")
+
+MARKDOWN_ROW = Template("| $label | $value |")
+
+TEXT_TEMPLATE = Template("""LEAD REPORT: $company_name
+$rule
+$field_rows
+
+SUMMARY
+$summary
+
+FUNDING ROUNDS
+$funding_rounds
+
+CONTACT
+$contact
+""")
+
+TEXT_ROW = Template("$label: $value")
+
+HTML_DOCUMENT = Template("""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>$title</title>
+<style>
+body { font-family: sans-serif; color: #2c3e50; margin: 2rem; }
+h1 { color: #1e3c72; }
+table { border-collapse: collapse; margin-bottom: 1.5rem; }
+th, td { border: 1px solid #dfe6e9; padding: 0.4rem 0.8rem; text-align: left; }
+th { background: #f5f6fa; }
+</style>
+</head>
+<body>
+$body
+</body>
+</html>
+""")
+
+HTML_PROFILE = Template("""<section>
+<h1>$company_name</h1>
+<table>
+$field_rows
+</table>
+<h2>Summary</h2>
+<p>$summary</p>
+<h2>Funding Rounds</h2>
+<ul>$funding_rounds</ul>
+<h2>Contact</h2>
+<ul>$contact</ul>
+</section>""")
+
+HTML_ROW = Template("<tr><th>$label</th><td>$value</td></tr>")
+
+HTML_ITEM = Template("<li>$value</li>")
+
+def _value(profile, key):
+    value = profile.get(key)
+    if value in (None, ''):
+        return 'N/A'
+    if key == 'company_age':
+        return f"{value} years"
+    return str(value)
+
+def _funding_lines(profile):
+    lines = []
+    for i, round_data in enumerate(profile.get('funding_rounds') or []):
+        label = round_data.get('type', f'Round {i+1}')
+        amount = round_data.get('amount', 'N/A')
+        date = round_data.get('date')
+        lines.append(f"{label}: {amount}" + (f" ({date})" if date else ''))
+    return lines
+
+def _contact_lines(profile):
+    contact_info = profile.get('contact_info') or {}
+    lines = [f"Email: {email}" for email in contact_info.get('emails', [])]
+    lines += [f"Phone: {phone}" for phone in contact_info.get('phones', [])]
+    lines += [
+        f"{platform.title()}: {link}"
+        for platform, link in (profile.get('social_links') or {}).items()
+    ]
+    return lines
+
+def _markdown(profile):
+    rows = '\n'.join(
+        MARKDOWN_ROW.substitute(label=label, value=_value(profile, key).replace('|', '\\|'))
+        for key, label in REPORT_FIELDS
+    )
+    return MARKDOWN_TEMPLATE.substitute(
+        company_name=_value(profile, 'company_name'),
+        field_rows=rows,
+        summary=profile.get('summary') or 'No summary available',
+        funding_rounds='\n'.join(f"- {line}" for line in _funding_lines(profile)) or 'N/A',
+        contact='\n'.join(f"- {line}" for line in _contact_lines(profile)) or 'N/A',
+    )
+
+def _text(profile):
+    company_name = _value(profile, 'company_name')
+    rows = '\n'.join(
+        TEXT_ROW.substitute(label=label, value=_value(profile, key))
+        for key, label in REPORT_FIELDS
+    )
+    return TEXT_TEMPLATE.substitute(
+        company_name=company_name,
+        rule='=' * (13 + len(company_name)),
+        field_rows=rows,
+        summary=profile.get('summary') or 'No summary available',
+        funding_rounds='\n'.join(_funding_lines(profile)) or 'N/A',
+        contact='\n'.join(_contact_lines(profile)) or 'N/A',
+    )
+
+def _html_section(profile):
+    escape = html.escape
+    rows = '\n'.join(
+        HTML_ROW.substitute(label=escape(label), value=escape(_value(profile, key)))
+        for key, label in REPORT_FIELDS
+    )
+    return HTML_PROFILE.substitute(
+        company_name=escape(_value(profile, 'company_name')),
+        field_rows=rows,
+        summary=escape(profile.get('summary') or 'No summary available'),
+        funding_rounds=''.join(HTML_ITEM.substitute(value=escape(line)) for line in _funding_lines(profile)),
+        contact=''.join(HTML_ITEM.substitute(value=escape(line)) for line in _contact_lines(profile)),
+    )
+
+def csv_row(profile):
+    """Flatten a profile into one CSV row keyed by CSV_COLUMNS."""
+    contact_info = profile.get('contact_info') or {}
+    row = {key: ('' if profile.get(key) is None else profile.get(key)) for key, _ in REPORT_FIELDS}
+    row['investment_score'] = profile_score(profile)
+    row['funding_rounds'] = '; '.join(_funding_lines(profile))
+    row['emails'] = '; '.join(contact_info.get('emails', []))
+    row['phones'] = '; '.join(contact_info.get('phones', []))
+    row['social_links'] = '; '.join(
+        f"{platform}: {link}" for platform, link in (profile.get('social_links') or {}).items()
+    )
+    row['summary'] = profile.get('summary') or ''
+    return row
+
+def render_reports(profiles, fmt='markdown'):
+    """Render one document covering every profile in ``profiles``."""
+    fmt = fmt.lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported report format: {fmt}")
+    if fmt == 'json':
+        return json.dumps([dict(profile) for profile in profiles], indent=2, default=str)
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(csv_row(profile) for profile in profiles)
+        return buffer.getvalue()
+    if fmt == 'html':
+        return HTML_DOCUMENT.substitute(
+            title='LEADGen AI Lead Report',
+            body='\n'.join(_html_section(profile) for profile in profiles),
+        )
+    render = _markdown if fmt == 'markdown' else _text
+    return '\n\n'.join(render(profile) for profile in profiles)
+
+def render_report(profile, fmt='markdown'):
+    """Render a single profile as json, markdown, text, html or csv."""
+    if fmt.lower() == 'json':
+        return json.dumps(dict(profile), indent=2, default=str)
+    if fmt.lower() == 'html':
+        return HTML_DOCUMENT.substitute(
+            title=html.escape(f"{_value(profile, 'company_name')} Lead Report"),
+            body=_html_section(profile),
+        )
+    return render_reports([profile], fmt)
+
+def report_file_info(company_name, fmt):
+    """Return (file_name, mime) for a report download."""
+    extension, mime = FORMATS[fmt.lower()]
+    return f"{company_name}_analysis.{extension}", mime
@@ -0,0 +1,147 @@
+"""
+LEADGen AI - Name Resolution
+Resolve company-name and domain variants to one canonical company with a trigram index.
+"""
+
+import threading
+from collections import Counter, namedtuple
+from urllib.parse import urlsplit
+
+from leadgen_cache import get_profile_cache, normalize_company_name
+
+DEFAULT_THRESHOLD = 0.9
+
+MIN_FUZZY_LENGTH = 12
+
+MAX_NAMES = 100_000
+
+SECOND_LEVEL_LABELS = ('co', 'com', 'org', 'net', 'ac', 'gov')
+
+Resolution = namedtuple('Resolution', 'query key name score')
+
+def domain_label(text):
+    """Company label of a domain or URL ("https://www.openai.com/about" -> "openai"), else None."""
+    text = text.strip().lower()
+    if ' ' in text or '.' not in text:
+        return None
+    host = urlsplit(text if '//' in text else f'//{text}').hostname or ''
+    labels = [label for label in host.split('.') if label]
+    if labels and labels[0] == 'www':
+        labels = labels[1:]
+    if len(labels) < 2 or len(labels[-1]) < 2 or not labels[-1].isalpha():
+        return None
+    if len(labels) >= 3 and labels[-2] in SECOND_LEVEL_LABELS:
+        return labels[-3]
+    return labels[-2]
+
+def resolution_key(text):
+    """Spacing-, case-, punctuation- and suffix-insensitive key ("Open AI, Inc." -> "openai")."""
+    label = domain_label(text)
+    return normalize_company_name(label or text).replace(' ', '')
+
+def trigrams(key):
+    """Set of character trigrams of a key, padded so short keys still have some."""
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class CompanyIndex:
+    """Known companies indexed by resolution key and by trigram.
+
+    ``resolve(text)`` maps "OpenAI", "Open AI Inc." and "openai.com" to
+    the same canonical company. Exact key matches are a dict lookup;
+    otherwise candidates come from the trigram posting lists, so only
+    companies sharing n-grams with the query are scored (Dice similarity)
+    instead of comparing every pair. Unmatched inputs become new entries,
+    which is what collapses duplicates within one batch.
+
+    Fuzzy matching is deliberately strict: keys shorter than
+    ``MIN_FUZZY_LENGTH`` must match exactly, and the default threshold
+    keeps distinct companies one letter apart ("Stripe"/"Stripes",
+    "Acme Lab"/"Acme Labs") separate, at the cost of missing some typos.
+    At most ``max_names`` companies are held; past that, unmatched inputs
+    resolve to themselves without being added.
+    """
+
+    def __init__(self, names=(), threshold=DEFAULT_THRESHOLD, max_names=MAX_NAMES):
+        self.threshold = threshold
+        self.max_names = max_names
+        self.names = []
+        self._sizes = []
+        self._ids = {}
+        self._postings = {}
+        self._lock = threading.Lock()
+        for name in names:
+            self.add(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _add(self, key, name):
+        company_id = self._ids.get(key)
+        if company_id is not None:
+            return company_id
+        company_id = self._ids[key] = len(self.names)
+        grams = trigrams(key)
+        self.names.append(name)
+        self._sizes.append(len(grams))
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(company_id)
+        return company_id
+
+    def add(self, name):
+        """Register a canonical company name; returns its id."""
+        key = resolution_key(name)
+        if not key:
+            return None
+        with self._lock:
+            return self._add(key, name)
+
+    def _match(self, key):
+        company_id = self._ids.get(key)
+        if company_id is not None:
+            return company_id, 1.0
+        if len(key) < MIN_FUZZY_LENGTH:
+            return None, 0.0
+        grams = trigrams(key)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        best, best_score = None, 0.0
+        for company_id, count in shared.items():
+            score = 2.0 * count / (len(grams) + self._sizes[company_id])
+            if score > best_score:
+                best, best_score = company_id, score
+        if best_score >= self.threshold:
+            return best, best_score
+        return None, best_score
+
+    def lookup(self, text):
+        """Return the Resolution of ``text`` against known companies, or None."""
+        key = resolution_key(text)
+        with self._lock:
+            company_id, score = self._match(key)
+            if company_id is None:
+                return None
+            return Resolution(text, key, self.names[company_id], score)
+
+    def resolve(self, text):
+        """Resolve ``text`` to a known company, registering it as a new one if nothing matches."""
+        key = resolution_key(text)
+        if not key:
+            return Resolution(text, key, text.strip(), 1.0)
+        with self._lock:
+            company_id, score = self._match(key)
+            if company_id is None:
+                if len(self.names) >= self.max_names:
+                    return Resolution(text, key, text.strip(), 1.0)
+                company_id, score = self._add(key, text.strip()), 1.0
+            return Resolution(text, key, self.names[company_id], score)
+
+def batch_company_index():
+    """Return a new company index for one batch, seeded with the profile cache's companies.
+
+    Each batch gets its own index, so names registered by one batch
+    neither accumulate for the life of the process nor merge with
+    another batch's.
+    """
+    return CompanyIndex(get_profile_cache().company_names())
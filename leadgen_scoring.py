@@ -0,0 +1,181 @@
+"""
+LEADGen AI - Investment Scoring
+Structured 0-100 investment score with per-factor sub-scores, for one profile or a whole DataFrame.
+"""
+
+import re
+from collections import namedtuple
+from datetime import datetime
+
+BASE_SCORE = 40
+
+DEFAULT_WEIGHTS = {
+    'funding_rounds': 5,
+    'growth_signals': 5,
+    'growth_window': 10,
+    'early_stage': -5,
+    'valuation': 5,
+    'team_size': 5,
+}
+
+FACTOR_CAPS = {
+    'funding_rounds': 20,
+    'growth_signals': 20,
+}
+
+FEATURE_COLUMNS = (
+    'funding_round_count', 'growth_signal_count', 'company_age', 'has_valuation', 'has_team_size',
+    'stated_score',
+)
+
+SCORE_KEY = 'investment_score'
+
+_EMBEDDED_SCORE = re.compile(r'Investment score:\s*(\d+)\s*/\s*100')
+
+InvestmentScore = namedtuple('InvestmentScore', 'total sub_scores weights reasons')
+
+def _present(value):
+    return value not in (None, '', 'N/A', [], {})
+
+def _signals(value):
+    if isinstance(value, str):
+        return [s.strip() for s in value.split(',') if s.strip() and s.strip() != 'N/A']
+    return list(value or [])
+
+def embedded_score(profile):
+    """The "Investment score: X/100" written into ``why_invest``, or None."""
+    match = _EMBEDDED_SCORE.search(str(profile.get('why_invest') or ''))
+    return int(match.group(1)) if match else None
+
+def stated_score(profile):
+    """The score the extractor itself gave a profile (``LeadGenAI``'s own), or None.
+
+    Read from the structured score's ``stated`` entry; profiles cached
+    before the structured score existed still have it only in ``why_invest``.
+    """
+    stored = profile.get(SCORE_KEY)
+    if isinstance(stored, dict):
+        return stored.get('stated')
+    return embedded_score(profile)
+
+def profile_features(profile, now_year=None):
+    """Numeric scoring features of one profile (or merged source fields)."""
+    now_year = now_year or datetime.now().year
+    founded_year = profile.get('founded_year')
+    try:
+        age = now_year - int(founded_year)
+    except (TypeError, ValueError):
+        age = None
+    return {
+        'funding_round_count': len(profile.get('funding_rounds') or []),
+        'growth_signal_count': len(_signals(profile.get('growth_signals'))),
+        'company_age': age,
+        'has_valuation': _present(profile.get('valuation')),
+        'has_team_size': _present(profile.get('team_size')),
+        'stated_score': stated_score(profile),
+    }
+
+def score_profile(profile, weights=None, now_year=None):
+    """Score one profile; returns an InvestmentScore."""
+    weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+    features = profile_features(profile, now_year)
+    rounds = features['funding_round_count']
+    signals = _signals(profile.get('growth_signals'))
+    age = features['company_age']
+    sub_scores = {
+        'funding_rounds': min(FACTOR_CAPS['funding_rounds'], weights['funding_rounds'] * rounds),
+        'growth_signals': min(FACTOR_CAPS['growth_signals'], weights['growth_signals'] * len(signals)),
+        'growth_window': weights['growth_window'] if age is not None and 2 <= age <= 10 else 0,
+        'early_stage': weights['early_stage'] if age is not None and age < 2 else 0,
+        'valuation': weights['valuation'] if features['has_valuation'] else 0,
+        'team_size': weights['team_size'] if features['has_team_size'] else 0,
+    }
+    reasons = []
+    if rounds:
+        reasons.append(f"{rounds} disclosed funding round(s)")
+    if signals:
+        reasons.append(f"growth signals: {', '.join(signals)}")
+    if sub_scores['growth_window']:
+        reasons.append("in the typical venture growth window")
+    elif sub_scores['early_stage']:
+        reasons.append("very early stage")
+    if features['has_valuation']:
+        reasons.append(f"valued at {profile['valuation']}")
+    total = max(0, min(100, BASE_SCORE + sum(sub_scores.values())))
+    return InvestmentScore(total, sub_scores, weights, reasons)
+
+def score_dict(score):
+    """JSON-serializable form of an InvestmentScore, as stored on profiles."""
+    return {'total': score.total, 'sub_scores': score.sub_scores, 'weights': score.weights}
+
+def profile_score(profile):
+    """Return a profile's 0-100 score.
+
+    Reads the structured ``investment_score``; profiles cached before it
+    existed fall back to the score stated in ``why_invest`` and then to
+    scoring the profile's fields.
+    """
+    stored = profile.get(SCORE_KEY)
+    if isinstance(stored, dict) and 'total' in stored:
+        return stored['total']
+    stated = embedded_score(profile)
+    if stated is not None:
+        return stated
+    return score_profile(profile).total
+
+def feature_frame(profiles, now_year=None):
+    """Build a DataFrame of scoring features, one row per profile."""
+    import pandas as pd
+    return pd.DataFrame(
+        [profile_features(profile, now_year) for profile in profiles], columns=FEATURE_COLUMNS
+    )
+
+def score_frame(features, weights=None):
+    """Score every row of a feature DataFrame in one vectorized pass.
+
+    ``features`` needs the ``FEATURE_COLUMNS`` produced by ``feature_frame()``.
+    Returns a DataFrame with one sub-score column per factor plus
+    ``investment_score``, aligned to ``features.index``, so re-weighting a
+    whole result set never touches the profiles themselves. Rows with a
+    ``stated_score`` keep it as their total, as ``profile_score()`` does.
+    """
+    import numpy as np
+    import pandas as pd
+    weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+    age = pd.to_numeric(features['company_age'], errors='coerce')
+    rounds = features['funding_round_count'].fillna(0).to_numpy(dtype=float)
+    signals = features['growth_signal_count'].fillna(0).to_numpy(dtype=float)
+    scores = pd.DataFrame(index=features.index)
+    scores['funding_rounds'] = np.minimum(FACTOR_CAPS['funding_rounds'], weights['funding_rounds'] * rounds)
+    scores['growth_signals'] = np.minimum(FACTOR_CAPS['growth_signals'], weights['growth_signals'] * signals)
+    scores['growth_window'] = np.where(age.between(2, 10), weights['growth_window'], 0)
+    scores['early_stage'] = np.where(age < 2, weights['early_stage'], 0)
+    scores['valuation'] = np.where(features['has_valuation'].fillna(False).astype(bool), weights['valuation'], 0)
+    scores['team_size'] = np.where(features['has_team_size'].fillna(False).astype(bool), weights['team_size'], 0)
+    total = pd.Series(np.clip(BASE_SCORE + scores.sum(axis=1), 0, 100), index=features.index)
+    if 'stated_score' in features:
+        total = pd.to_numeric(features['stated_score'], errors='coerce').fillna(total)
+    scores['investment_score'] = total.astype(int)
+    return scores
+
+class ScoringMixin:
+    """Attach a structured ``investment_score`` to every extracted profile.
+
+    Mix in behind ``ProfileCacheMixin`` so the cache stores the scored
+    profile and a cache hit is never scored again. A score ``LeadGenAI``
+    states in ``why_invest`` is read once, here: it becomes the total and
+    is kept as ``stated``, with the factor-based figure as
+    ``heuristic_total``.
+    """
+
+    score_weights = None
+
+    def extract_company_profile(self, company_name, *args, **kwargs):
+        profile = super().extract_company_profile(company_name, *args, **kwargs)
+        if isinstance(profile, dict) and SCORE_KEY not in profile:
+            score = score_dict(score_profile(profile, self.score_weights))
+            stated = embedded_score(profile)
+            if stated is not None:
+                score = dict(score, total=stated, stated=stated, heuristic_total=score['total'])
+            profile[SCORE_KEY] = score
+        return profile
@@ -0,0 +1,25 @@
+"""
+LEADGen AI - Service
+LeadGenAI composed with the shared caching layers used by the UI and batch workers.
+"""
+
+from leadGENAI import LeadGenAI
+from leadgen_cache import ProfileCacheMixin, get_profile_cache
+from leadgen_pipeline import SourcePipelineMixin
+from leadgen_progress import ProgressMixin
+from leadgen_ratelimit import RateLimitMixin
+from leadgen_scoring import ScoringMixin
+
+class LeadGenService(ProfileCacheMixin, ScoringMixin, SourcePipelineMixin, RateLimitMixin, ProgressMixin,
+                     LeadGenAI):
+    """LeadGenAI backed by the process-wide profile cache and, opt-in, the concurrent source pipeline.
+
+    Extraction goes to ``LeadGenAI.extract_company_profile()`` unless
+    ``use_source_pipeline`` is switched on, throttled by the shared
+    per-host rate limiter either way. Every profile carries a
+    structured ``investment_score`` (see ``leadgen_scoring``).
+    """
+
+    def __init__(self, *args, profile_cache=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.profile_cache = profile_cache if profile_cache is not None else get_profile_cache()
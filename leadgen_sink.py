@@ -0,0 +1,238 @@
+"""
+LEADGen AI - Result Sink
+Append-only JSONL/CSV/Parquet files for batch results, with lazy paging.
+"""
+
+import csv
+import itertools
+import json
+import os
+import re
+import threading
+import time
+
+from leadgen_cache import default_cache_dir
+from leadgen_reports import CSV_COLUMNS, csv_row
+
+SINK_FORMATS = {
+    'csv': ('csv', 'text/csv'),
+    'jsonl': ('jsonl', 'application/x-ndjson'),
+    'parquet': ('parquet', 'application/vnd.apache.parquet'),
+}
+
+PARQUET_ROW_GROUP = 500
+
+PART_RE = re.compile(r'part-(\d+)\.parquet')
+
+def parquet_available():
+    """Return True if pyarrow is installed."""
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def available_formats():
+    """Sink formats usable in this environment."""
+    return [fmt for fmt in SINK_FORMATS if fmt != 'parquet' or parquet_available()]
+
+def flatten_profile(profile):
+    """Flatten a profile into one row with the report CSV columns as strings."""
+    row = csv_row(profile)
+    return {column: '' if row.get(column) is None else str(row.get(column)) for column in CSV_COLUMNS}
+
+def batch_results_path(fmt, job_name=None):
+    """Path for a new batch result file under the cache directory."""
+    directory = os.path.join(default_cache_dir(), 'batches')
+    os.makedirs(directory, exist_ok=True)
+    job_name = job_name or time.strftime('batch-%Y%m%d-%H%M%S')
+    return os.path.join(directory, f"{job_name}.{SINK_FORMATS[fmt][0]}")
+
+class ResultSink:
+    """Append flattened profiles to a result file as batch workers finish.
+
+    CSV and JSONL rows are flushed as they arrive. Parquet ``path`` is a
+    directory: rows are buffered into groups of ``PARQUET_ROW_GROUP`` and
+    each group is written as a complete part file (to a temporary name,
+    then renamed), so a crash never leaves a part without its footer.
+    Without ``append`` existing rows or parts are replaced.
+
+    ``write(profile, key)`` returns the keys of the rows that reached disk
+    with that call; for Parquet these arrive a group at a time, and
+    ``close()`` returns the tail. Use as a context manager or call
+    ``close()`` to flush the tail.
+    """
+
+    def __init__(self, path, fmt='csv', append=False):
+        fmt = fmt.lower()
+        if fmt not in SINK_FORMATS:
+            raise ValueError(f"Unsupported sink format: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self.rows_written = 0
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._keys = []
+        self._file = None
+        self._closed = False
+        if fmt == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            os.makedirs(path, exist_ok=True)
+            names = [name for name in os.listdir(path) if PART_RE.fullmatch(name)]
+            if not append:
+                for name in names:
+                    os.remove(os.path.join(path, name))
+                names = []
+            self._pa = pa
+            self._pq = pq
+            self._schema = pa.schema([(column, pa.string()) for column in CSV_COLUMNS])
+            self._next_part = max((int(PART_RE.fullmatch(name).group(1)) + 1 for name in names), default=0)
+        else:
+            exists = append and os.path.exists(path) and os.path.getsize(path) > 0
+            self._file = open(path, 'a' if append else 'w', newline='', encoding='utf-8')
+            if fmt == 'csv':
+                self._csv = csv.DictWriter(self._file, fieldnames=CSV_COLUMNS)
+                if not exists:
+                    self._csv.writeheader()
+
+    def write(self, profile, key=None):
+        """Append one profile; returns the keys of the rows now safely on disk."""
+        row = flatten_profile(profile)
+        with self._lock:
+            self.rows_written += 1
+            if self.fmt == 'csv':
+                self._csv.writerow(row)
+                self._file.flush()
+                return [key]
+            if self.fmt == 'jsonl':
+                self._file.write(json.dumps(row) + '\n')
+                self._file.flush()
+                return [key]
+            self._buffer.append(row)
+            self._keys.append(key)
+            if len(self._buffer) >= PARQUET_ROW_GROUP:
+                return self._flush_parquet()
+            return []
+
+    def _flush_parquet(self):
+        """Write the buffered rows as one complete part file; returns their keys."""
+        if not self._buffer:
+            return []
+        part = os.path.join(self.path, f"part-{self._next_part:04d}.parquet")
+        table = self._pa.Table.from_pylist(self._buffer, schema=self._schema)
+        self._pq.write_table(table, part + '.tmp')
+        os.replace(part + '.tmp', part)
+        self._next_part += 1
+        keys, self._buffer, self._keys = self._keys, [], []
+        return keys
+
+    def close(self):
+        """Flush buffered rows and close the file; returns the keys flushed by the call."""
+        with self._lock:
+            if self._closed:
+                return []
+            self._closed = True
+            keys = []
+            if self.fmt == 'parquet':
+                keys = self._flush_parquet()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            return keys
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _format_of(path):
+    extension = os.path.splitext(path.rstrip(os.sep))[1].lstrip('.').lower()
+    for fmt, (ext, _) in SINK_FORMATS.items():
+        if ext == extension:
+            return fmt
+    raise ValueError(f"Unknown result file type: {path}")
+
+def _complete(part):
+    """True if a Parquet file ends with its footer magic (i.e. it was closed)."""
+    try:
+        with open(part, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() < 12:
+                return False
+            f.seek(-4, os.SEEK_END)
+            return f.read(4) == b'PAR1'
+    except OSError:
+        return False
+
+def _parts(path):
+    """Part files behind a result path (a Parquet directory holds several).
+
+    Parquet parts still being written or left without a footer by a crash
+    are skipped.
+    """
+    if os.path.isdir(path):
+        return sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.endswith('.parquet') and _complete(os.path.join(path, name))
+        )
+    return [path] if os.path.exists(path) else []
+
+def count_rows(path):
+    """Count result rows without loading the file.
+
+    CSV rows are counted as records, since a quoted field (a summary, say)
+    may span several lines.
+    """
+    fmt = _format_of(path)
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        return sum(pq.ParquetFile(part).metadata.num_rows for part in _parts(path))
+    if not os.path.exists(path):
+        return 0
+    with open(path, newline='', encoding='utf-8') as f:
+        if fmt == 'csv':
+            return max(0, sum(1 for _ in csv.reader(f)) - 1)
+        return sum(1 for _ in f)
+
+def _read_parquet_page(path, start, page_size):
+    import pyarrow.parquet as pq
+    rows = []
+    offset = 0
+    for part in _parts(path):
+        parquet_file = pq.ParquetFile(part)
+        for group in range(parquet_file.num_row_groups):
+            group_rows = parquet_file.metadata.row_group(group).num_rows
+            if offset + group_rows > start and offset < start + page_size:
+                table = parquet_file.read_row_group(group)
+                lo = max(0, start - offset)
+                hi = min(group_rows, start + page_size - offset)
+                rows += table.slice(lo, hi - lo).to_pylist()
+            offset += group_rows
+            if offset >= start + page_size:
+                return rows
+    return rows
+
+def read_page(path, page=0, page_size=100):
+    """Read one page of rows (list of dicts) from a result file."""
+    fmt = _format_of(path)
+    start = page * page_size
+    if fmt == 'parquet':
+        return _read_parquet_page(path, start, page_size)
+    with open(path, newline='', encoding='utf-8') as f:
+        if fmt == 'csv':
+            return list(itertools.islice(csv.DictReader(f), start, start + page_size))
+        return [json.loads(line) for line in itertools.islice(f, start, start + page_size)]
+
+def result_bytes(path):
+    """Return a result file's bytes for download, combining Parquet parts if needed."""
+    if not os.path.isdir(path):
+        with open(path, 'rb') as f:
+            return f.read()
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    buffer = pa.BufferOutputStream()
+    tables = [pq.read_table(part) for part in _parts(path)]
+    pq.write_table(pa.concat_tables(tables, promote_options='default'), buffer)
+    return buffer.getvalue().to_pybytes()
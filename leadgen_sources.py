@@ -0,0 +1,72 @@
+"""
+LEADGen AI - Sources
+Registry of data sources: where each one lives and which profile fields it feeds.
+"""
+
+import re
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+from leadgen_cache import normalize_company_name
+
+HOUR = 60 * 60
+
+Source = namedtuple('Source', 'name url_template fields ttl')
+
+SOURCES = {
+    'crunchbase': Source(
+        'crunchbase',
+        'https://www.crunchbase.com/organization/{slug}',
+        ('founded_year', 'industry', 'total_funding_raised', 'funding_rounds',
+         'valuation', 'revenue_est', 'locations', 'team_size'),
+        24 * HOUR,
+    ),
+    'linkedin': Source(
+        'linkedin',
+        'https://www.linkedin.com/company/{slug}/',
+        ('team_size', 'industry', 'locations', 'summary'),
+        72 * HOUR,
+    ),
+    'techcrunch': Source(
+        'techcrunch',
+        'https://techcrunch.com/tag/{slug}/',
+        ('growth_signals', 'funding_rounds', 'valuation'),
+        12 * HOUR,
+    ),
+    'website': Source(
+        'website',
+        None,
+        ('summary', 'contact_info', 'social_links', 'founded_year'),
+        7 * 24 * HOUR,
+    ),
+}
+
+SEARCH_SOURCE = 'google'
+
+_SLUG_STRIP = re.compile(r'[^a-z0-9]+')
+
+def sources_for_field(field):
+    """Return the names of sources that feed a profile field."""
+    return [name for name, source in SOURCES.items() if field in source.fields]
+
+def company_slug(company_name):
+    """Return the URL slug most sources use for a company ("Open AI, Inc." -> "open-ai")."""
+    return _SLUG_STRIP.sub('-', normalize_company_name(company_name)).strip('-')
+
+def guess_website(company_name):
+    """Best-effort company website when search is unavailable."""
+    return f"https://www.{company_slug(company_name).replace('-', '')}.com"
+
+def source_urls(company_name, templates=None):
+    """Return {source: url} for every source with a URL template."""
+    slug = company_slug(company_name)
+    urls = {}
+    for name, source in SOURCES.items():
+        template = (templates or {}).get(name, source.url_template)
+        if template:
+            urls[name] = template.format(slug=slug)
+    return urls
+
+def host_of(url):
+    """Return the lowercase host of a URL."""
+    return urlsplit(url).netloc.lower()
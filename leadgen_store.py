@@ -0,0 +1,376 @@
+"""
+LEADGen AI - Profile Store
+Shared, memory-bounded profile store: interned columnar scalars, compressed and spillable bulk.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import weakref
+import zlib
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+
+from leadgen_cache import default_cache_dir
+from leadgen_incremental import SOURCES_KEY
+from leadgen_money import parsed_fields
+
+SCALAR_FIELDS = ('company_name', 'founded_year', 'company_age', 'industry', 'locations', 'team_size',
+                 'revenue_est', 'total_funding_raised', 'valuation', 'growth_signals')
+
+VOLATILE_SOURCE_KEYS = ('fetched_at', 'status', 'etag', 'last_modified')
+
+DEFAULT_MAX_MB = 256
+
+SPILL_TARGET = 0.9
+
+DECODED_CACHE_ENTRIES = 64
+
+_ABSENT = 0
+
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+def profile_digest(profile):
+    """Content hash of a profile (SHA-1 of its sorted JSON); a view returns its stored digest.
+
+    Per-source fetch metadata (``VOLATILE_SOURCE_KEYS``) is left out, so a
+    refresh that changed nothing has the same digest as the profile it
+    refreshed.
+    """
+    if isinstance(profile, ProfileView):
+        return profile.digest
+    content = dict(profile)
+    sources = content.get(SOURCES_KEY)
+    if isinstance(sources, Mapping):
+        content[SOURCES_KEY] = {
+            source: {key: value for key, value in meta.items() if key not in VOLATILE_SOURCE_KEYS}
+            if isinstance(meta, Mapping) else meta
+            for source, meta in sources.items()
+        }
+    payload = json.dumps(content, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha1(payload).hexdigest()
+
+class ProfileView(Mapping):
+    """Read-only mapping over one stored profile.
+
+    Scalar fields are read from the store's columns; everything else is
+    decoded from the profile's compressed blob on first access through a
+    small store-wide cache. Views are a few dozen bytes, so sessions, the
+    analysis queue and caches can hold them instead of profile dicts. The
+    store keeps a profile only while a view of it is alive. Nested values
+    are shared with the store and must not be modified.
+    """
+
+    __slots__ = ('store', 'row', 'digest', '__weakref__')
+
+    def __init__(self, store, row, digest):
+        self.store = store
+        self.row = row
+        self.digest = digest
+
+    def __getitem__(self, key):
+        return self.store._value(self.row, key)
+
+    def __iter__(self):
+        return iter(self.store._keys(self.row))
+
+    def __len__(self):
+        return len(self.store._keys(self.row))
+
+    def to_dict(self):
+        """A plain dict copy, e.g. for code that modifies the profile."""
+        return json.loads(json.dumps(dict(self), default=str))
+
+    def __repr__(self):
+        return f"ProfileView({self.get('company_name')!r}, row={self.row})"
+
+class ProfileStore:
+    """Profiles of every session in one process, stored once per distinct content.
+
+    ``put(profile)`` returns a ProfileView and stores:
+
+    - scalar fields (``SCALAR_FIELDS``) as one ``array('I')`` column each,
+      holding ids into a reference-counted table of interned values, so
+      repeated industries, locations, team sizes, signal lists and 'N/A's
+      are kept once;
+    - every other field (summary, funding rounds, contacts, sources, ...)
+      as a zlib-compressed JSON blob per profile.
+
+    Identical profiles share a row and a view. A row lives as long as its
+    view: once the last reference to a view is dropped, the next ``put()``
+    frees the row (its interned values, blob or spilled copy, and digest)
+    and reuses the slot, so the store holds what sessions and the queue
+    still reference and no more. If that still passes ``max_bytes``, the
+    oldest in-memory blobs are spilled to a per-process SQLite file and read
+    back on demand.
+    """
+
+    def __init__(self, max_bytes=None, spill_path=None):
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get('LEADGEN_PROFILE_STORE_MB', DEFAULT_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.spill_path = spill_path or os.path.join(default_cache_dir(), f'profile_store-{os.getpid()}.sqlite')
+        self.values = [None]
+        self._value_refs = [0]
+        self._value_ids = {}
+        self._free_values = []
+        self.shapes = []
+        self._shape_ids = {}
+        self._columns = {field: array('I') for field in SCALAR_FIELDS}
+        self._shape = array('I')
+        self._blobs = []
+        self._digests = []
+        self._views = {}
+        self._free_rows = []
+        self._dead = deque()
+        self._blob_bytes = 0
+        self._values_bytes = 0
+        self._resident = OrderedDict()
+        self._rows = {}
+        self._decoded = OrderedDict()
+        self._spill = None
+        self.spilled = 0
+        self._lock = threading.RLock()
+
+    def _intern(self, value):
+        key = (type(value), value)
+        value_id = self._value_ids.get(key)
+        if value_id is None:
+            if self._free_values:
+                value_id = self._free_values.pop()
+                self.values[value_id] = value
+            else:
+                value_id = len(self.values)
+                self.values.append(value)
+                self._value_refs.append(0)
+            self._value_ids[key] = value_id
+            self._values_bytes += sys.getsizeof(value)
+        self._value_refs[value_id] += 1
+        return value_id
+
+    def _release(self, value_id):
+        self._value_refs[value_id] -= 1
+        if self._value_refs[value_id] == 0:
+            value = self.values[value_id]
+            del self._value_ids[(type(value), value)]
+            self._values_bytes -= sys.getsizeof(value)
+            self.values[value_id] = None
+            self._free_values.append(value_id)
+
+    def _shape_id(self, keys):
+        shape_id = self._shape_ids.get(keys)
+        if shape_id is None:
+            shape_id = self._shape_ids[keys] = len(self.shapes)
+            self.shapes.append(keys)
+        return shape_id
+
+    def put(self, profile):
+        """Store a profile dict (or return the view already holding it); returns a ProfileView.
+
+        The profile's ``_parsed`` amounts are brought up to date first, so
+        ``parsed_fields()`` on the read-only view never has to write. A
+        profile whose content matches a stored one apart from fetch metadata
+        refreshes that row's metadata.
+        """
+        if isinstance(profile, ProfileView) and profile.store is self:
+            return profile
+        profile = dict(profile)
+        parsed_fields(profile)
+        digest = profile_digest(profile)
+        bulk = {
+            key: value for key, value in profile.items()
+            if key not in self._columns or not isinstance(value, _SCALAR_TYPES)
+        }
+        blob = zlib.compress(json.dumps(bulk, default=str).encode('utf-8'), 6)
+        with self._lock:
+            self._collect()
+            row = self._rows.get(digest)
+            if row is not None:
+                self._replace_blob(row, blob)
+                return self._view(row)
+            if self._free_rows:
+                row = self._free_rows.pop()
+            else:
+                row = len(self._shape)
+                for column in self._columns.values():
+                    column.append(_ABSENT)
+                self._shape.append(0)
+                self._blobs.append(None)
+                self._digests.append(None)
+            for field, column in self._columns.items():
+                value = profile.get(field, _ABSENT)
+                if value is not _ABSENT and isinstance(value, _SCALAR_TYPES):
+                    column[row] = self._intern(value)
+            self._shape[row] = self._shape_id(tuple(profile))
+            self._blobs[row] = blob
+            self._blob_bytes += len(blob)
+            self._resident[row] = None
+            self._digests[row] = digest
+            self._rows[digest] = row
+            view = self._view(row)
+            if self._resident and self.nbytes() > self.max_bytes:
+                self._spill_blobs()
+            return view
+
+    def _view(self, row):
+        """The live view of a row, creating (and tracking) one if none is held."""
+        ref = self._views.get(row)
+        view = ref() if ref is not None else None
+        if view is None:
+            view = ProfileView(self, row, self._digests[row])
+            dead = self._dead
+            self._views[row] = weakref.ref(view, lambda _, row=row: dead.append(row))
+        return view
+
+    def _collect(self):
+        """Free the rows whose views have all been dropped."""
+        while self._dead:
+            row = self._dead.popleft()
+            ref = self._views.get(row)
+            if ref is not None and ref() is None:
+                self._free(row)
+
+    def _free(self, row):
+        for column in self._columns.values():
+            if column[row] != _ABSENT:
+                self._release(column[row])
+                column[row] = _ABSENT
+        blob = self._blobs[row]
+        if blob is not None:
+            self._blob_bytes -= len(blob)
+            self._blobs[row] = None
+            del self._resident[row]
+        else:
+            self._spill.execute('DELETE FROM blobs WHERE row = ?', (row,))
+            self.spilled -= 1
+        self._decoded.pop(row, None)
+        del self._rows[self._digests[row]]
+        self._digests[row] = None
+        del self._views[row]
+        self._free_rows.append(row)
+
+    def _replace_blob(self, row, blob):
+        old = self._blobs[row]
+        if old is None:
+            self._spill.execute('UPDATE blobs SET data = ? WHERE row = ?', (blob, row))
+        else:
+            self._blob_bytes += len(blob) - len(old)
+            self._blobs[row] = blob
+        self._decoded.pop(row, None)
+
+    def view(self, digest):
+        """Return the view of a stored profile by digest, or None."""
+        with self._lock:
+            row = self._rows.get(digest)
+            return None if row is None else self._view(row)
+
+    def _keys(self, row):
+        return self.shapes[self._shape[row]]
+
+    def _value(self, row, key):
+        column = self._columns.get(key)
+        if column is not None:
+            value_id = column[row]
+            if value_id != _ABSENT:
+                return self.values[value_id]
+        bulk = self._bulk(row)
+        if key in bulk:
+            return bulk[key]
+        raise KeyError(key)
+
+    def _bulk(self, row):
+        with self._lock:
+            bulk = self._decoded.get(row)
+            if bulk is not None:
+                self._decoded.move_to_end(row)
+                return bulk
+            blob = self._blobs[row]
+            if blob is None:
+                blob = self._spill.execute('SELECT data FROM blobs WHERE row = ?', (row,)).fetchone()[0]
+            bulk = self._decoded[row] = json.loads(zlib.decompress(blob))
+            while len(self._decoded) > DECODED_CACHE_ENTRIES:
+                self._decoded.popitem(last=False)
+            return bulk
+
+    def _spill_connection(self):
+        if self._spill is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.spill_path)), exist_ok=True)
+            self._spill = sqlite3.connect(self.spill_path, check_same_thread=False)
+            self._spill.execute('DROP TABLE IF EXISTS blobs')
+            self._spill.execute('CREATE TABLE blobs (row INTEGER PRIMARY KEY, data BLOB NOT NULL)')
+            atexit.register(self.close)
+        return self._spill
+
+    def _spill_blobs(self):
+        """Move the oldest in-memory blobs to disk until the footprint is under the cap again."""
+        target = self.max_bytes * SPILL_TARGET
+        spill = self._spill_connection()
+        rows = []
+        excess = self.nbytes() - target
+        while self._resident and excess > 0:
+            row, _ = self._resident.popitem(last=False)
+            rows.append((row, self._blobs[row]))
+            excess -= len(self._blobs[row])
+        spill.executemany('INSERT OR REPLACE INTO blobs (row, data) VALUES (?, ?)', rows)
+        spill.commit()
+        for row, blob in rows:
+            self._blobs[row] = None
+            self._blob_bytes -= len(blob)
+        self.spilled += len(rows)
+
+    def set_max_bytes(self, max_bytes):
+        """Change the memory cap, spilling right away if the store is now over it."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._collect()
+            if self._resident and self.nbytes() > self.max_bytes:
+                self._spill_blobs()
+
+    def nbytes(self):
+        """Estimated memory held by the store (columns, interned values, blobs and indexes)."""
+        columns = sum(column.itemsize * len(column) for column in self._columns.values())
+        index = (sys.getsizeof(self._rows) + len(self._rows) * 90 + sys.getsizeof(self._value_ids)
+                 + sys.getsizeof(self._views) + len(self._views) * 60)
+        return (columns + self._shape.itemsize * len(self._shape) + self._values_bytes
+                + self._blob_bytes + sys.getsizeof(self._blobs) + index)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def stats(self):
+        """Return profile, interned-value and spill counts plus memory use against the cap."""
+        with self._lock:
+            self._collect()
+            return {
+                'profiles': len(self),
+                'interned_values': len(self._value_ids),
+                'resident_blobs': len(self._resident),
+                'spilled': self.spilled,
+                'nbytes': self.nbytes(),
+                'blob_bytes': self._blob_bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def close(self):
+        with self._lock:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+                if os.path.exists(self.spill_path):
+                    os.remove(self.spill_path)
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+def get_profile_store():
+    """Return the process-wide profile store (cap from LEADGEN_PROFILE_STORE_MB)."""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = ProfileStore()
+        return _shared_store
@@ -6,16 +6,40 @@ Professional lead generation tool with modern business interface.
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import json
 import time  
 from datetime import datetime
 import sys
 import os
+import uuid
+import json
+import functools
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from leadGENAI import LeadGenAI
+from leadgen_service import LeadGenService
+from leadgen_cache import get_profile_cache
+from leadgen_httpcache import get_response_cache
+from leadgen_reports import render_report, report_file_info
+from leadgen_scoring import BASE_SCORE, profile_score
+from leadgen_sink import (
+    SINK_FORMATS, available_formats, count_rows, read_page, result_bytes
+)
+from leadgen_ratelimit import get_rate_limiter
+from leadgen_batch import (
+    DEFAULT_SOURCE_LIMITS, BatchRunner, SourceLimiter, count_company_names, iter_company_names, tightest_limit
+)
+from leadgen_jobs import background_job, get_job_store, start_background_job
+from leadgen_compare import SORT_COLUMNS, ComparisonTable
+from leadgen_charts import create_funding_timeline, create_growth_signals_chart, create_investment_score_gauge
+from leadgen_money import format_amount, format_money, parsed_fields
+from leadgen_queue import QueueExecutor, get_analysis_queue
+from leadgen_metrics import get_metrics
+from leadgen_resolve import batch_company_index
+from leadgen_discovery import get_discovery_index
+from leadgen_store import get_profile_store, profile_digest
+from leadgen_watchlist import (
+    INTERVALS, WATCHED_FIELDS, describe_change, get_watchlist, get_watchlist_scheduler
+)
 
 st.set_page_config(
     page_title="LEADGen AI - Intelligent Lead Generation",
@@ -147,6 +171,8 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+EXPORT_FORMATS = ["JSON", "Markdown", "Text", "HTML", "CSV"]
+
 def create_header():
     """Create the main header section."""
     st.markdown("""
@@ -156,6 +182,13 @@ def create_header():
     </div>
     """, unsafe_allow_html=True)
 
+def amount_label(profile, field):
+    """Normalized label for a money or size field, falling back to the raw text."""
+    amount = parsed_fields(profile).get(field)
+    if amount is None:
+        return profile.get(field, 'N/A')
+    return format_amount(amount)
+
 def create_metric_card(title, value, description, color="#667eea"):
     """Create a styled metric card."""
     st.markdown(f"""
@@ -166,284 +199,781 @@ def create_metric_card(title, value, description, color="#667eea"):
     </div>
     """, unsafe_allow_html=True)
 
-def create_investment_score_gauge(score):
-    """Create an investment score gauge chart."""
-    fig = go.Figure(go.Indicator(
-        mode = "gauge+number+delta",
-        value = score,
-        domain = {'x': [0, 1], 'y': [0, 1]},
-        title = {'text': "Investment Score", 'font': {'size': 24}},
-        delta = {'reference': 50},
-        gauge = {
-            'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
-            'bar': {'color': "darkblue"},
-            'bgcolor': "white",
-            'borderwidth': 2,
-            'bordercolor': "gray",
-            'steps': [
-                {'range': [0, 40], 'color': '#ff6b6b'},
-                {'range': [40, 60], 'color': '#feca57'},
-                {'range': [60, 80], 'color': '#48dbfb'},
-                {'range': [80, 100], 'color': '#1dd1a1'}
-            ],
-            'threshold': {
-                'line': {'color': "red", 'width': 4},
-                'thickness': 0.75,
-                'value': 90
-            }
-        }
-    ))
+CHART_CACHE_ENTRIES = 256
+
+@st.cache_data(max_entries=101, show_spinner=False)
+def cached_investment_score_gauge(score):
+    """Gauge figure per score value; every session gets its own copy."""
+    return create_investment_score_gauge(score)
+
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES, show_spinner=False)
+def cached_growth_signals_chart(growth_signals):
+    """Growth signals chart keyed by the signals string; every session gets its own copy."""
+    return create_growth_signals_chart(growth_signals)
+
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES, show_spinner=False)
+def cached_funding_timeline(digest, _funding_rounds):
+    """Funding timeline keyed by the profile digest; the rounds themselves are not hashed."""
+    return create_funding_timeline(_funding_rounds)
+
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES, show_spinner=False)
+def cached_profile_json(digest, _profile):
+    """Serialized raw profile keyed by its digest."""
+    return json.dumps(dict(_profile), default=str)
+
+def render_overview_section(profile, digest):
+    """Overview: key metrics, investment score and summary."""
+    st.subheader("Company Overview")
     
-    fig.update_layout(
-        height=300,
-        margin=dict(l=20, r=20, t=40, b=20),
-        font={'color': "#2c3e50"}
-    )
+    col1, col2, col3 = st.columns(3)
     
-    return fig
-
-def create_growth_signals_chart(growth_signals):
-    """Create a growth signals visualization."""
-    if not growth_signals or growth_signals == "N/A":
-        return None
+    with col1:
+        create_metric_card(
+            "Founded Year",
+            profile.get('founded_year', 'N/A'),
+            "Company establishment year",
+            "#667eea"
+        )
     
-    signals = growth_signals.split(', ')
-    signal_counts = {}
+    with col2:
+        create_metric_card(
+            "Company Age",
+            f"{profile.get('company_age', 'N/A')} years",
+            "Years since founding",
+            "#764ba2"
+        )
     
-    for signal in signals:
-        signal_counts[signal] = signal_counts.get(signal, 0) + 1
+    with col3:
+        create_metric_card(
+            "Industry",
+            profile.get('industry', 'N/A'),
+            "Primary business sector",
+            "#f093fb"
+        )
     
-    if not signal_counts:
-        return None
+    st.subheader("Investment Analysis")
     
-    fig = px.bar(
-        x=list(signal_counts.keys()),
-        y=list(signal_counts.values()),
-        title="Growth Signals Analysis",
-        labels={'x': 'Growth Signal', 'y': 'Frequency'},
-        color=list(signal_counts.values()),
-        color_continuous_scale='Viridis'
-    )
+    score = profile_score(profile)
     
-    fig.update_layout(
-        height=400,
-        margin=dict(l=20, r=20, t=40, b=20),
-        font={'color': "#2c3e50"},
-        plot_bgcolor='white',
-        paper_bgcolor='white'
-    )
+    col1, col2 = st.columns([2, 1])
     
-    return fig
+    with col1:
+        fig = cached_investment_score_gauge(score)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.markdown("### Investment Recommendation")
+        st.markdown(f"**{profile.get('why_invest', 'N/A')}**")
+        
+        if score >= 80:
+            st.markdown('<div class="success-message">🟢 Low Risk Investment</div>', unsafe_allow_html=True)
+        elif score >= 60:
+            st.markdown('<div class="info-message">🟡 Moderate Risk Investment</div>', unsafe_allow_html=True)
+        elif score >= 40:
+            st.markdown('<div class="warning-message">🟠 Moderate-High Risk Investment</div>', unsafe_allow_html=True)
+        else:
+            st.markdown('<div class="warning-message">🔴 High Risk Investment</div>', unsafe_allow_html=True)
+    
+    breakdown = profile.get('investment_score')
+    if isinstance(breakdown, dict) and breakdown.get('sub_scores'):
+        with st.expander("🧮 Score Breakdown"):
+            st.dataframe(pd.DataFrame([
+                {
+                    'Factor': factor.replace('_', ' ').title(),
+                    'Weight': breakdown['weights'].get(factor),
+                    'Points': points,
+                }
+                for factor, points in breakdown['sub_scores'].items()
+            ]), use_container_width=True, hide_index=True)
+            if 'heuristic_total' in breakdown:
+                st.caption(f"Score {breakdown['total']} is LeadGenAI's own assessment; "
+                           f"base {BASE_SCORE} + these factor points would give {breakdown['heuristic_total']}")
+            else:
+                st.caption(f"Base {BASE_SCORE} + factor points, clipped to 0-100 = {breakdown['total']}")
+    
+    st.subheader("Company Summary")
+    st.info(profile.get('summary', 'No summary available'))
 
-def create_funding_timeline(funding_rounds):
-    """Create a funding timeline visualization."""
-    if not funding_rounds:
-        return None
+def render_financial_section(profile, digest):
+    """Financial metrics and funding timeline."""
+    st.subheader("Financial Information")
     
-    timeline_data = []
-    for i, round_data in enumerate(funding_rounds):
-        timeline_data.append({
-            'Round': round_data.get('type', f'Round {i+1}'),
-            'Amount': round_data.get('amount', 'N/A'),
-            'Year': 2020 + i
-        })
-    
-    fig = px.timeline(
-        timeline_data,
-        x_start='Year',
-        y='Round',
-        title='Funding Timeline',
-        color='Amount',
-        color_continuous_scale='Viridis'
-    )
+    col1, col2, col3 = st.columns(3)
     
-    fig.update_layout(
-        height=400,
-        margin=dict(l=20, r=20, t=40, b=20),
-        font={'color': "#2c3e50"},
-        plot_bgcolor='white',
-        paper_bgcolor='white'
-    )
+    with col1:
+        create_metric_card(
+            "Revenue Estimate",
+            amount_label(profile, 'revenue_est'),
+            "Annual revenue projection",
+            "#56ab2f"
+        )
+    
+    with col2:
+        create_metric_card(
+            "Total Funding",
+            amount_label(profile, 'total_funding_raised'),
+            "Total capital raised",
+            "#f093fb"
+        )
     
-    return fig
+    with col3:
+        create_metric_card(
+            "Valuation",
+            amount_label(profile, 'valuation'),
+            "Company valuation",
+            "#4facfe"
+        )
+    
+    st.subheader("Funding Timeline")
+    funding_rounds = profile.get('funding_rounds', [])
+    funding_fig = cached_funding_timeline(digest, funding_rounds)
+    if funding_fig:
+        st.plotly_chart(funding_fig, use_container_width=True)
+        undated = sum(1 for round_data in funding_rounds if not round_data.get('date'))
+        if undated and undated < len(funding_rounds):
+            st.caption(f"{undated} round(s) without a disclosed date are not shown on the timeline")
+    else:
+        st.info("No funding round data available")
 
-def display_company_profile(profile):
-    """Display the company profile in a structured way."""
+def render_growth_section(profile, digest):
+    """Growth signals chart and breakdown."""
+    st.subheader("Growth Analysis")
     
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Overview", "💰 Financial", "📈 Growth", "👥 Team & Contact", "📋 Raw Data"])
+    growth_fig = cached_growth_signals_chart(profile.get('growth_signals'))
+    if growth_fig:
+        st.plotly_chart(growth_fig, use_container_width=True)
+    else:
+        st.info("No growth signals data available")
     
-    with tab1:
-        st.subheader("Company Overview")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            create_metric_card(
-                "Founded Year",
-                profile.get('founded_year', 'N/A'),
-                "Company establishment year",
-                "#667eea"
-            )
-        
-        with col2:
-            create_metric_card(
-                "Company Age",
-                f"{profile.get('company_age', 'N/A')} years",
-                "Years since founding",
-                "#764ba2"
-            )
-        
-        with col3:
-            create_metric_card(
-                "Industry",
-                profile.get('industry', 'N/A'),
-                "Primary business sector",
-                "#f093fb"
-            )
+    if profile.get('growth_signals') and profile['growth_signals'] != "N/A":
+        signals = profile['growth_signals'].split(', ')
+        st.subheader("Growth Signals Breakdown")
         
-        st.subheader("Investment Analysis")
-        
-        why_invest = profile.get('why_invest', '')
-        score = 50
-        
-        if 'Investment score:' in why_invest:
-            try:
-                score_text = why_invest.split('Investment score:')[1].split('/')[0]
-                score = int(score_text.strip())
-            except:
-                pass
-        
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            fig = create_investment_score_gauge(score)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            st.markdown("### Investment Recommendation")
-            st.markdown(f"**{profile.get('why_invest', 'N/A')}**")
-            
-            if score >= 80:
-                st.markdown('<div class="success-message">🟢 Low Risk Investment</div>', unsafe_allow_html=True)
-            elif score >= 60:
-                st.markdown('<div class="info-message">🟡 Moderate Risk Investment</div>', unsafe_allow_html=True)
-            elif score >= 40:
-                st.markdown('<div class="warning-message">🟠 Moderate-High Risk Investment</div>', unsafe_allow_html=True)
-            else:
-                st.markdown('<div class="warning-message">🔴 High Risk Investment</div>', unsafe_allow_html=True)
-        
-        st.subheader("Company Summary")
-        st.info(profile.get('summary', 'No summary available'))
+        for signal in signals:
+            st.markdown(f"✅ **{signal.strip()}**")
+
+def render_team_section(profile, digest):
+    """Team size, location and contact details."""
+    st.subheader("Team & Contact Information")
     
-    with tab2:
-        st.subheader("Financial Information")
-        
-        col1, col2, col3 = st.columns(3)
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### Team Information")
+        create_metric_card(
+            "Team Size",
+            amount_label(profile, 'team_size'),
+            "Number of employees",
+            "#667eea"
+        )
         
-        with col1:
-            create_metric_card(
-                "Revenue Estimate",
-                profile.get('revenue_est', 'N/A'),
-                "Annual revenue projection",
-                "#56ab2f"
-            )
+        st.markdown("### Location")
+        st.info(profile.get('locations', 'N/A'))
+    
+    with col2:
+        st.markdown("### Contact Information")
         
-        with col2:
-            create_metric_card(
-                "Total Funding",
-                profile.get('total_funding_raised', 'N/A'),
-                "Total capital raised",
-                "#f093fb"
-            )
+        emails = profile.get('contact_info', {}).get('emails', [])
+        if emails:
+            st.markdown("**📧 Email Addresses:**")
+            for email in emails:
+                st.code(email)
         
-        with col3:
-            create_metric_card(
-                "Valuation",
-                profile.get('valuation', 'N/A'),
-                "Company valuation",
-                "#4facfe"
-            )
+        phones = profile.get('contact_info', {}).get('phones', [])
+        if phones:
+            st.markdown("**📞 Phone Numbers:**")
+            for phone in phones:
+                st.code(phone)
         
-        st.subheader("Funding Timeline")
-        funding_fig = create_funding_timeline(profile.get('funding_rounds', []))
-        if funding_fig:
-            st.plotly_chart(funding_fig, use_container_width=True)
-        else:
-            st.info("No funding round data available")
+        social_links = profile.get('social_links', {})
+        if social_links:
+            st.markdown("**🔗 Social Media:**")
+            for platform, link in social_links.items():
+                st.markdown(f"**{platform.title()}:** {link}")
+
+def render_raw_data_section(profile, digest):
+    """Raw profile JSON."""
+    st.subheader("Raw Data")
+    st.json(cached_profile_json(digest, profile), expanded=False)
+
+PROFILE_SECTIONS = {
+    "📊 Overview": render_overview_section,
+    "💰 Financial": render_financial_section,
+    "📈 Growth": render_growth_section,
+    "👥 Team & Contact": render_team_section,
+    "📋 Raw Data": render_raw_data_section,
+}
+
+@st.fragment
+def display_company_profile(profile, digest=None):
+    """Display the company profile one section at a time.
+
+    Only the selected section is built and sent to the browser, and switching
+    sections reruns just this fragment. Charts and the raw JSON come from
+    caches keyed by the profile's content digest.
+    """
+    digest = digest or profile_digest(profile)
+    section = st.segmented_control(
+        "Section",
+        list(PROFILE_SECTIONS),
+        default=next(iter(PROFILE_SECTIONS)),
+        key="profile_section",
+        label_visibility="collapsed"
+    )
+    PROFILE_SECTIONS[section or next(iter(PROFILE_SECTIONS))](profile, digest)
+
+def session_owner():
+    """Stable id for this browser session, used for fair scheduling on the shared pool."""
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    return st.session_state.session_id
+
+def submit_analysis(company_name, force_refresh, use_source_pipeline, max_retries):
+    """Queue a single-company analysis on the shared background pool."""
+    def task(extractor, progress):
+        extractor.max_retries = max_retries
+        profile = extractor.extract_company_profile(
+            company_name, refresh=force_refresh, progress=progress, pipeline=use_source_pipeline
+        )
+        profile.setdefault('company_name', company_name)
+        return get_profile_store().put(profile)
     
-    with tab3:
-        st.subheader("Growth Analysis")
-        
-        growth_fig = create_growth_signals_chart(profile.get('growth_signals'))
-        if growth_fig:
-            st.plotly_chart(growth_fig, use_container_width=True)
+    key = ('analyze', company_name.strip().lower(), use_source_pipeline, force_refresh)
+    st.session_state.analysis_job = {
+        'job_id': get_analysis_queue().submit(session_owner(), key, task, label=company_name),
+        'kind': 'analyze',
+        'company_name': company_name,
+    }
+
+def submit_refresh(profile, max_retries):
+    """Queue an incremental refresh of the current profile on the shared background pool."""
+    def task(extractor, progress):
+        extractor.max_retries = max_retries
+        refreshed, changes = extractor.refresh_company_profile(profile, progress=progress)
+        return get_profile_store().put(refreshed), changes
+    
+    company_name = profile.get('company_name')
+    key = ('refresh', str(company_name).strip().lower())
+    st.session_state.analysis_job = {
+        'job_id': get_analysis_queue().submit(session_owner(), key, task, label=company_name),
+        'kind': 'refresh',
+        'company_name': company_name,
+    }
+
+@st.fragment(run_every=1.0)
+def poll_analysis_job():
+    """Show the session's queued or running analysis and pick up its result when done."""
+    pending = st.session_state.get('analysis_job')
+    if not pending:
+        return
+    queue = get_analysis_queue()
+    info = queue.status(pending['job_id'])
+    if info is None:
+        st.session_state.analysis_job = None
+        st.rerun()
+    
+    if info.status == 'queued':
+        st.info(f"⏳ {info.label} is queued ({info.position} job(s) ahead)")
+        if st.button("✖️ Cancel"):
+            queue.cancel(info.job_id)
+            st.session_state.analysis_job = None
+            st.rerun()
+        return
+    if info.status == 'running':
+        st.progress(info.fraction)
+        st.text(f"🔍 {info.message} · {time.time() - info.started_at:.0f}s")
+        return
+    
+    st.session_state.analysis_job = None
+    if info.status == 'done':
+        if pending['kind'] == 'refresh':
+            profile, changes = info.result
         else:
-            st.info("No growth signals data available")
-        
-        if profile.get('growth_signals') and profile['growth_signals'] != "N/A":
-            signals = profile['growth_signals'].split(', ')
-            st.subheader("Growth Signals Breakdown")
-            
-            for signal in signals:
-                st.markdown(f"✅ **{signal.strip()}**")
+            profile, changes = info.result, None
+        st.session_state.current_profile = profile
+        st.session_state.profile_digest = profile_digest(profile)
+        st.session_state.profile_changes = changes
+        st.session_state.stage_timings = info.timings
+        st.session_state.analysis_seconds = info.finished_at - info.started_at
+        st.session_state.analysis_notice = ('success', f"✅ Analysis completed for {pending['company_name']}!")
+    elif info.status == 'failed':
+        st.session_state.analysis_notice = ('error', f"❌ Error during analysis: {info.error}")
+    st.rerun()
+
+BATCH_TABLE_COLUMNS = {
+    'company_name': 'Company',
+    'industry': 'Industry',
+    'founded_year': 'Founded',
+    'total_funding_raised': 'Total Funding',
+    'valuation': 'Valuation',
+    'team_size': 'Team Size',
+    'investment_score': 'Score',
+}
+
+def batch_result_rows(rows):
+    """Select and label the result columns shown in batch tables."""
+    return [
+        {label: row.get(column, 'N/A') for column, label in BATCH_TABLE_COLUMNS.items()}
+        for row in rows
+    ]
+
+def start_batch_job(uploaded_file, sink_format):
+    """Create a persistent job from an uploaded company list; returns its id."""
+    if count_company_names(uploaded_file) == 0:
+        st.warning("No company names found in the uploaded file.")
+        return None
+    return get_job_store().create_job(
+        uploaded_file.name, iter_company_names(uploaded_file), sink_format
+    )
+
+def submit_batch_job(job_id, max_workers, source_limits=None):
+    """Start a batch job (new or resumed) whose companies run on the shared background pool.
+
+    Each company is queued as its own item under this session, so batches
+    take turns with every analyst's lookups; ``max_workers`` caps how many
+    of the batch's companies are queued or running at once, and
+    ``source_limits`` how many of them use each source.
+    """
+    store = get_job_store()
+    job = store.get_job(job_id)
+    executor = QueueExecutor(get_analysis_queue(), session_owner(), label=f"Batch {job['name']}")
+    runner = BatchRunner(
+        LeadGenService, max_workers=max_workers, resolver=batch_company_index(), executor=executor,
+        source_limiter=SourceLimiter(source_limits), sources=None if LeadGenService.use_source_pipeline else DEFAULT_SOURCE_LIMITS.keys(),
+    )
+    start_background_job(store, job_id, runner)
+    st.session_state.batch_job_id = job_id
+    st.session_state.batch_results_path = job['sink_path']
+    st.session_state.batch_run = {
+        'job_id': job_id,
+        'already': job['total'] - store.count_pending(job_id),
+    }
+
+LIVE_RESULT_ROWS = 20
+
+@st.fragment(run_every=2.0)
+def poll_batch_job():
+    """Show live progress, per-company status and the newest results of the session's batch job."""
+    batch_run = st.session_state.get('batch_run')
+    if not batch_run:
+        return
+    running = background_job(batch_run['job_id'])
+    job = get_job_store().get_job(batch_run['job_id'])
+    if running is None or running.status != 'running':
+        st.session_state.batch_run = None
+        if running is not None and running.status == 'failed':
+            st.session_state.batch_notice = f"❌ Batch stopped: {running.error}"
+        else:
+            coalesced = running.stats.coalesced if running is not None else None
+            st.session_state.batch_notice = f"✅ Batch complete: {job['name']}" + (
+                f" ({coalesced} duplicate name(s) shared another row's result)" if coalesced else ""
+            )
+        st.rerun()
     
-    with tab4:
-        st.subheader("Team & Contact Information")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("### Team Information")
-            create_metric_card(
-                "Team Size",
-                profile.get('team_size', 'N/A'),
-                "Number of employees",
-                "#667eea"
+    counts = get_job_store().counts(batch_run['job_id'])
+    total = job['total']
+    finished = counts['done'] + counts['failed']
+    st.progress(finished / total if total else 0)
+    st.text(f"📊 {finished}/{total} companies analyzed, {counts['running']} running")
+    elapsed = time.time() - running.started_at
+    processed = max(0, finished - batch_run['already'])
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Completed", counts['done'])
+    col2.metric("Failed", counts['failed'])
+    col3.metric("Throughput", f"{processed * 60.0 / elapsed if elapsed > 0 else 0.0:.1f} companies/min")
+    
+    active = get_job_store().recent_items(batch_run['job_id'])
+    if active:
+        st.dataframe(pd.DataFrame([
+            {
+                'Company': item['company_name'],
+                'Status': item['status'],
+                'Attempts': item['attempts'],
+                'Error': item['error'] or '',
+            }
+            for item in active
+        ]), use_container_width=True, hide_index=True)
+    results_path = job['sink_path']
+    written = count_rows(results_path) if os.path.exists(results_path) else 0
+    if written:
+        last_page = (written - 1) // LIVE_RESULT_ROWS
+        st.caption(f"Latest results ({written} written so far)")
+        st.dataframe(
+            pd.DataFrame(batch_result_rows(read_page(results_path, last_page, LIVE_RESULT_ROWS))),
+            use_container_width=True
+        )
+
+def render_job_status(job_id):
+    """Show the persisted per-company status counts of a batch job."""
+    store = get_job_store()
+    job = store.get_job(job_id)
+    if job is None:
+        return
+    counts = store.counts(job_id)
+    st.caption(
+        f"Job {job['name']} ({job['job_id']}): {counts['done']} done · {counts['failed']} failed"
+        f" · {counts['pending'] + counts['running']} pending of {job['total']}"
+    )
+    failed = store.failed_items(job_id)
+    if failed:
+        with st.expander(f"❌ Failed Companies ({len(failed)})"):
+            st.dataframe(pd.DataFrame(failed), use_container_width=True, hide_index=True)
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def download_bytes(results_path, modified_at):
+    """A result file's download bytes, built once per version of the file."""
+    return result_bytes(results_path)
+
+def show_batch_results(results_path, page_size=100):
+    """Page through a batch result file and offer it for download.
+
+    The download is deferred: the file is only read (and Parquet parts
+    combined) when the button is clicked, not on every rerun.
+    """
+    total = count_rows(results_path)
+    st.subheader(f"Batch Results ({total} companies)")
+    if total == 0:
+        st.info("No completed profiles yet")
+        return
+    
+    pages = (total + page_size - 1) // page_size
+    page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1)
+    rows = read_page(results_path, page - 1, page_size)
+    st.dataframe(pd.DataFrame(batch_result_rows(rows)), use_container_width=True)
+    st.caption(f"Showing rows {(page - 1) * page_size + 1}-{(page - 1) * page_size + len(rows)} of {total}")
+    
+    file_name = os.path.basename(results_path)
+    fmt = os.path.splitext(file_name)[1].lstrip('.')
+    st.download_button(
+        label=f"📥 Download {fmt.upper()}",
+        data=functools.partial(download_bytes, results_path, os.path.getmtime(results_path)),
+        file_name=file_name,
+        mime=SINK_FORMATS[fmt][1]
+    )
+
+COMPARE_TABLE_COLUMNS = {
+    'company_name': 'Company',
+    'industry': 'Industry',
+    'founded_year': 'Founded',
+    'investment_score': 'Score',
+    'funding_usd': 'Total Funding',
+    'funding_currency': 'Reported In',
+    'valuation_usd': 'Valuation',
+    'revenue_usd': 'Revenue',
+    'employees': 'Team Size',
+}
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def load_comparison(results_path, modified_at):
+    """Columnar comparison table for a batch result file, rebuilt when the file changes."""
+    return ComparisonTable.from_results(results_path)
+
+def render_comparison():
+    """Sort, filter and chart many companies from a batch result file."""
+    jobs = [job for job in get_job_store().list_jobs() if os.path.exists(job['sink_path'])]
+    if not jobs:
+        st.info("Run a batch analysis first; its results can then be compared here.")
+        return
+    
+    st.sidebar.markdown("### 📚 Companies")
+    job = st.sidebar.selectbox(
+        "Batch Results",
+        jobs,
+        format_func=lambda job: f"{job['name']} · {job['total']} companies · {job['job_id']}",
+        help="Batch result file to compare"
+    )
+    table = load_comparison(job['sink_path'], os.path.getmtime(job['sink_path']))
+    if not len(table):
+        st.info("No completed profiles in this batch yet")
+        return
+    
+    st.sidebar.markdown("### 🔎 Filters")
+    search = st.sidebar.text_input("Company Name Contains")
+    industries = st.sidebar.multiselect("Industries", table.industries)
+    min_score, max_score = st.sidebar.slider("Investment Score", 0, 100, (0, 100))
+    min_funding = st.sidebar.number_input("Minimum Total Funding ($M)", min_value=0.0, value=0.0, step=1.0)
+    sort_by = st.sidebar.selectbox("Sort By", list(SORT_COLUMNS), format_func=SORT_COLUMNS.get)
+    ascending = st.sidebar.checkbox("Ascending", value=False)
+    
+    filtered = table.filter(
+        industries=industries,
+        min_score=min_score if min_score > 0 else None,
+        max_score=max_score if max_score < 100 else None,
+        search=search,
+        ranges={'funding_usd': (min_funding * 1e6, None)} if min_funding else None,
+    )
+    
+    st.subheader(f"Company Comparison ({len(filtered)} of {len(table)} companies)")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Companies", len(filtered))
+    col2.metric("Mean Score", f"{filtered['investment_score'].mean():.0f}" if len(filtered) else "N/A")
+    col3.metric("Median Funding", format_money(filtered['funding_usd'].median()))
+    col4.metric("Median Valuation", format_money(filtered['valuation_usd'].median()))
+    if not len(filtered):
+        st.info("No companies match the filters")
+        return
+    
+    page_size = 50
+    pages = (len(filtered) + page_size - 1) // page_size
+    page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1, key="compare_page")
+    rows = ComparisonTable.page(filtered, sort_by, ascending, page - 1, page_size)
+    view = rows[list(COMPARE_TABLE_COLUMNS)].rename(columns=COMPARE_TABLE_COLUMNS)
+    for column in ('Total Funding', 'Valuation', 'Revenue'):
+        view[column] = view[column].map(format_money)
+    st.dataframe(view, use_container_width=True, hide_index=True)
+    st.caption("Amounts in other currencies are converted to US dollars at fixed reference rates")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        points = ComparisonTable.plot_points(filtered, ('funding_usd', 'investment_score'))
+        if len(points):
+            fig = px.scatter(
+                points, x='funding_usd', y='investment_score', color='industry',
+                hover_name='company_name', log_x=True, title='Score vs Total Funding',
+                labels={'funding_usd': 'Total Funding ($)', 'investment_score': 'Score'}
             )
-            
-            st.markdown("### Location")
-            st.info(profile.get('locations', 'N/A'))
-        
-        with col2:
-            st.markdown("### Contact Information")
-            
-            emails = profile.get('contact_info', {}).get('emails', [])
-            if emails:
-                st.markdown("**📧 Email Addresses:**")
-                for email in emails:
-                    st.code(email)
-            
-            phones = profile.get('contact_info', {}).get('phones', [])
-            if phones:
-                st.markdown("**📞 Phone Numbers:**")
-                for phone in phones:
-                    st.code(phone)
-            
-            social_links = profile.get('social_links', {})
-            if social_links:
-                st.markdown("**🔗 Social Media:**")
-                for platform, link in social_links.items():
-                    st.markdown(f"**{platform.title()}:** {link}")
+            st.plotly_chart(fig, use_container_width=True)
+            if len(points) < filtered['funding_usd'].notna().sum():
+                st.caption(f"Showing a sample of {len(points)} companies")
+    with col2:
+        bins = ComparisonTable.histogram(filtered, 'investment_score', bins=10)
+        fig = px.bar(bins, x='low', y='companies', title='Score Distribution',
+                     labels={'low': 'Score', 'companies': 'Companies'})
+        st.plotly_chart(fig, use_container_width=True)
+    
+    groups = ComparisonTable.aggregates(filtered)
+    fig = px.bar(groups, x='industry', y='companies', color='mean_score',
+                 title='Companies by Industry', color_continuous_scale='Viridis',
+                 labels={'companies': 'Companies', 'mean_score': 'Mean Score', 'industry': 'Industry'})
+    st.plotly_chart(fig, use_container_width=True)
+    
+    years = table.funding_by_year(filtered)
+    if len(years):
+        fig = px.bar(years, x='year', y='amount', hover_data=['rounds'], title='Funding by Year',
+                     labels={'year': 'Year', 'amount': 'Amount Raised ($)', 'rounds': 'Rounds'})
+        st.plotly_chart(fig, use_container_width=True)
+
+def render_cache_stats():
+    """Show shared profile and HTTP response cache counters in the sidebar."""
+    stats = get_profile_cache().stats()
+    st.sidebar.markdown("### 🗄️ Profile Cache")
+    col1, col2 = st.sidebar.columns(2)
+    col1.metric("Hits", stats['hits'])
+    col2.metric("Misses", stats['misses'])
+    st.sidebar.caption(
+        f"Hit rate {stats['hit_rate']:.0%} · {stats['entries']}/{stats['max_entries']} companies cached"
+    )
+    
+    http_stats = get_response_cache().stats()
+    col1, col2 = st.sidebar.columns(2)
+    col1.metric("HTTP Hits", http_stats['hits'])
+    col2.metric("304s", http_stats['revalidated'])
+    st.sidebar.caption(
+        f"{http_stats['entries']} responses · {http_stats['stored_bytes'] / 1e6:.1f} MB stored"
+        f" · {http_stats['bytes_saved'] / 1e6:.1f} MB saved"
+        + (" · replay only" if http_stats['replay_only'] else "")
+    )
+
+def render_rate_limits():
+    """Show effective per-host request rates from the shared rate limiter."""
+    metrics = get_rate_limiter().metrics()
+    st.sidebar.markdown("### 🚦 Request Rates")
+    if not metrics:
+        st.sidebar.caption("No requests sent yet")
+        return
+    st.sidebar.dataframe(
+        pd.DataFrame(metrics)[['host', 'rate_per_sec', 'requests', 'throttled', 'wait_seconds']],
+        use_container_width=True,
+        hide_index=True
+    )
+
+def render_queue_stats():
+    """Show the shared background worker pool's load in the sidebar."""
+    stats = get_analysis_queue().stats()
+    st.sidebar.markdown("### 🧵 Analysis Queue")
+    col1, col2 = st.sidebar.columns(2)
+    col1.metric("Running", f"{stats['running']}/{stats['workers']}")
+    col2.metric("Queued", stats['queued'])
+
+@st.fragment(run_every=10.0)
+def render_change_feed(company_name=None, fields=None, limit=200):
+    """Newest watchlist changes, polled so new alerts show up without a rerun."""
+    changes = get_watchlist().feed(limit=limit, company_name=company_name, fields=fields)
+    if not changes:
+        st.info("No changes detected yet. Watched companies are compared with their last profile on every refresh.")
+        return
+    st.dataframe(pd.DataFrame([
+        {
+            'Detected': datetime.fromtimestamp(change.detected_at).strftime('%Y-%m-%d %H:%M'),
+            'Company': change.company_name,
+            'Change': describe_change(change),
+        }
+        for change in changes
+    ]), use_container_width=True, hide_index=True)
+
+def render_watchlist():
+    """Watched companies, their refresh schedule and the feed of detected changes."""
+    store = get_watchlist()
     
-    with tab5:
-        st.subheader("Raw Data")
-        st.json(profile)
+    st.sidebar.markdown("### 👁️ Watch a Company")
+    company_name = st.sidebar.text_input("Company Name", key="watch_company")
+    interval = st.sidebar.selectbox("Refresh", list(INTERVALS), index=2, key="watch_interval")
+    if st.sidebar.button("➕ Add to Watchlist") and company_name.strip():
+        store.add(company_name.strip(), INTERVALS[interval])
+        st.sidebar.success(f"✅ Watching {company_name.strip()}")
+    
+    watched = store.list()
+    st.markdown(f"## 👁️ Watchlist ({len(watched)} companies)")
+    if not watched:
+        st.info("Add companies in the sidebar; they are refreshed in the background and changes show up below.")
+        return
+    
+    labels = {seconds: label for label, seconds in INTERVALS.items()}
+    st.dataframe(pd.DataFrame([
+        {
+            'Company': item.company_name,
+            'Refresh': labels.get(item.interval, f"{item.interval / 3600:g}h"),
+            'Next Refresh': datetime.fromtimestamp(item.next_due).strftime('%Y-%m-%d %H:%M'),
+            'Last Refresh': (datetime.fromtimestamp(item.last_refreshed).strftime('%Y-%m-%d %H:%M')
+                             if item.last_refreshed else '-'),
+            'Status': item.last_error or item.last_status or 'scheduled',
+            'Changes': item.changes,
+        }
+        for item in watched
+    ]), use_container_width=True, hide_index=True)
+    
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        selected = st.selectbox("Company", [item.company_name for item in watched], key="watch_selected")
+    with col2:
+        if st.button("🔄 Refresh Now"):
+            store.refresh_now(selected)
+            get_watchlist_scheduler().run_once()
+            st.success(f"Queued a refresh of {selected}")
+    with col3:
+        if st.button("🗑️ Stop Watching"):
+            store.remove(selected)
+            st.rerun()
+    
+    st.markdown("### 📰 Change Feed")
+    only_selected = st.checkbox("Only the selected company")
+    fields = st.multiselect(
+        "Fields",
+        list(WATCHED_FIELDS),
+        format_func=lambda field: field.replace('_', ' ').title()
+    )
+    render_change_feed(selected if only_selected else None, fields or None)
+
+def render_known_domains():
+    """Bulk-load known company URLs into the discovery index, so analyses skip web search."""
+    index = get_discovery_index()
+    with st.sidebar.expander("🌐 Known Domains"):
+        stats = index.stats()
+        st.caption(f"{stats['companies']:,} companies with known URLs")
+        domains_file = st.file_uploader(
+            "Known Domains CSV",
+            type=['csv'],
+            help="Columns: company, website (or domain/url), optional crunchbase, linkedin, "
+                 "techcrunch and confidence",
+            key='known_domains_file'
+        )
+        if domains_file is not None and st.button("📥 Load Domains"):
+            try:
+                loaded = index.load_csv(domains_file)
+            except ValueError as e:
+                st.error(f"❌ {e}")
+            else:
+                st.success(f"✅ Loaded {loaded:,} URLs")
+
+def render_source_limits(max_workers):
+    """Let operators set per-source concurrency, and say when it caps the batch's workers."""
+    with st.sidebar.expander("🚦 Per-Source Limits"):
+        limits = {
+            source: st.number_input(
+                source.title(),
+                min_value=1,
+                max_value=64,
+                value=default,
+                step=1,
+                key=f"source_limit_{source}",
+                help=f"Most concurrent requests to {source} across this batch's workers"
+            )
+            for source, default in DEFAULT_SOURCE_LIMITS.items()
+        }
+    source, limit = tightest_limit(limits, limits)
+    if limit < max_workers:
+        st.sidebar.caption(
+            f"⚠️ Only {limit} of {max_workers} workers can run at once: every company needs a "
+            f"{source} slot. Raise the {source.title()} limit under Per-Source Limits to use more."
+        )
+    return limits
+
+def render_diagnostics():
+    """Show per-stage latency, fetch volume and cache counters from the shared metrics registry."""
+    metrics = get_metrics()
+    with st.sidebar.expander("🩺 Diagnostics"):
+        stages = metrics.histograms('leadgen_stage_seconds')
+        if not stages:
+            st.caption("No analyses timed yet")
+        else:
+            rows = pd.DataFrame(stages)[['stage', 'source', 'count', 'mean', 'p95']]
+            st.dataframe(
+                rows.sort_values('p95', ascending=False).round(3),
+                use_container_width=True,
+                hide_index=True
+            )
+        counters = metrics.counters()
+        if counters:
+            totals = pd.DataFrame(counters).groupby('metric')['value'].sum()
+            pages = totals.get('leadgen_parsed_pages_total', 0)
+            parse_seconds = totals.get('leadgen_parse_cpu_seconds_total', 0)
+            if pages and parse_seconds:
+                st.caption(f"Parsing: {pages / parse_seconds:,.0f} pages/sec per core over {int(pages):,} pages")
+            st.dataframe(pd.DataFrame(counters), use_container_width=True, hide_index=True)
+        st.download_button(
+            label="📥 Prometheus Metrics",
+            data=metrics.render_prometheus,
+            file_name="leadgen_metrics.prom",
+            mime="text/plain"
+        )
+
+def render_profile_store():
+    """Show the shared profile store's footprint and let operators change its memory cap."""
+    store = get_profile_store()
+    stats = store.stats()
+    with st.sidebar.expander("🗄️ Profile Store"):
+        st.metric("Profiles Held", f"{stats['profiles']:,}")
+        st.progress(
+            min(1.0, stats['nbytes'] / stats['max_bytes']) if stats['max_bytes'] else 0.0,
+            text=f"{stats['nbytes'] / 2**20:,.1f} / {stats['max_bytes'] / 2**20:,.0f} MB in memory"
+        )
+        st.caption(
+            f"{stats['spilled']:,} spilled to disk · {stats['interned_values']:,} interned values"
+        )
+        cap = st.number_input(
+            "Memory Cap (MB)",
+            min_value=16,
+            max_value=16384,
+            value=max(16, int(stats['max_bytes'] / 2**20)),
+            step=16,
+            help="Above this, the bulkiest profile data is moved to a local file and read back on demand"
+        )
+        if cap * 2**20 != stats['max_bytes']:
+            store.set_max_bytes(cap * 2**20)
 
 def main():
     """Main application function."""
     
-    if 'lead_gen' not in st.session_state:
-        st.session_state.lead_gen = LeadGenAI()
-    
     create_header()
     
     st.sidebar.markdown("## 🎯 Analysis Options")
     
     analysis_type = st.sidebar.selectbox(
         "Analysis Type",
-        ["Single Company", "Batch Analysis"],
+        ["Single Company", "Batch Analysis", "Compare Companies", "Watchlist"],
         help="Choose between analyzing a single company or multiple companies"
     )
+    get_watchlist_scheduler()
     
     if analysis_type == "Single Company":
         st.sidebar.markdown("### 📋 Company Information")
@@ -464,85 +994,82 @@ def main():
             help="Maximum number of retry attempts for web requests"
         )
         
-        delay_range = st.sidebar.slider(
-            "Delay Range (seconds)",
-            min_value=0.5,
-            max_value=5.0,
-            value=(1.0, 3.0),
-            step=0.5,
-            help="Range of delays between requests to avoid rate limiting"
+        use_source_pipeline = st.sidebar.checkbox(
+            "Concurrent Fetch Layer",
+            value=False,
+            help="Fetch all sources in parallel instead of the sequential LeadGenAI scraper"
         )
         
-        st.session_state.lead_gen.max_retries = max_retries
-        st.session_state.lead_gen.delay_range = delay_range
+        force_refresh = st.sidebar.checkbox(
+            "Bypass Cache",
+            value=False,
+            help="Re-scrape even if a fresh cached profile exists"
+        )
         
         st.sidebar.markdown("### 📤 Export Options")
         
         export_format = st.sidebar.selectbox(
             "Export Format",
-            ["JSON", "Markdown", "Text"],
+            EXPORT_FORMATS,
             help="Choose the format for exporting results"
         )
         
         if company_name:
             if st.button("🚀 Analyze Company", type="primary"):
-                with st.spinner("🔍 Analyzing company data..."):
-                    try:
-                        progress_bar = st.progress(0)
-                        status_text = st.empty()
-                        
-                        for i in range(100):
-                            time.sleep(0.01)
-                            progress_bar.progress(i + 1)
-                            if i < 30:
-                                status_text.text("🔍 Searching for company information...")
-                            elif i < 60:
-                                status_text.text("📊 Extracting company data...")
-                            elif i < 90:
-                                status_text.text("📈 Analyzing investment potential...")
-                            else:
-                                status_text.text("✅ Analysis complete!")
-                        
-                        profile = st.session_state.lead_gen.extract_company_profile(company_name)
-                        
-                        st.session_state.current_profile = profile
-                        
-                        progress_bar.empty()
-                        status_text.empty()
-                        
-                        st.success(f"✅ Analysis completed for {company_name}!")
-                        
-                    except Exception as e:
-                        st.error(f"❌ Error during analysis: {str(e)}")
-                        st.session_state.current_profile = None
+                submit_analysis(company_name, force_refresh, use_source_pipeline, max_retries)
+            
+            if st.session_state.get('analysis_job'):
+                poll_analysis_job()
+            notice = st.session_state.pop('analysis_notice', None)
+            if notice:
+                kind, message = notice
+                (st.success if kind == 'success' else st.error)(message)
+                if kind == 'error':
+                    st.session_state.current_profile = None
             
             if 'current_profile' in st.session_state and st.session_state.current_profile:
-                display_company_profile(st.session_state.current_profile)
+                if st.session_state.get('stage_timings'):
+                    with st.expander(f"⏱️ Stage Timings ({st.session_state.analysis_seconds:.2f}s total)"):
+                        st.dataframe(pd.DataFrame(st.session_state.stage_timings), use_container_width=True)
+                
+                watch_name = st.session_state.current_profile.get('company_name')
+                if watch_name and st.button("👁️ Watch This Company"):
+                    get_watchlist().add(str(watch_name))
+                    st.success(f"✅ {watch_name} is refreshed daily; changes appear under Watchlist")
+                
+                if use_source_pipeline and st.session_state.current_profile.get('_sources'):
+                    if st.button("🔄 Refresh Stale Sources"):
+                        submit_refresh(st.session_state.current_profile, max_retries)
+                        st.rerun()
+                    
+                    if st.session_state.get('profile_changes') is not None:
+                        changes = st.session_state.profile_changes
+                        with st.expander(f"🔄 {len(changes)} field(s) changed on last refresh"):
+                            if changes:
+                                st.dataframe(pd.DataFrame([
+                                    {
+                                        'Field': change['field'],
+                                        'Old': str(change['old']),
+                                        'New': str(change['new']),
+                                        'Sources': ', '.join(change['sources']),
+                                    }
+                                    for change in changes
+                                ]), use_container_width=True)
+                            else:
+                                st.info("No fields changed")
                 
-                if st.button("📥 Export Results"):
-                    if export_format == "JSON":
-                        st.download_button(
-                            label="Download JSON",
-                            data=json.dumps(st.session_state.current_profile, indent=2),
-                            file_name=f"{company_name}_analysis.json",
-                            mime="application/json"
-                        )
-                    elif export_format == "Markdown":
-                        report = st.session_state.lead_gen.generate_lead_report(company_name, "markdown")
-                        st.download_button(
-                            label="Download Markdown",
-                            data=report,
-                            file_name=f"{company_name}_analysis.md",
-                            mime="text/markdown"
-                        )
-                    else:
-                        report = st.session_state.lead_gen.generate_lead_report(company_name, "text")
-                        st.download_button(
-                            label="Download Text",
-                            data=report,
-                            file_name=f"{company_name}_analysis.txt",
-                            mime="text/plain"
-                        )
+                display_company_profile(
+                    st.session_state.current_profile, st.session_state.get('profile_digest')
+                )
+                
+                profile = st.session_state.current_profile
+                file_name, mime = report_file_info(company_name, export_format)
+                st.download_button(
+                    label=f"📥 Download {export_format}",
+                    data=functools.partial(render_report, profile, export_format),
+                    file_name=file_name,
+                    mime=mime
+                )
         
         else:
             st.markdown("""
@@ -580,7 +1107,7 @@ def main():
                 </div>
                 """, unsafe_allow_html=True)
     
-    else:
+    elif analysis_type == "Batch Analysis":
         st.sidebar.markdown("### 📁 Batch Upload")
         
         uploaded_file = st.sidebar.file_uploader(
@@ -589,9 +1116,68 @@ def main():
             help="Upload a file with company names (one per line)"
         )
         
+        st.sidebar.markdown("### ⚙️ Batch Settings")
+        
+        max_workers = st.sidebar.slider(
+            "Concurrent Workers",
+            min_value=1,
+            max_value=32,
+            value=8,
+            help="Most companies of this batch queued or running at once on the shared worker pool"
+        )
+        source_limits = render_source_limits(max_workers)
+        
+        sink_format = st.sidebar.selectbox(
+            "Result Format",
+            [fmt.upper() for fmt in available_formats()],
+            help="File format batch results are streamed into"
+        )
+        
+        render_known_domains()
+        
+        unfinished = get_job_store().list_jobs(unfinished_only=True)
+        resume_job = None
+        if unfinished:
+            st.sidebar.markdown("### ⏯️ Resume Job")
+            resume_job = st.sidebar.selectbox(
+                "Unfinished Jobs",
+                unfinished,
+                format_func=lambda job: f"{job['name']} · {job['total']} companies · {job['job_id']}",
+                help="Jobs are checkpointed per company; resuming skips finished ones"
+            )
+            if st.sidebar.button("▶️ Resume Job"):
+                submit_batch_job(resume_job['job_id'], max_workers, source_limits)
+        
         if uploaded_file is not None:
             if st.button("🚀 Analyze Batch", type="primary"):
-                st.info("Batch analysis feature coming soon!")
+                job_id = start_batch_job(uploaded_file, sink_format.lower())
+                if job_id:
+                    submit_batch_job(job_id, max_workers, source_limits)
+        
+        if st.session_state.get('batch_run'):
+            poll_batch_job()
+        notice = st.session_state.pop('batch_notice', None)
+        if notice:
+            st.info(notice)
+        
+        job_id = st.session_state.get('batch_job_id')
+        if job_id:
+            render_job_status(job_id)
+        results_path = st.session_state.get('batch_results_path')
+        if results_path and os.path.exists(results_path):
+            show_batch_results(results_path)
+    
+    elif analysis_type == "Compare Companies":
+        render_comparison()
+    
+    else:
+        render_watchlist()
+    
+    render_queue_stats()
+    render_cache_stats()
+    render_rate_limits()
+    render_diagnostics()
+    render_profile_store()
     
     st.markdown("---")
     st.markdown("""
@@ -0,0 +1,359 @@
+"""
+LEADGen AI - Watchlist
+Companies refreshed on a schedule, with field-level change detection and a change feed.
+"""
+
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from leadgen_cache import DAY, default_cache_dir, get_profile_cache, normalize_company_name
+from leadgen_incremental import SOURCES_KEY, diff_profiles
+
+HOUR = 60 * 60
+
+DEFAULT_INTERVAL = DAY
+
+INTERVALS = {
+    'Every 6 hours': 6 * HOUR,
+    'Every 12 hours': 12 * HOUR,
+    'Daily': DAY,
+    'Weekly': 7 * DAY,
+}
+
+WATCHED_FIELDS = ('funding_rounds', 'growth_signals', 'valuation', 'team_size',
+                  'total_funding_raised', 'revenue_est')
+
+TICK_SECONDS = 30.0
+
+CATCH_UP_FACTOR = 2.0
+
+QUEUE_OWNER = 'watchlist'
+
+_GOLDEN = (math.sqrt(5) - 1) / 2
+
+Watched = namedtuple(
+    'Watched', 'company_name interval next_due last_refreshed last_status last_error changes'
+)
+
+Change = namedtuple('Change', 'company_name field kind old new detected_at')
+
+def _phase(slot, interval):
+    """Offset within ``interval`` for the ``slot``-th company (golden-ratio sequence).
+
+    Consecutive slots land in the largest remaining gaps, so companies
+    sharing an interval are spread almost evenly over it however many
+    there are.
+    """
+    return (slot * _GOLDEN) % 1.0 * interval
+
+def next_slot(phase, interval, now):
+    """First time after ``now`` that is ``phase`` past a multiple of ``interval``."""
+    return (math.floor((now - phase) / interval) + 1) * interval + phase
+
+def _signals(value):
+    if isinstance(value, str):
+        return [] if value == 'N/A' else [s.strip() for s in value.split(',') if s.strip()]
+    return list(value or [])
+
+def _round_key(round_data):
+    return (round_data.get('type'), round_data.get('amount'))
+
+def watch_changes(old, new):
+    """Changes worth an alert between two profiles, as (field, kind, old, new) tuples.
+
+    New ``funding_rounds`` entries are reported one by one ('new_round'),
+    ``growth_signals`` as added/removed signals, and other watched fields
+    as plain value changes. Nothing is reported without an earlier profile.
+    """
+    if not old:
+        return []
+    changes = []
+    for change in diff_profiles(old, new):
+        field = change['field']
+        if field not in WATCHED_FIELDS:
+            continue
+        if field == 'funding_rounds':
+            known = {_round_key(r) for r in change['old'] or [] if isinstance(r, dict)}
+            for round_data in change['new'] or []:
+                if isinstance(round_data, dict) and _round_key(round_data) not in known:
+                    changes.append((field, 'new_round', None, round_data))
+        elif field == 'growth_signals':
+            before, after = _signals(change['old']), _signals(change['new'])
+            added = [s for s in after if s not in before]
+            removed = [s for s in before if s not in after]
+            if added or removed:
+                changes.append((field, 'signals', removed, added))
+        else:
+            changes.append((field, 'changed', change['old'], change['new']))
+    return changes
+
+def describe_change(change):
+    """One-line feed text for a Change."""
+    label = change.field.replace('_', ' ').capitalize()
+    if change.kind == 'new_round':
+        round_data = change.new or {}
+        date = f" ({round_data['date']})" if round_data.get('date') else ''
+        return f"New {round_data.get('type', 'funding')} round: {round_data.get('amount', 'N/A')}{date}"
+    if change.kind == 'signals':
+        parts = [f"+{s}" for s in change.new or []] + [f"-{s}" for s in change.old or []]
+        return f"{label}: {', '.join(parts)}"
+    return f"{label}: {change.old if change.old is not None else 'N/A'} → {change.new}"
+
+class WatchlistStore:
+    """SQLite store of watched companies and the changes their refreshes found.
+
+    Each company gets a fixed phase within its refresh interval
+    (``_phase()``), so refreshes of a large watchlist are spread evenly
+    over time rather than all falling due together.
+    """
+
+    def __init__(self, path=None):
+        if path is None:
+            path = os.path.join(default_cache_dir(), 'watchlist.sqlite')
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS watched (
+                slot INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT NOT NULL UNIQUE,
+                company_name TEXT NOT NULL,
+                interval REAL NOT NULL,
+                phase REAL NOT NULL,
+                next_due REAL NOT NULL,
+                last_refreshed REAL,
+                last_status TEXT,
+                last_error TEXT,
+                added_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS watched_next_due ON watched (next_due);
+            CREATE TABLE IF NOT EXISTS changes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT NOT NULL,
+                company_name TEXT NOT NULL,
+                field TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                old TEXT,
+                new TEXT,
+                detected_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS changes_detected_at ON changes (detected_at);
+        """)
+        self._conn.commit()
+
+    def add(self, company_name, interval=DEFAULT_INTERVAL, now=None):
+        """Watch a company (or change its interval); the first refresh falls in its slot."""
+        now = time.time() if now is None else now
+        key = normalize_company_name(company_name)
+        with self._lock:
+            row = self._conn.execute('SELECT slot FROM watched WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                cursor = self._conn.execute(
+                    'INSERT INTO watched (key, company_name, interval, phase, next_due, added_at) '
+                    'VALUES (?, ?, ?, 0, 0, ?)', (key, company_name, interval, now)
+                )
+                slot = cursor.lastrowid
+            else:
+                slot = row[0]
+            phase = _phase(slot, interval)
+            self._conn.execute(
+                'UPDATE watched SET company_name = ?, interval = ?, phase = ?, next_due = ? WHERE key = ?',
+                (company_name, interval, phase, next_slot(phase, interval, now), key)
+            )
+            self._conn.commit()
+
+    def remove(self, company_name):
+        with self._lock:
+            self._conn.execute('DELETE FROM watched WHERE key = ?', (normalize_company_name(company_name),))
+            self._conn.commit()
+
+    def list(self):
+        """Return every watched company, soonest refresh first, with its change count."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT w.company_name, w.interval, w.next_due, w.last_refreshed, w.last_status, '
+                'w.last_error, (SELECT COUNT(*) FROM changes c WHERE c.key = w.key) '
+                'FROM watched w ORDER BY w.next_due'
+            ).fetchall()
+        return [Watched(*row) for row in rows]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM watched').fetchone()[0]
+
+    def refresh_rate(self):
+        """Average refreshes per second the whole watchlist needs."""
+        with self._lock:
+            (rate,) = self._conn.execute('SELECT COALESCE(SUM(1.0 / interval), 0) FROM watched').fetchone()
+        return rate
+
+    def claim_due(self, now=None, limit=None):
+        """Return up to ``limit`` due company names and move each to its next slot."""
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT key, company_name, interval, phase FROM watched WHERE next_due <= ? '
+                'ORDER BY next_due LIMIT ?', (now, -1 if limit is None else limit)
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE watched SET next_due = ?, last_status = 'queued' WHERE key = ?",
+                [(next_slot(phase, interval, now), key) for key, _, interval, phase in rows]
+            )
+            self._conn.commit()
+        return [company_name for _, company_name, _, _ in rows]
+
+    def refresh_now(self, company_name, now=None):
+        """Make a company due immediately; its regular slot resumes afterwards."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._conn.execute(
+                'UPDATE watched SET next_due = ? WHERE key = ?', (now, normalize_company_name(company_name))
+            )
+            self._conn.commit()
+
+    def mark_refreshed(self, company_name, status, error=None, changes=(), now=None):
+        """Record a refresh outcome and the (field, kind, old, new) changes it found."""
+        now = time.time() if now is None else now
+        key = normalize_company_name(company_name)
+        with self._lock:
+            self._conn.execute(
+                'UPDATE watched SET last_refreshed = ?, last_status = ?, last_error = ? WHERE key = ?',
+                (now, status, error, key)
+            )
+            self._conn.executemany(
+                'INSERT INTO changes (key, company_name, field, kind, old, new, detected_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(key, company_name, field, kind, json.dumps(old, default=str),
+                  json.dumps(new, default=str), now) for field, kind, old, new in changes]
+            )
+            self._conn.commit()
+
+    def feed(self, limit=100, company_name=None, fields=None, since=None):
+        """Return the newest Changes, optionally for one company, some fields or after ``since``."""
+        query = 'SELECT company_name, field, kind, old, new, detected_at FROM changes WHERE 1 = 1'
+        params = []
+        if company_name:
+            query += ' AND key = ?'
+            params.append(normalize_company_name(company_name))
+        if fields:
+            query += f" AND field IN ({', '.join('?' * len(fields))})"
+            params += list(fields)
+        if since is not None:
+            query += ' AND detected_at > ?'
+            params.append(since)
+        query += ' ORDER BY detected_at DESC, id DESC LIMIT ?'
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            Change(name, field, kind, json.loads(old), json.loads(new), detected_at)
+            for name, field, kind, old, new, detected_at in rows
+        ]
+
+def refresh_watched(extractor, company_name, progress=None, cache=None):
+    """Refresh one company against its last stored profile; returns (profile, changes).
+
+    Every source is revalidated, including those still within their TTL:
+    the watch interval, not the source TTL, decides how often a watched
+    company is checked. A stored profile is refreshed by the extractor
+    that produced it: the source pipeline when it carries ``_sources``,
+    ``LeadGenAI`` otherwise, so the two kinds are never diffed against
+    each other. ``extractor`` itself is left untouched, since queue
+    workers share it across jobs.
+    """
+    cache = cache if cache is not None else get_profile_cache()
+    previous = cache.peek(company_name)
+    if previous and previous.get(SOURCES_KEY):
+        profile, _ = extractor.refresh_company_profile(previous, progress=progress, revalidate=True)
+    else:
+        profile = extractor.extract_company_profile(
+            company_name, refresh=True, progress=progress, pipeline=False if previous else None
+        )
+    return profile, watch_changes(previous, profile)
+
+class WatchlistScheduler:
+    """Submit due watchlist refreshes to the shared analysis queue.
+
+    Every ``tick`` seconds it claims the companies whose slot has passed.
+    At most ``CATCH_UP_FACTOR`` times the watchlist's average refresh rate
+    is claimed per tick, so a backlog (after downtime, or many companies
+    added at once) drains gradually instead of as one burst. Refreshes run
+    under their own queue owner, so round-robin scheduling keeps them from
+    delaying analysts' own lookups.
+    """
+
+    def __init__(self, store, queue, tick=TICK_SECONDS):
+        self.store = store
+        self.queue = queue
+        self.tick = tick
+        self._thread = None
+        self._stop = threading.Event()
+
+    def _task(self, company_name):
+        def task(extractor, progress):
+            try:
+                _, changes = refresh_watched(extractor, company_name, progress)
+            except Exception as e:
+                self.store.mark_refreshed(company_name, 'failed', str(e))
+                raise
+            self.store.mark_refreshed(company_name, 'done', changes=changes)
+            return changes
+        return task
+
+    def run_once(self, now=None):
+        """Claim and queue the companies due now; returns how many were queued."""
+        limit = max(1, math.ceil(self.store.refresh_rate() * self.tick * CATCH_UP_FACTOR))
+        due = self.store.claim_due(now, limit)
+        for company_name in due:
+            self.queue.submit(
+                QUEUE_OWNER, ('watch', normalize_company_name(company_name)),
+                self._task(company_name), label=company_name, keep_result=False
+            )
+        return len(due)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except sqlite3.Error:
+                pass
+            self._stop.wait(self.tick)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='leadgen-watchlist', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+_shared_store = None
+_shared_scheduler = None
+_shared_lock = threading.Lock()
+
+def get_watchlist():
+    """Return the process-wide watchlist store."""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = WatchlistStore()
+        return _shared_store
+
+def get_watchlist_scheduler():
+    """Return the process-wide scheduler, started on first use."""
+    global _shared_scheduler
+    store = get_watchlist()
+    with _shared_lock:
+        if _shared_scheduler is None:
+            from leadgen_queue import get_analysis_queue
+            _shared_scheduler = WatchlistScheduler(store, get_analysis_queue()).start()
+        return _shared_scheduler
@@ -0,0 +1,13 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep every on-disk cache of a test under its own temporary directory."""
+    path = tmp_path / 'cache'
+    monkeypatch.setenv('LEADGEN_CACHE_DIR', str(path))
+    return path
@@ -0,0 +1,63 @@
+import threading
+import time
+
+import pytest
+
+from leadgen_batch import (
+    DEFAULT_SOURCE_LIMITS, BatchRunner, SourceLimiter, parse_source_limits, tightest_limit,
+)
+
+class Extractor:
+    """Stand-in for LeadGenAI that records how many extractions overlap."""
+
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def extract_company_profile(self, company_name):
+        with Extractor.lock:
+            Extractor.running += 1
+            Extractor.peak = max(Extractor.peak, Extractor.running)
+        time.sleep(0.02)
+        with Extractor.lock:
+            Extractor.running -= 1
+        return {'company_name': company_name}
+
+@pytest.fixture
+def extractor(monkeypatch):
+    monkeypatch.setattr(Extractor, 'peak', 0)
+    return Extractor
+
+def test_parse_source_limits():
+    assert parse_source_limits('google=4, LinkedIn=3') == {'google': 4, 'linkedin': 3}
+    assert parse_source_limits('') == {}
+    assert parse_source_limits(None) == {}
+
+@pytest.mark.parametrize('text', ['google', 'google=0', 'google=x', '=4'])
+def test_parse_source_limits_rejects_bad_pairs(text):
+    with pytest.raises(ValueError):
+        parse_source_limits(text)
+
+def test_tightest_limit():
+    assert tightest_limit(DEFAULT_SOURCE_LIMITS, ['crunchbase', 'techcrunch']) == ('crunchbase', 4)
+    assert tightest_limit(DEFAULT_SOURCE_LIMITS, ['other']) is None
+
+def test_source_slots_cap_workers_and_say_which_source(extractor):
+    runner = BatchRunner(extractor, max_workers=16, sources=DEFAULT_SOURCE_LIMITS.keys())
+    assert runner.max_in_flight == 2
+    assert runner.limiting_source == 'google'
+    events = list(runner.run([f'Company {i}' for i in range(12)]))
+    assert sum(event.status == 'done' for event in events) == 12
+    assert extractor.peak <= 2
+
+def test_raised_limits_let_more_workers_run(extractor):
+    limiter = SourceLimiter(parse_source_limits('google=8,linkedin=8,crunchbase=8,techcrunch=8'))
+    runner = BatchRunner(extractor, max_workers=8, source_limiter=limiter, sources=DEFAULT_SOURCE_LIMITS.keys())
+    assert runner.limiting_source is None
+    list(runner.run([f'Company {i}' for i in range(24)]))
+    assert 2 < extractor.peak <= 8
+
+def test_runs_without_sources_are_not_capped(extractor):
+    runner = BatchRunner(extractor, max_workers=16)
+    assert runner.limiting_source is None
+    assert runner.max_in_flight == 32
@@ -0,0 +1,27 @@
+import pytest
+
+pytest.importorskip('plotly')
+
+from leadgen_charts import create_funding_timeline, create_growth_signals_chart, create_investment_score_gauge
+
+def test_gauge_shows_the_score():
+    assert create_investment_score_gauge(72).data[0].value == 72
+
+def test_growth_signals_chart_counts_each_signal():
+    fig = create_growth_signals_chart('Hiring, Funding')
+    assert list(fig.data[0].x) == ['Hiring', 'Funding']
+    assert create_growth_signals_chart('N/A') is None
+
+def test_dated_rounds_go_on_a_date_axis_with_cumulative_funding():
+    fig = create_funding_timeline([
+        {'type': 'Series A', 'amount': '$15M', 'date': '2021'},
+        {'type': 'Seed', 'amount': '$2M', 'date': '2019-05'},
+    ])
+    rounds, cumulative = fig.data
+    assert list(rounds.y) == ['Seed', 'Series A']
+    assert list(cumulative.y) == [2e6, 17e6]
+
+def test_undated_rounds_keep_disclosure_order():
+    fig = create_funding_timeline([{'type': 'Seed', 'amount': '$2M'}, {'type': 'Bridge', 'amount': '€1M'}])
+    assert 'undated' in fig.layout.title.text
+    assert create_funding_timeline([]) is None
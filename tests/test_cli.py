@@ -0,0 +1,101 @@
+import io
+
+import pytest
+
+import leadgen_cli
+import leadgen_jobs
+from leadgen_cli import build_parser, main, run
+from leadgen_jobs import JobStore
+from leadgen_sink import read_page
+
+class Extractor:
+    """Stand-in for LeadGenService that fails for the names in ``failing``."""
+
+    failing = set()
+
+    def extract_company_profile(self, company_name):
+        if company_name in self.failing:
+            raise RuntimeError(f'no data for {company_name}')
+        return {'company_name': company_name, 'industry': 'AI', 'valuation': '$50M'}
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = JobStore(str(tmp_path / 'jobs.sqlite'))
+    monkeypatch.setattr(leadgen_jobs, '_shared_store', store)
+    monkeypatch.setattr(Extractor, 'failing', set())
+    pipelines = []
+
+    def factory(use_source_pipeline):
+        pipelines.append(use_source_pipeline)
+        return Extractor
+    monkeypatch.setattr(leadgen_cli, '_factory', factory)
+    store.pipelines = pipelines
+    return store
+
+@pytest.fixture
+def companies(tmp_path):
+    path = tmp_path / 'companies.txt'
+    path.write_text('Acme\n# comment\nGlobex\n\nInitech\n', encoding='utf-8')
+    return str(path)
+
+def invoke(*argv):
+    out, err = io.StringIO(), io.StringIO()
+    status = run(build_parser().parse_args(argv), out, err)
+    return status, out.getvalue(), err.getvalue()
+
+def test_run_writes_results_and_reports(tmp_path, store, companies):
+    output = str(tmp_path / 'results.jsonl')
+    reports = tmp_path / 'reports'
+    status, out, err = invoke(companies, '-o', output, '--no-resolve', '--pipeline',
+                              '--reports', str(reports), '--report-format', 'json')
+    assert status == 0
+    assert [row['company_name'] for row in read_page(output)] == ['Acme', 'Globex', 'Initech']
+    assert sorted(p.suffix for p in reports.iterdir()) == ['.json'] * 3
+    assert out.startswith('3 done, 0 failed') and out.rstrip().endswith(output)
+    assert '3 of 3 companies to analyze' in err
+    assert store.pipelines == [True]
+    assert store.list_jobs(unfinished_only=True) == []
+
+def test_failures_set_the_exit_status(tmp_path, store, companies):
+    Extractor.failing = {'Globex'}
+    status, out, err = invoke(companies, '-o', str(tmp_path / 'results.csv'), '--no-resolve', '-q')
+    assert status == 1
+    assert out.startswith('2 done, 1 failed')
+    assert err == ''
+    assert store.pipelines == [False]
+
+def test_source_limits_that_cap_workers_are_reported(tmp_path, store, companies):
+    status, _, err = invoke(companies, '-o', str(tmp_path / 'results.csv'), '--no-resolve',
+                            '-w', '8', '--source-limits', 'google=3')
+    assert status == 0
+    assert 'only 2 of 8 workers can run at once' in err
+    assert '--source-limits allows linkedin=2' in err
+
+def test_metrics_file_is_written(tmp_path, store, companies):
+    metrics = tmp_path / 'metrics.prom'
+    invoke(companies, '-o', str(tmp_path / 'results.csv'), '--no-resolve', '-q',
+           '--metrics-file', str(metrics))
+    assert metrics.read_text(encoding='utf-8').startswith('#')
+
+@pytest.mark.parametrize('argv, message', [
+    (['--source-limits', 'google=x'], '--source-limits'),
+    (['--resume', 'missing'], 'unknown job missing'),
+    ([], 'is required'),
+])
+def test_usage_errors_exit_with_2(store, argv, message):
+    status, _, err = invoke(*argv)
+    assert status == 2
+    assert message in err
+
+def test_list_jobs_shows_unfinished_jobs(tmp_path, store):
+    job_id = store.create_job('companies.txt', ['Acme', 'Globex'], 'csv', str(tmp_path / 'r.csv'))
+    status, out, _ = invoke('--list-jobs')
+    assert status == 0
+    assert out.startswith(f'{job_id}\tcompanies.txt\t2/2 pending')
+    status, out, _ = invoke('--resume', job_id, '--no-resolve', '-q')
+    assert status == 0
+    assert invoke('--list-jobs')[1] == ''
+
+def test_main_rejects_zero_workers(companies):
+    with pytest.raises(SystemExit):
+        main([companies, '-w', '0'])
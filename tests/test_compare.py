@@ -0,0 +1,90 @@
+import pandas as pd
+import pytest
+
+from leadgen_compare import ComparisonTable
+from leadgen_money import USD_RATES
+from leadgen_sink import ResultSink
+
+def lead(name, industry='AI', score=50, funding='$5M', valuation='N/A', team='11-50', **fields):
+    return dict({
+        'company_name': name,
+        'industry': industry,
+        'investment_score': {'total': score},
+        'total_funding_raised': funding,
+        'valuation': valuation,
+        'team_size': team,
+    }, **fields)
+
+@pytest.fixture
+def table():
+    return ComparisonTable.from_profiles([
+        lead('Acme', score=80, funding='€10M', valuation='$50M', founded_year=2019,
+             funding_rounds=[{'type': 'Seed', 'amount': '$2M', 'date': '2019-03'},
+                             {'type': 'Series A', 'amount': '$8M', 'date': '2021'}]),
+        lead('Globex', industry='Fintech', score=60, team='200+', founded_year='N/A'),
+        lead('Initech', industry='Fintech', score=70, funding='N/A', why_invest='Investment score: 10/100'),
+        lead('Umbrella', score=40, funding='$1B'),
+    ])
+
+def test_ingestion_parses_numeric_columns_once(table):
+    frame = table.frame
+    acme = frame.iloc[0]
+    assert acme['funding_usd'] == pytest.approx(10e6 * USD_RATES['EUR'])
+    assert acme['funding_currency'] == 'EUR'
+    assert acme['valuation_usd'] == 50e6
+    assert acme['employees'] == 30.5
+    assert frame['employees'].tolist()[1] == 200
+    assert frame['investment_score'].tolist() == [80, 60, 70, 40]
+    assert pd.isna(frame.iloc[1]['founded_year'])
+    assert table.industries == ['AI', 'Fintech']
+
+def test_filter_combines_conditions(table):
+    assert table.filter(industries=['Fintech'])['company_name'].tolist() == ['Globex', 'Initech']
+    assert table.filter(min_score=60, max_score=75)['company_name'].tolist() == ['Globex', 'Initech']
+    assert table.filter(search='CME')['company_name'].tolist() == ['Acme']
+    ranged = table.filter(ranges={'funding_usd': (4e6, 20e6)})
+    assert ranged['company_name'].tolist() == ['Acme', 'Globex']
+
+def test_pages_sort_missing_values_last(table):
+    ordered = ComparisonTable.page(table.frame, sort_by='funding_usd', page_size=3)
+    assert ordered['company_name'].tolist() == ['Umbrella', 'Acme', 'Globex']
+    last = ComparisonTable.page(table.frame, sort_by='funding_usd', page=1, page_size=3)
+    assert last['company_name'].tolist() == ['Initech']
+    assert ComparisonTable.page(table.frame, 'funding_usd', ascending=True)['company_name'].tolist()[-1] == 'Initech'
+
+def test_aggregates_per_industry(table):
+    groups = ComparisonTable.aggregates(table.frame).set_index('industry')
+    assert groups.loc['AI', 'companies'] == 2
+    assert groups.loc['AI', 'mean_score'] == 60
+    assert groups.loc['Fintech', 'median_funding_usd'] == 5e6
+
+def test_histogram_bins_server_side(table):
+    bins = ComparisonTable.histogram(table.frame, 'investment_score', bins=4)
+    assert bins['companies'].sum() == 4
+    assert bins['low'].iloc[0] == 40 and bins['high'].iloc[-1] == 80
+    assert ComparisonTable.histogram(table.frame.iloc[:0], 'investment_score').empty
+
+def test_plot_points_keep_both_extremes():
+    table = ComparisonTable.from_profiles([lead(f'Company {i}', score=i, funding=f'${i + 1}M') for i in range(100)])
+    points = ComparisonTable.plot_points(table.frame, ['investment_score', 'funding_usd'], max_points=10)
+    assert len(points) == 10
+    assert {0, 99} <= set(points['investment_score'])
+
+def test_funding_by_year_covers_only_the_given_rows(table):
+    assert table.funding_by_year(table.frame).to_dict('list') == {
+        'year': [2019, 2021], 'rounds': [1, 1], 'amount': [2e6, 8e6],
+    }
+    assert table.funding_by_year(table.frame.iloc[1:]).empty
+
+@pytest.mark.parametrize('fmt', ['csv', 'jsonl'])
+def test_from_results_matches_from_profiles(tmp_path, fmt):
+    path = str(tmp_path / f'results.{fmt}')
+    profiles = [lead('Acme', score=80, funding='€10M'), lead('Globex', score=60)]
+    with ResultSink(path, fmt) as sink:
+        for i, profile in enumerate(profiles):
+            sink.write(profile, i)
+    loaded = ComparisonTable.from_results(path)
+    assert len(loaded) == 2
+    expected = ComparisonTable.from_profiles(profiles).frame
+    for column in ('investment_score', 'funding_usd', 'employees'):
+        assert loaded.frame[column].tolist() == expected[column].tolist()
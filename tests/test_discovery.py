@@ -0,0 +1,67 @@
+import io
+
+import pytest
+
+from leadgen_cache import DAY
+from leadgen_discovery import DiscoveryIndex
+
+@pytest.fixture
+def index(tmp_path):
+    return DiscoveryIndex(str(tmp_path / 'discovery.sqlite'))
+
+def test_lookup_matches_name_variants(index):
+    index.record('Acme Robotics, Inc.', 'website', 'https://acme.example')
+    found = index.lookup('acme robotics')
+    assert (found.url, found.confidence, found.origin) == ('https://acme.example', 0.8, 'search')
+    assert index.lookup('Acme Robotics', 'crunchbase') is None
+
+def test_old_or_unsure_entries_are_misses(index):
+    index.record('Acme', 'website', 'https://old.example', verified_at=0)
+    index.record('Globex', 'website', 'https://maybe.example', confidence=0.3)
+    assert index.lookup('Acme') is None
+    assert index.lookup('Globex') is None
+    assert DiscoveryIndex(index.path, max_age=float('inf')).lookup('Acme') is not None
+
+def test_search_results_do_not_replace_curated_urls(index):
+    index.record('Acme', 'website', 'https://acme.example', origin='csv')
+    index.record('Acme', 'website', 'https://acme-fan-page.example', origin='search')
+    assert index.lookup('Acme').url == 'https://acme.example'
+    index.record('Acme', 'website', 'https://acme.example', origin='search')
+    assert index.lookup('Acme').origin == 'search'
+
+def test_observe_verifies_and_drops_urls(index):
+    index.record('Acme', 'website', 'https://acme.example', verified_at=1)
+    index.record('Acme', 'crunchbase', 'https://cb.example/acme', verified_at=1)
+    index.observe('Acme', {
+        'website': ('https://acme.example', 304),
+        'crunchbase': ('https://cb.example/acme', 404),
+        'linkedin': ('https://li.example/acme', 200),
+    })
+    entries = index.lookup_all('Acme')
+    assert list(entries) == ['website']
+    assert entries['website'].verified_at > DAY
+
+def test_load_csv_reads_names_domains_and_confidence(index):
+    loaded = index.load_csv(io.BytesIO(
+        'Company,Domain,Crunchbase,Confidence\n'
+        'Acme,acme.example,https://cb.example/acme,0.9\n'
+        'Globex,globex.example,,\n'
+        ',initech.example,,\n'
+        ',,,\n'.encode('utf-8')
+    ))
+    assert loaded == 4
+    assert index.lookup('Acme').url == 'https://acme.example'
+    assert index.lookup('Acme', 'crunchbase').confidence == 0.9
+    assert index.lookup('Globex').confidence == 1.0
+    assert index.lookup('initech.example').url == 'https://initech.example'
+    assert len(index) == 3
+    assert index.stats() == {'companies': 3, 'urls': {'csv': 4}}
+
+def test_load_csv_needs_a_url_column(index):
+    with pytest.raises(ValueError):
+        index.load_csv(io.StringIO('Company,Industry\nAcme,AI\n'))
+
+def test_forget(index):
+    index.record('Acme', 'website', 'https://acme.example')
+    index.forget('ACME')
+    assert index.lookup_all('Acme') == {}
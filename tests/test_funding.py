@@ -0,0 +1,78 @@
+import math
+from datetime import date
+
+import pytest
+
+from leadgen_funding import (
+    FundingRound, FundingTable, format_round_date, funding_table, parse_round_date, round_code,
+)
+from leadgen_money import USD_RATES
+
+@pytest.mark.parametrize('text, expected', [
+    ('2021-03-15', (date(2021, 3, 15), 'day')),
+    ('2021-03', (date(2021, 3, 1), 'month')),
+    ('Jan 18, 2008', (date(2008, 1, 18), 'day')),
+    ('18 January 2008', (date(2008, 1, 18), 'day')),
+    ('Sept. 2019', (date(2019, 9, 1), 'month')),
+    ('announced in 2019', (date(2019, 1, 1), 'year')),
+    ('2021-02-30', (date(2021, 1, 1), 'year')),
+    ('N/A', (None, 'none')),
+    (None, (None, 'none')),
+])
+def test_parse_round_date(text, expected):
+    assert parse_round_date(text) == expected
+
+def test_dates_render_at_their_precision():
+    assert format_round_date(date(2021, 3, 1), 'month') == '2021-03'
+    assert format_round_date(date(2021, 1, 1), 'year') == '2021'
+    assert format_round_date(date(2021, 3, 15), 'day') == '2021-03-15'
+    assert format_round_date(None, 'none') is None
+
+def test_round_codes():
+    assert round_code('series a') == round_code(' Series A ')
+    assert round_code('Bridge') == 0
+
+def test_rounds_round_trip_through_the_arrays():
+    table = funding_table({'company_name': 'Acme', 'funding_rounds': [
+        {'type': 'Seed', 'amount': '$2M', 'date': 'Jun 2010'},
+        {'type': 'Bridge', 'amount': '€1.5M'},
+        {'amount': 'undisclosed', 'date': '2012'},
+    ]})
+    assert len(table) == 3
+    assert table.nbytes < 100
+    seed, bridge, third = table.rounds('Acme')
+    assert (seed.round_type, seed.amount, seed.currency) == ('Seed', 2e6, 'USD')
+    assert (seed.date, seed.precision) == (date(2010, 6, 1), 'month')
+    assert (bridge.round_type, bridge.amount, bridge.currency, bridge.date) == ('Bridge', 1.5e6, 'EUR', None)
+    assert (third.round_type, third.amount, third.precision) == ('Round 3', None, 'year')
+    assert table.rounds('Globex') == []
+
+def test_add_lines_reads_the_flattened_column():
+    table = FundingTable()
+    assert table.add_lines('Acme', 'Seed: $2M (2019-03); Series A: $8M (2021); Bridge: $1M') == 3
+    assert [r.round_type for r in table.rounds()] == ['Seed', 'Series A', 'Bridge']
+    assert [format_round_date(r.date, r.precision) for r in table.rounds()] == ['2019-03', '2021', None]
+
+def test_to_frame_columns():
+    table = FundingTable()
+    table.append('Acme', FundingRound('Seed', 2e6, 'USD', date(2019, 3, 1), 'month'))
+    table.append('Globex', FundingRound('Bridge', None, None))
+    frame = table.to_frame()
+    assert frame['company'].tolist() == ['Acme', 'Globex']
+    assert frame['round'].tolist() == ['Seed', 'Bridge']
+    assert frame['currency'].tolist()[0] == 'USD' and frame['currency'].isna().tolist()[1]
+    assert str(frame['date'].iloc[0].date()) == '2019-03-01'
+    assert frame['date'].isna().tolist()[1]
+
+def test_yearly_totals_convert_to_usd_and_skip_unknown_amounts():
+    table = FundingTable()
+    table.add_lines('Acme', 'Seed: $2M (2019); Series A: €10M (2021-05)')
+    table.add_lines('Globex', 'Seed: 5M XYZ (2020); Series A: undisclosed (2021); Bridge: $1M')
+    totals = table.yearly_totals()
+    assert totals['year'].tolist() == [2019, 2020, 2021]
+    assert totals['rounds'].tolist() == [1, 1, 2]
+    amounts = totals['amount'].tolist()
+    assert amounts[0] == 2e6
+    assert math.isnan(amounts[1])
+    assert amounts[2] == pytest.approx(10e6 * USD_RATES['EUR'])
+    assert table.yearly_totals(['Globex'])['rounds'].tolist() == [1, 1]
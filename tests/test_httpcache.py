@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from leadgen_fetch import SourceFetcher
+from leadgen_httpcache import ResponseCache, freshness_lifetime
+from leadgen_ratelimit import RateLimiter
+
+def test_freshness_lifetime():
+    assert freshness_lifetime({'Cache-Control': 'public, max-age=600'}) == 600
+    assert freshness_lifetime({'Cache-Control': 's-maxage=30'}) == 30
+    assert freshness_lifetime({'Cache-Control': 'no-cache, max-age=600'}) == 0
+    assert freshness_lifetime({'Cache-Control': 'no-store'}) is None
+    assert freshness_lifetime({'Expires': 'Thu, 01 Jan 2026 00:01:00 GMT'}, now=1767225600) == 60
+    assert freshness_lifetime({'Expires': 'garbage'}) == 0
+    assert freshness_lifetime({}) == 0
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path / 'responses.sqlite'))
+
+def test_store_and_lookup_round_trip(cache):
+    cache.store('http://a/1', 200, {'ETag': '"v1"', 'Cache-Control': 'max-age=60', 'X-Other': 'x'}, 'hello')
+    cached = cache.lookup('http://a/1')
+    assert cached.body == 'hello'
+    assert cached.fresh
+    assert cached.headers == {'ETag': '"v1"', 'Cache-Control': 'max-age=60'}
+    assert cached.validators() == {'If-None-Match': '"v1"'}
+    assert cache.lookup('http://a/2') is None
+
+def test_uncacheable_responses_are_not_stored(cache):
+    cache.store('http://a/1', 200, {'Cache-Control': 'no-store'}, 'secret')
+    cache.store('http://a/2', 404, {}, 'not found')
+    assert cache.stats()['entries'] == 0
+
+def test_refresh_extends_a_stale_entry(cache):
+    cache.store('http://a/1', 200, {'ETag': '"v1"'}, 'hello')
+    assert not cache.lookup('http://a/1').fresh
+    cache.refresh('http://a/1', {'ETag': '"v2"', 'Cache-Control': 'max-age=60'})
+    cached = cache.lookup('http://a/1')
+    assert cached.fresh
+    assert cached.headers['ETag'] == '"v2"'
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    size = len(zlib.compress(b'page 0 ' * 5, 6))
+    cache = ResponseCache(str(tmp_path / 'responses.sqlite'), max_bytes=2 * size)
+    for i in range(3):
+        cache.store(f'http://a/{i}', 200, {}, f'page {i} ' * 5)
+        cache.lookup('http://a/0')
+    assert cache.lookup('http://a/0') is not None
+    assert cache.lookup('http://a/1') is None
+    assert cache.stats()['entries'] == 2
+
+class Origin:
+    """Local origin serving one page with an ETag, answering 304 when it matches."""
+
+    def __init__(self, cache_control=''):
+        self.cache_control = cache_control
+        self.etag = '"v1"'
+        self.body = 'first'
+        self.requests = []
+        origin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                origin.requests.append(self.headers.get('If-None-Match'))
+                if self.headers.get('If-None-Match') == origin.etag:
+                    self.send_response(304)
+                    self.send_header('ETag', origin.etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                payload = origin.body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('ETag', origin.etag)
+                if origin.cache_control:
+                    self.send_header('Cache-Control', origin.cache_control)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host, port = self.server.server_address[:2]
+        self.url = f'http://{host}:{port}/page'
+        self.host = f'{host}:{port}'
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def origin():
+    server = Origin()
+    yield server
+    server.close()
+
+def fetch(fetcher, url, headers=None):
+    return asyncio.run(fetcher.fetch('website', url, headers))
+
+def make_fetcher(origin, cache):
+    return SourceFetcher(max_retries=0, rate_limiter=RateLimiter({origin.host: (1e6, 1e6)}),
+                         response_cache=cache)
+
+def test_stale_entries_are_revalidated_with_their_etag(origin, cache):
+    fetcher = make_fetcher(origin, cache)
+    first = fetch(fetcher, origin.url)
+    second = fetch(fetcher, origin.url)
+    assert origin.requests == [None, '"v1"']
+    assert (first.status, first.text, first.cache) == (200, 'first', None)
+    assert (second.status, second.text, second.cache) == (200, 'first', 'revalidated')
+    origin.etag, origin.body = '"v2"', 'second'
+    assert fetch(fetcher, origin.url).text == 'second'
+    assert cache.stats()['revalidated'] == 1
+    fetcher.close()
+
+def test_fresh_entries_skip_the_network(origin, cache):
+    origin.cache_control = 'max-age=600'
+    fetcher = make_fetcher(origin, cache)
+    fetch(fetcher, origin.url)
+    hit = fetch(fetcher, origin.url)
+    assert len(origin.requests) == 1
+    assert (hit.status, hit.text, hit.cache) == (200, 'first', 'hit')
+    assert fetch(fetcher, origin.url, {'If-None-Match': '"v1"'}).status == 304
+    assert fetch(fetcher, origin.url, {'If-None-Match': '"v1"', 'Cache-Control': 'no-cache'}).status == 304
+    assert origin.requests == [None, '"v1"']
+    fetcher.close()
+
+def test_replay_only_never_touches_the_network(origin, tmp_path):
+    cache = ResponseCache(str(tmp_path / 'responses.sqlite'))
+    fetch(make_fetcher(origin, cache), origin.url)
+    replay = make_fetcher(origin, ResponseCache(str(tmp_path / 'responses.sqlite'), replay_only=True))
+    assert fetch(replay, origin.url).text == 'first'
+    missing = fetch(replay, origin.url + '/other')
+    assert (missing.status, missing.error) == (None, 'not in replay cache')
+    assert len(origin.requests) == 1
@@ -0,0 +1,32 @@
+from leadgen_incremental import diff_profiles, source_is_fresh, validator_headers
+from leadgen_sources import SOURCES
+
+def test_source_is_fresh_follows_each_sources_ttl():
+    ttl = SOURCES['techcrunch'].ttl
+    assert source_is_fresh({'source': 'techcrunch', 'fetched_at': 0}, now=ttl - 1)
+    assert not source_is_fresh({'source': 'techcrunch', 'fetched_at': 0}, now=ttl)
+    assert source_is_fresh({'source': 'website', 'fetched_at': 0}, now=ttl)
+
+def test_unknown_or_unfetched_sources_are_never_fresh():
+    assert not source_is_fresh({'source': 'other', 'fetched_at': 0}, now=1)
+    assert not source_is_fresh({'source': 'crunchbase'}, now=1)
+
+def test_validator_headers():
+    meta = {'etag': '"v1"', 'last_modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+    assert validator_headers(meta) == {
+        'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT',
+    }
+    assert validator_headers({'etag': None}) == {}
+
+def test_diff_profiles_reports_changed_fields_with_their_sources():
+    old = {'company_name': 'Acme', 'valuation': '$50M', 'team_size': '11-50', '_sources': {'a': 1}}
+    new = {'company_name': 'Acme', 'valuation': '$80M', 'summary': 'Robots.', '_sources': {'b': 2}}
+    changes = diff_profiles(old, new)
+    assert [change['field'] for change in changes] == ['summary', 'team_size', 'valuation']
+    assert changes[2] == {
+        'field': 'valuation', 'old': '$50M', 'new': '$80M', 'sources': ['crunchbase', 'techcrunch'],
+    }
+    assert changes[1]['new'] is None
+
+def test_diff_against_no_profile_lists_every_field():
+    assert [change['field'] for change in diff_profiles(None, {'industry': 'AI', '_parsed': {}})] == ['industry']
@@ -0,0 +1,128 @@
+import threading
+import time
+
+import pytest
+
+import leadgen_jobs
+import leadgen_sink
+from leadgen_batch import BatchRunner
+from leadgen_jobs import JobStore, run_job, start_background_job
+from leadgen_sink import ResultSink, count_rows, read_page
+
+NAMES = [f'Company {i}' for i in range(10)]
+
+class Extractor:
+    """Stand-in for LeadGenAI that fails for the names in ``failing``."""
+
+    failing = set()
+
+    def extract_company_profile(self, company_name):
+        if company_name in self.failing:
+            raise RuntimeError(f'no data for {company_name}')
+        return {'company_name': company_name, 'industry': 'AI'}
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / 'jobs.sqlite'))
+
+@pytest.fixture
+def extractor(monkeypatch):
+    monkeypatch.setattr(Extractor, 'failing', set())
+    return Extractor
+
+def written_names(path):
+    return sorted(row['company_name'] for row in read_page(path, 0, 1000))
+
+def test_create_job_records_every_company(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(leadgen_jobs, 'INSERT_CHUNK', 3)
+    job_id = store.create_job('names.txt', iter(NAMES), 'csv', str(tmp_path / 'out.csv'))
+    job = store.get_job(job_id)
+    assert job['total'] == 10
+    assert job['status'] == 'pending'
+    assert list(store.pending_items(job_id)) == list(enumerate(NAMES))
+    assert store.counts(job_id) == {'pending': 10, 'running': 0, 'done': 0, 'failed': 0}
+    assert [j['job_id'] for j in store.list_jobs(unfinished_only=True)] == [job_id]
+
+def test_failed_items_are_retried_up_to_max_attempts(store, tmp_path):
+    job_id = store.create_job('names.txt', NAMES[:2], 'csv', str(tmp_path / 'out.csv'))
+    store.mark(job_id, 0, 'running')
+    store.mark(job_id, 0, 'failed', 'boom')
+    assert store.count_pending(job_id) == 2
+    for _ in range(store.max_attempts - 1):
+        store.mark(job_id, 0, 'running')
+        store.mark(job_id, 0, 'failed', 'boom')
+    assert store.count_pending(job_id) == 1
+    assert list(store.pending_items(job_id)) == [(1, NAMES[1])]
+    assert store.failed_items(job_id) == [
+        {'company_name': NAMES[0], 'attempts': store.max_attempts, 'error': 'boom'}
+    ]
+
+def test_run_job_checkpoints_every_company(store, tmp_path, extractor):
+    path = str(tmp_path / 'out.csv')
+    job_id = store.create_job('names.txt', NAMES, 'csv', path)
+    events = list(run_job(store, job_id, BatchRunner(extractor, max_workers=4)))
+    assert sum(event.status == 'done' for event in events) == 10
+    assert store.counts(job_id)['done'] == 10
+    assert store.get_job(job_id)['status'] == 'done'
+    assert written_names(path) == sorted(NAMES)
+
+def test_resume_retries_failures_without_repeating_done_companies(store, tmp_path, extractor):
+    path = str(tmp_path / 'out.jsonl')
+    job_id = store.create_job('names.txt', NAMES, 'jsonl', path)
+    extractor.failing = {NAMES[3], NAMES[7]}
+    list(run_job(store, job_id, BatchRunner(extractor, max_workers=4)))
+    assert store.counts(job_id)['failed'] == 2
+    assert store.get_job(job_id)['status'] == 'pending'
+    extractor.failing = set()
+    events = list(run_job(store, job_id, BatchRunner(extractor, max_workers=4)))
+    assert sorted(event.company_name for event in events if event.status == 'done') == [NAMES[3], NAMES[7]]
+    assert store.get_job(job_id)['status'] == 'done'
+    assert written_names(path) == sorted(NAMES)
+
+def test_resume_after_interrupted_run(store, tmp_path, extractor):
+    path = str(tmp_path / 'out.csv')
+    job_id = store.create_job('names.txt', NAMES, 'csv', path)
+    events = run_job(store, job_id, BatchRunner(extractor, max_workers=2))
+    done = 0
+    for event in events:
+        done += event.status == 'done'
+        if done == 4:
+            break
+    events.close()
+    assert store.counts(job_id)['done'] == count_rows(path) == 4
+    list(run_job(store, job_id, BatchRunner(extractor, max_workers=2)))
+    assert store.counts(job_id)['done'] == 10
+    assert written_names(path) == sorted(NAMES)
+
+def test_parquet_crash_marks_only_written_parts_done(store, tmp_path, extractor, monkeypatch):
+    pytest.importorskip('pyarrow')
+    monkeypatch.setattr(leadgen_sink, 'PARQUET_ROW_GROUP', 4)
+    path = str(tmp_path / 'out.parquet')
+    job_id = store.create_job('names.txt', NAMES, 'parquet', path)
+    with monkeypatch.context() as crash:
+        crash.setattr(ResultSink, 'close', lambda self: [])
+        list(run_job(store, job_id, BatchRunner(extractor, max_workers=1)))
+    assert store.counts(job_id)['done'] == count_rows(path) == 8
+    assert store.count_pending(job_id) == 2
+    list(run_job(store, job_id, BatchRunner(extractor, max_workers=1)))
+    assert store.counts(job_id)['done'] == 10
+    assert written_names(path) == sorted(NAMES)
+
+def test_background_job_runs_once_per_job(store, tmp_path, extractor):
+    gate = threading.Event()
+
+    class Gated(extractor):
+        def extract_company_profile(self, company_name):
+            gate.wait(30)
+            return super().extract_company_profile(company_name)
+
+    job_id = store.create_job('names.txt', NAMES, 'csv', str(tmp_path / 'out.csv'))
+    job = start_background_job(store, job_id, BatchRunner(Gated, max_workers=2))
+    assert start_background_job(store, job_id, BatchRunner(Gated, max_workers=2)) is job
+    gate.set()
+    deadline = time.monotonic() + 30
+    while job.status == 'running' and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.status == 'done'
+    assert job.stats.done == 10
+    assert store.counts(job_id)['done'] == 10
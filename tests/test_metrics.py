@@ -0,0 +1,106 @@
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import leadgen_metrics
+from leadgen_metrics import Histogram, MetricsRegistry, serve_metrics
+from leadgen_progress import ProgressReporter
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry({
+        'jobs_total': ('counter', 'Jobs run.', None),
+        'job_seconds': ('histogram', 'Job time.', (1.0, 2.0, 4.0)),
+    })
+
+def test_counters_add_up_per_label_set(registry):
+    registry.inc('jobs_total', outcome='done')
+    registry.inc('jobs_total', 2, outcome='done')
+    registry.inc('jobs_total', outcome='failed')
+    assert registry.counters() == [
+        {'metric': 'jobs_total', 'labels': 'outcome=done', 'value': 3},
+        {'metric': 'jobs_total', 'labels': 'outcome=failed', 'value': 1},
+    ]
+
+def test_counters_are_thread_safe(registry):
+    def work():
+        for _ in range(1000):
+            registry.inc('jobs_total')
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert registry.counters()[0]['value'] == 8000
+
+def test_histogram_quantiles_interpolate_within_buckets():
+    histogram = Histogram((1.0, 2.0, 4.0))
+    assert histogram.quantile(0.5) is None
+    for value in (0.5, 1.5, 1.5, 3.0):
+        histogram.observe(value)
+    assert histogram.counts == [1, 2, 1, 0]
+    assert histogram.quantile(0.5) == 1.5
+    assert histogram.quantile(1.0) == 4.0
+
+def test_histograms_summary(registry):
+    for value in (0.5, 1.5, 3.0):
+        registry.observe('job_seconds', value, stage='fetch')
+    (row,) = registry.histograms('job_seconds')
+    assert row['stage'] == 'fetch'
+    assert row['count'] == 3
+    assert row['mean'] == pytest.approx(5 / 3)
+    assert registry.histograms('other') == []
+
+def test_prometheus_exposition(registry):
+    registry.inc('jobs_total', outcome='done')
+    registry.inc('unknown_total', 0.5, company='a "quoted"\nname')
+    for value in (0.5, 1.5, 10.0):
+        registry.observe('job_seconds', value, stage='fetch')
+    assert registry.render_prometheus().splitlines() == [
+        '# HELP jobs_total Jobs run.',
+        '# TYPE jobs_total counter',
+        'jobs_total{outcome="done"} 1',
+        '# TYPE unknown_total counter',
+        'unknown_total{company="a \\"quoted\\"\\nname"} 0.5',
+        '# HELP job_seconds Job time.',
+        '# TYPE job_seconds histogram',
+        'job_seconds_bucket{stage="fetch",le="1"} 1',
+        'job_seconds_bucket{stage="fetch",le="2"} 2',
+        'job_seconds_bucket{stage="fetch",le="4"} 2',
+        'job_seconds_bucket{stage="fetch",le="+Inf"} 3',
+        'job_seconds_sum{stage="fetch"} 12',
+        'job_seconds_count{stage="fetch"} 3',
+    ]
+
+def test_write_prometheus_replaces_the_file(tmp_path, registry):
+    path = tmp_path / 'textfile' / 'leadgen.prom'
+    registry.inc('jobs_total')
+    registry.write_prometheus(str(path))
+    registry.inc('jobs_total')
+    registry.write_prometheus(str(path))
+    assert 'jobs_total 2' in path.read_text(encoding='utf-8')
+    assert [p.name for p in path.parent.iterdir()] == ['leadgen.prom']
+
+def test_serve_metrics(registry):
+    registry.inc('jobs_total')
+    server = serve_metrics(registry, 0)
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    try:
+        with urllib.request.urlopen(f'{base}/metrics') as response:
+            assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+            assert response.read().decode('utf-8') == registry.render_prometheus()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f'{base}/other')
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_progress_stages_are_timed(monkeypatch, registry):
+    monkeypatch.setattr(leadgen_metrics, '_shared_registry', registry)
+    progress = ProgressReporter()
+    with progress.stage('fetch', 'crunchbase'):
+        pass
+    (row,) = registry.histograms('leadgen_stage_seconds')
+    assert (row['stage'], row['source'], row['count']) == ('fetch', 'crunchbase', 1)
@@ -0,0 +1,95 @@
+import pandas as pd
+import pytest
+
+from leadgen_money import (
+    UNKNOWN_CURRENCY, Amount, format_amount, money_frame, parse_money, parse_size, parsed_fields,
+)
+
+@pytest.mark.parametrize('text, expected', [
+    ('$1.2B', Amount(1.2e9, 1.2e9, 'USD')),
+    ('US$ 500K', Amount(5e5, 5e5, 'USD')),
+    ('€10-20M', Amount(1e7, 2e7, 'EUR')),
+    ('£3 million to £5 million', Amount(3e6, 5e6, 'GBP')),
+    ('USD 50M', Amount(5e7, 5e7, 'USD')),
+    ('$2,500,000', Amount(2.5e6, 2.5e6, 'USD')),
+])
+def test_parse_money_currency_prefix(text, expected):
+    assert parse_money(text) == expected
+
+@pytest.mark.parametrize('text, expected', [
+    ('50M USD', Amount(5e7, 5e7, 'USD')),
+    ('raised 50 million EUR in 2021', Amount(5e7, 5e7, 'EUR')),
+    ('10-20M GBP', Amount(1e7, 2e7, 'GBP')),
+    ('2,000,000 INR', Amount(2e6, 2e6, 'INR')),
+])
+def test_parse_money_trailing_code(text, expected):
+    assert parse_money(text) == expected
+
+@pytest.mark.parametrize('text, expected', [
+    ('1.2B', Amount(1.2e9, 1.2e9, UNKNOWN_CURRENCY)),
+    ('12.5m', Amount(1.25e7, 1.25e7, UNKNOWN_CURRENCY)),
+    ('10-20M', Amount(1e7, 2e7, UNKNOWN_CURRENCY)),
+    ('approx 5 to 10 bn', Amount(5e9, 1e10, UNKNOWN_CURRENCY)),
+])
+def test_parse_money_bare_amount_with_unit(text, expected):
+    assert parse_money(text) == expected
+
+@pytest.mark.parametrize('text, expected', [
+    ('INR 500 crore', Amount(5e9, 5e9, 'INR')),
+    ('₹2.5 lakh crore', Amount(2.5e12, 2.5e12, 'INR')),
+    ('Rs. 50 lakhs', Amount(5e6, 5e6, 'INR')),
+    ('10-20 Cr INR', Amount(1e8, 2e8, 'INR')),
+    ('$5 mn', Amount(5e6, 5e6, 'USD')),
+    ('€3.2 mln', Amount(3.2e6, 3.2e6, 'EUR')),
+    ('$2 billions', Amount(2e9, 2e9, 'USD')),
+])
+def test_parse_money_regional_and_plural_units(text, expected):
+    assert parse_money(text) == expected
+
+def test_rs_is_not_read_inside_words():
+    assert parse_money('hours 5M') == Amount(5e6, 5e6, UNKNOWN_CURRENCY)
+
+@pytest.mark.parametrize('text', ['', None, 'N/A', 'founded 2015', 'Series B', '1,200 employees'])
+def test_parse_money_rejects_text_without_an_amount(text):
+    assert parse_money(text) is None
+
+def test_parse_money_takes_the_first_amount():
+    assert parse_money('1.2B valuation after a $50M round') == Amount(1.2e9, 1.2e9, UNKNOWN_CURRENCY)
+    assert parse_money('$50M round at 1.2B') == Amount(5e7, 5e7, 'USD')
+
+@pytest.mark.parametrize('text, expected', [
+    ('50-100 employees', Amount(50, 100, None)),
+    ('200+', Amount(200, None, None)),
+    ('1,200', Amount(1200, 1200, None)),
+])
+def test_parse_size(text, expected):
+    assert parse_size(text) == expected
+
+@pytest.mark.parametrize('amount, label', [
+    (Amount(1.2e9, 1.2e9, 'USD'), '$1.2B'),
+    (Amount(1e7, 2e7, 'EUR'), '€10M-€20M'),
+    (Amount(1.2e9, 1.2e9, UNKNOWN_CURRENCY), '1.2B'),
+    (Amount(50, 100, None), '50-100'),
+    (Amount(200, None, None), '200+'),
+    (None, 'N/A'),
+])
+def test_format_amount(amount, label):
+    assert format_amount(amount) == label
+
+def test_money_frame_converts_to_usd():
+    frame = money_frame(pd.Series(['$10M', '€10M', '10M', 'N/A', None]))
+    assert list(frame['currency'][:3]) == ['USD', 'EUR', UNKNOWN_CURRENCY]
+    assert frame['currency'][3:].isna().all()
+    assert frame['usd'].iloc[0] == 1e7
+    assert frame['usd'].iloc[1] == pytest.approx(1.08e7)
+    assert frame['usd'].iloc[2:].isna().all()
+
+def test_parsed_fields_reparses_only_changed_fields():
+    profile = {'valuation': '$1B', 'team_size': '50-100', 'funding_rounds': [{'amount': '20M USD'}]}
+    first = parsed_fields(profile)
+    assert first['valuation'] == Amount(1e9, 1e9, 'USD')
+    assert first['funding_rounds'] == [Amount(2e7, 2e7, 'USD')]
+    profile['valuation'] = '2B'
+    second = parsed_fields(profile)
+    assert second['valuation'] == Amount(2e9, 2e9, UNKNOWN_CURRENCY)
+    assert second['team_size'] == first['team_size']
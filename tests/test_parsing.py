@@ -0,0 +1,112 @@
+import zlib
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from leadgen_parsing import ParserPool, merge_fields, parse_compressed, parse_page
+
+PAGE = """<html><head><meta name="description" content="Acme builds warehouse robots."></head>
+<body><p>Founded in 2015. Headquarters: Berlin, Germany. Industry: Robotics. 51-200 employees.
+Total funding: $25M. Valuation of $300M.</p>
+<p>Seed round: $5M in March 2016. Series A: $20M, announced 2019. Acme is hiring.</p>
+<p>Contact hello@acme.com or +1 415 555 0100.</p>
+<script>var hidden = "Series B: $99M";</script>
+<a href="https://twitter.com/acme">Twitter</a></body></html>"""
+
+def test_parse_page_extracts_crunchbase_fields():
+    fields = parse_page('crunchbase', PAGE)
+    assert fields['summary'] == 'Acme builds warehouse robots.'
+    assert fields['founded_year'] == '2015'
+    assert fields['industry'] == 'Robotics'
+    assert fields['locations'] == 'Berlin, Germany'
+    assert fields['valuation'] == '$300M'
+    assert fields['funding_rounds'] == [
+        {'type': 'Seed', 'amount': '$5M', 'date': '2016-03'},
+        {'type': 'Series A', 'amount': '$20M', 'date': '2019'},
+    ]
+    assert fields['emails'] == ['hello@acme.com']
+    assert fields['social_links'] == {'twitter': 'https://twitter.com/acme'}
+
+def test_parse_page_keeps_only_the_sources_fields():
+    fields = parse_page('website', PAGE)
+    assert 'funding_rounds' not in fields
+    assert 'valuation' not in fields
+    assert fields['founded_year'] == '2015'
+
+def test_parse_compressed_matches_parse_page():
+    fields, cpu_seconds = parse_compressed('techcrunch', zlib.compress(PAGE.encode('utf-8')))
+    assert fields == parse_page('techcrunch', PAGE)
+    assert cpu_seconds >= 0
+
+def test_merge_fields_follows_source_priority():
+    merged = merge_fields({
+        'techcrunch': {'valuation': '$1B', 'growth_signals': ['Funding', 'Hiring']},
+        'crunchbase': {'valuation': '$300M', 'emails': ['b@acme.com'], 'growth_signals': ['Hiring']},
+        'website': {'emails': ['a@acme.com'], 'social_links': {'twitter': 'https://twitter.com/acme'}},
+    })
+    assert merged['valuation'] == '$300M'
+    assert merged['growth_signals'] == ['Funding', 'Hiring']
+    assert merged['contact_info'] == {'emails': ['a@acme.com', 'b@acme.com'], 'phones': []}
+    assert merged['social_links'] == {'twitter': 'https://twitter.com/acme'}
+
+def test_inline_pool_parses_in_the_calling_thread():
+    pool = ParserPool(max_workers=0)
+    pages = {'crunchbase': PAGE, 'website': PAGE}
+    assert pool.parse_many(pages) == {source: parse_page(source, PAGE) for source in pages}
+    assert pool._executor is None
+
+class Executor:
+    """Stand-in process pool whose futures fail in the given way."""
+
+    def __init__(self, outcome, fail_submit_after=None):
+        self.outcome = outcome
+        self.fail_submit_after = fail_submit_after
+        self.futures = []
+
+    def submit(self, fn, *args):
+        if self.fail_submit_after is not None and len(self.futures) >= self.fail_submit_after:
+            raise BrokenProcessPool('worker died')
+        future = Future()
+        self.futures.append(future)
+        if self.outcome == 'broken':
+            future.set_exception(BrokenProcessPool('worker died'))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        for future in self.futures:
+            if cancel_futures:
+                future.cancel()
+
+@pytest.fixture
+def pages():
+    return {'crunchbase': PAGE, 'linkedin': PAGE, 'techcrunch': PAGE}
+
+def expected(pages):
+    return {source: parse_page(source, text) for source, text in pages.items()}
+
+def test_failed_submit_parses_every_page_inline(pages):
+    pool = ParserPool(max_workers=2)
+    pool._executor = Executor('pending', fail_submit_after=1)
+    assert pool.parse_many(pages) == expected(pages)
+    assert pool._executor is None
+
+def test_broken_pool_falls_back_to_inline_parsing(pages):
+    pool = ParserPool(max_workers=2)
+    pool._executor = Executor('broken')
+    assert pool.parse_many(pages) == expected(pages)
+    assert pool._executor is None
+
+def test_futures_cancelled_by_another_thread_are_parsed_inline(pages):
+    pool = ParserPool(max_workers=2)
+    executor = pool._executor = Executor('pending')
+    original_submit = executor.submit
+
+    def submit_then_close(fn, *args):
+        future = original_submit(fn, *args)
+        if len(executor.futures) == len(pages):
+            executor.shutdown(cancel_futures=True)
+        return future
+
+    executor.submit = submit_then_close
+    assert pool.parse_many(pages) == expected(pages)
@@ -0,0 +1,133 @@
+import os
+import sys
+import time
+
+import pytest
+
+from leadgen_discovery import DiscoveryIndex
+from leadgen_fetch import SourceFetcher
+from leadgen_httpcache import ResponseCache
+from leadgen_incremental import SOURCES_KEY
+from leadgen_parsing import ParserPool
+from leadgen_pipeline import SourcePipeline, SourcePipelineMixin
+from leadgen_ratelimit import RateLimiter
+from leadgen_sources import SOURCES
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from stub_server import StubServer, company_values  # noqa: E402
+
+LATENCY = 0.3
+
+@pytest.fixture
+def stub():
+    with StubServer(latency=LATENCY) as server:
+        yield server
+
+def make_pipeline(stub, tmp_path, templates=None, response_cache=True):
+    fetcher = SourceFetcher(
+        max_retries=0,
+        rate_limiter=RateLimiter({stub.host: (1e6, 1e6)}),
+        response_cache=response_cache and ResponseCache(str(tmp_path / 'http')),
+    )
+    templates = templates or dict(stub.templates(), website=f'{stub.base_url}/website/{{slug}}')
+    pipeline = SourcePipeline(max_retries=0, source_templates=templates, fetcher=fetcher)
+    pipeline.parser_pool = ParserPool(max_workers=0)
+    pipeline.discovery_index = DiscoveryIndex(str(tmp_path / 'discovery.sqlite'))
+    return pipeline
+
+def test_sources_are_fetched_concurrently_and_merged(stub, tmp_path):
+    pipeline = make_pipeline(stub, tmp_path)
+    started = time.monotonic()
+    profile = pipeline.extract_company_profile('Acme Robotics')
+    elapsed = time.monotonic() - started
+    values = company_values('acme-robotics', stub.base_url)
+    assert stub.requests == 4
+    assert elapsed < 2 * LATENCY
+    assert profile['founded_year'] == values['year']
+    assert profile['industry'] == values['industry']
+    assert profile['team_size'] == values['employees']
+    assert profile['total_funding_raised'] == values['total_funding']
+    assert [r['amount'] for r in profile['funding_rounds']] == [
+        values['seed_amount'], values['series_a_amount'], values['series_b_amount'],
+    ]
+    sources = profile[SOURCES_KEY]
+    assert sorted(sources) == ['crunchbase', 'linkedin', 'techcrunch', 'website']
+    assert {meta['status'] for meta in sources.values()} == {'updated'}
+    assert sources['crunchbase']['url'] == f'{stub.base_url}/crunchbase/acme-robotics'
+
+def test_a_missing_source_does_not_sink_the_profile(stub, tmp_path):
+    templates = dict(stub.templates(), website=f'{stub.base_url}/website/{{slug}}',
+                     techcrunch=f'{stub.base_url}/nowhere/{{slug}}')
+    profile = make_pipeline(stub, tmp_path, templates).extract_company_profile('Acme Robotics')
+    assert 'techcrunch' not in profile[SOURCES_KEY]
+    assert profile['industry'] == company_values('acme-robotics', stub.base_url)['industry']
+
+def test_refresh_skips_fresh_sources_unless_revalidating(stub, tmp_path):
+    pipeline = make_pipeline(stub, tmp_path)
+    first = pipeline.extract_company_profile('Acme Robotics')
+    before = stub.requests
+    refreshed, changes = pipeline.refresh_company_profile(first)
+    assert stub.requests == before
+    assert {meta['status'] for meta in refreshed[SOURCES_KEY].values()} == {'fresh'}
+    assert changes == []
+    revalidated, changes = pipeline.refresh_company_profile(first, revalidate=True)
+    assert stub.requests > before
+    assert set(revalidated[SOURCES_KEY]) == set(first[SOURCES_KEY])
+    assert changes == []
+
+def test_refresh_refetches_only_expired_sources(stub, tmp_path):
+    pipeline = make_pipeline(stub, tmp_path)
+    first = pipeline.extract_company_profile('Acme Robotics')
+    first[SOURCES_KEY]['techcrunch']['fetched_at'] -= SOURCES['techcrunch'].ttl
+    before = stub.requests
+    refreshed, _ = pipeline.refresh_company_profile(first)
+    assert stub.requests == before + 1
+    statuses = {source: meta['status'] for source, meta in refreshed[SOURCES_KEY].items()}
+    assert statuses == {'crunchbase': 'fresh', 'linkedin': 'fresh', 'techcrunch': 'updated', 'website': 'fresh'}
+
+def test_unreachable_expired_sources_keep_their_last_fields(stub, tmp_path):
+    pipeline = make_pipeline(stub, tmp_path, response_cache=False)
+    first = pipeline.extract_company_profile('Acme Robotics')
+    for meta in first[SOURCES_KEY].values():
+        meta['fetched_at'] -= 30 * 24 * 3600
+    stub.stop()
+    pipeline.fetcher.close()
+    refreshed, changes = pipeline.refresh_company_profile(first)
+    assert {meta['status'] for meta in refreshed[SOURCES_KEY].values()} == {'stale'}
+    assert refreshed['funding_rounds'] == first['funding_rounds']
+    assert changes == []
+
+def test_indexed_websites_skip_discovery_and_dead_ones_are_dropped(stub, tmp_path):
+    pipeline = make_pipeline(stub, tmp_path, templates=stub.templates())
+    index = pipeline.discovery_index
+    recorded = time.time() - 60
+    index.record('Acme Robotics', 'website', f'{stub.base_url}/website/acme-robotics', verified_at=recorded)
+    profile = pipeline.extract_company_profile('Acme Robotics')
+    assert profile[SOURCES_KEY]['website']['url'] == f'{stub.base_url}/website/acme-robotics'
+    assert index.lookup('Acme Robotics').verified_at > recorded
+    index.record('Globex', 'website', f'{stub.base_url}/nowhere/globex', origin='csv')
+    profile = pipeline.extract_company_profile('Globex')
+    assert 'website' not in profile[SOURCES_KEY]
+    assert index.lookup('Globex') is None
+
+class LeadGenAI:
+    """Stand-in for the extractor the pipeline falls through to."""
+
+    def extract_company_profile(self, company_name, progress=None, **kwargs):
+        return {'company_name': company_name, 'industry': 'Fallback'}
+
+class Service(SourcePipelineMixin, LeadGenAI):
+    pass
+
+def test_pipeline_is_opt_in_per_extractor_and_per_call(stub, tmp_path):
+    service = Service()
+    service.fetcher = make_pipeline(stub, tmp_path).fetcher
+    service.source_templates = dict(stub.templates(), website=f'{stub.base_url}/website/{{slug}}')
+    service.parser_pool = ParserPool(max_workers=0)
+    service.discovery_index = DiscoveryIndex(str(tmp_path / 'discovery.sqlite'))
+    assert service.extract_company_profile('Acme Robotics')['industry'] == 'Fallback'
+    assert stub.requests == 0
+    profile = service.extract_company_profile('Acme Robotics', pipeline=True)
+    assert SOURCES_KEY in profile
+    assert stub.requests == 4
+    assert service.use_source_pipeline is False
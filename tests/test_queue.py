@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+
+from leadgen_queue import AnalysisQueue, QueueExecutor
+
+class Extractor:
+    pass
+
+def wait_for(predicate, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.005)
+
+@pytest.fixture
+def gate():
+    gate = threading.Event()
+    yield gate
+    gate.set()
+
+def blocked(gate, result=None):
+    def task(extractor, progress):
+        gate.wait(30)
+        return result
+    return task
+
+def test_results_are_returned_by_job_id():
+    queue = AnalysisQueue(Extractor, max_workers=2)
+    job_id = queue.submit('alice', 'acme', lambda extractor, progress: isinstance(extractor, Extractor))
+    wait_for(lambda: queue.status(job_id).status == 'done')
+    info = queue.status(job_id)
+    assert info.result is True
+    assert info.fraction == 1.0
+
+def test_failures_are_reported():
+    def task(extractor, progress):
+        raise RuntimeError('no data')
+    queue = AnalysisQueue(Extractor, max_workers=1)
+    job_id = queue.submit('alice', 'acme', task)
+    wait_for(lambda: queue.status(job_id).status == 'failed')
+    assert queue.status(job_id).error == 'no data'
+
+def test_duplicate_keys_share_a_job(gate):
+    queue = AnalysisQueue(Extractor, max_workers=1)
+    first = queue.submit('alice', 'acme', blocked(gate))
+    assert queue.submit('bob', 'acme', blocked(gate)) == first
+    assert queue.submit('bob', 'globex', blocked(gate)) != first
+
+def test_owners_take_turns(gate):
+    queue = AnalysisQueue(Extractor, max_workers=1)
+    order = []
+
+    def record(name):
+        def task(extractor, progress):
+            order.append(name)
+        return task
+
+    queue.submit('blocker', None, blocked(gate))
+    wait_for(lambda: queue.stats()['running'] == 1)
+    batch = [queue.submit('alice', None, record(f'alice {i}')) for i in range(3)]
+    lookup = queue.submit('bob', None, record('bob'))
+    assert [queue.status(job_id).position for job_id in batch] == [0, 2, 3]
+    assert queue.status(lookup).position == 1
+    gate.set()
+    wait_for(lambda: len(order) == 4)
+    assert order == ['alice 0', 'bob', 'alice 1', 'alice 2']
+
+def test_cancel_only_affects_queued_jobs(gate):
+    queue = AnalysisQueue(Extractor, max_workers=1)
+    running = queue.submit('alice', None, blocked(gate))
+    wait_for(lambda: queue.status(running).status == 'running')
+    queued = queue.submit('alice', None, blocked(gate))
+    assert queue.cancel(queued) is True
+    assert queue.status(queued).status == 'cancelled'
+    assert queue.cancel(running) is False
+
+def test_finished_jobs_are_bounded():
+    queue = AnalysisQueue(Extractor, max_workers=2, keep_finished=3)
+    ids = [queue.submit('alice', None, lambda extractor, progress: None) for _ in range(10)]
+    forgotten = queue.submit('alice', None, lambda extractor, progress: None, keep_result=False)
+    wait_for(lambda: queue.stats()['queued'] + queue.stats()['running'] == 0)
+    assert queue.status(forgotten) is None
+    assert sum(queue.status(job_id) is not None for job_id in ids) == 3
+
+def test_queue_executor_keeps_only_queued_ids(gate):
+    queue = AnalysisQueue(Extractor, max_workers=2)
+    executor = QueueExecutor(queue, 'alice', label='Batch')
+    done = []
+    for i in range(50):
+        executor.submit(done.append, i)
+    wait_for(lambda: len(done) == 50)
+    assert executor._queued == set()
+    for _ in range(2):
+        executor.submit(gate.wait, 30)
+    waiting = [executor.submit(done.append, i) for i in range(3)]
+    wait_for(lambda: executor._queued == set(waiting))
+    assert queue.stats()['running'] == 2
+    executor.shutdown(cancel_futures=True)
+    assert [queue.status(job_id) for job_id in waiting] == [None] * 3
+    gate.set()
+    wait_for(lambda: queue.stats()['running'] == 0)
+    assert len(done) == 50
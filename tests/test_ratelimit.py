@@ -0,0 +1,58 @@
+import pytest
+
+import leadgen_ratelimit
+from leadgen_ratelimit import HOST_RATES, RateLimiter, RateLimitMixin, TokenBucket, parse_retry_after
+
+def test_bucket_allows_a_burst_then_spaces_requests():
+    bucket = TokenBucket(rate=2.0, burst=2)
+    bucket.updated = 0.0
+    assert bucket.reserve(0.0) == 0.0
+    assert bucket.reserve(0.0) == 0.0
+    assert bucket.reserve(0.0) == pytest.approx(0.5)
+    assert bucket.reserve(0.0) == pytest.approx(1.0)
+    assert bucket.reserve(10.0) == 0.0
+
+def test_parse_retry_after():
+    assert parse_retry_after('30') == 30.0
+    assert parse_retry_after('Thu, 01 Jan 1970 00:01:00 GMT', now=0) == 60.0
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
+
+def test_throttled_responses_halve_the_rate_and_successes_restore_it():
+    limiter = RateLimiter({'example.com': (4.0, 1)})
+    limiter.observe('example.com', 429, '5')
+    (row,) = limiter.metrics()
+    assert row['rate_per_sec'] == 2.0
+    assert row['throttled'] == 1
+    assert 4.0 < row['blocked_for'] <= 5.0
+    assert limiter.reserve('example.com') > 4.0
+    for _ in range(20):
+        limiter.observe('example.com', 200)
+    assert limiter.metrics()[0]['rate_per_sec'] == 4.0
+
+def test_set_rate_changes_the_base_rate():
+    limiter = RateLimiter()
+    limiter.set_rate('example.com', 10.0, burst=5)
+    assert limiter.host_rates['example.com'] == (10.0, 5)
+    assert limiter.metrics()[0]['base_rate_per_sec'] == 10.0
+
+class Extractor:
+    def extract_company_profile(self, company_name):
+        return {'company_name': company_name}
+
+class Throttled(RateLimitMixin, Extractor):
+    pass
+
+def test_mixin_reserves_every_source_host_and_waits_for_the_slowest(monkeypatch):
+    slept = []
+    monkeypatch.setattr(leadgen_ratelimit.time, 'sleep', slept.append)
+    extractor = Throttled()
+    extractor.rate_limiter = RateLimiter()
+    assert extractor.extract_company_profile('Acme') == {'company_name': 'Acme'}
+    assert slept == []
+    extractor.extract_company_profile('Globex')
+    rate, _ = HOST_RATES['www.google.com']
+    assert slept == [pytest.approx(1 / rate, rel=0.01)]
+    rows = {row['host']: row for row in extractor.rate_limiter.metrics()}
+    assert set(rows) == set(HOST_RATES)
+    assert all(row['requests'] == 2 for row in rows.values())
@@ -0,0 +1,91 @@
+import pytest
+
+import leadgen_resolve
+from leadgen_cache import ProfileCache
+from leadgen_resolve import CompanyIndex, batch_company_index, domain_label, resolution_key
+
+@pytest.mark.parametrize('text, label', [
+    ('openai.com', 'openai'),
+    ('https://www.openai.com/about', 'openai'),
+    ('bbc.co.uk', 'bbc'),
+    ('OpenAI', None),
+    ('Open AI, Inc.', None),
+    ('version 2.0', None),
+])
+def test_domain_label(text, label):
+    assert domain_label(text) == label
+
+@pytest.mark.parametrize('text', ['OpenAI', 'Open AI, Inc.', 'openai.com', 'https://www.openai.com', 'OPEN AI'])
+def test_resolution_key_collapses_variants(text):
+    assert resolution_key(text) == 'openai'
+
+def test_resolve_exact_variants_to_one_company():
+    index = CompanyIndex(['OpenAI'])
+    for text in ('Open AI Inc.', 'openai.com', 'https://www.openai.com/about'):
+        resolution = index.resolve(text)
+        assert resolution.name == 'OpenAI'
+        assert resolution.score == 1.0
+    assert len(index) == 1
+
+def test_resolve_fuzzy_match_above_threshold():
+    index = CompanyIndex(['International Business Machines'])
+    resolution = index.resolve('International Busines Machines')
+    assert resolution.name == 'International Business Machines'
+    assert index.threshold <= resolution.score < 1.0
+
+@pytest.mark.parametrize('known, other', [
+    ('Stripe', 'Stripes'),
+    ('Pinecone', 'Pinecones'),
+    ('Anthropic', 'Anthropics'),
+    ('Acme Labs', 'Acme Lab'),
+    ('Acme Robotics', 'Acme Robotic'),
+    ('Boston Dynamics', 'Boston Dynamic'),
+])
+def test_companies_a_letter_apart_stay_distinct(known, other):
+    index = CompanyIndex([known])
+    assert index.lookup(other) is None
+    assert index.resolve(other).name == other
+    assert len(index) == 2
+
+def test_resolve_registers_unmatched_names():
+    index = CompanyIndex(['OpenAI'])
+    assert index.lookup('Stripe') is None
+    assert index.resolve('Stripe Ltd').name == 'Stripe Ltd'
+    assert index.resolve('stripe').name == 'Stripe Ltd'
+    assert len(index) == 2
+
+def test_short_keys_are_not_matched_fuzzily():
+    index = CompanyIndex(['IBM', 'Acme Robotics'], threshold=0.5)
+    assert index.lookup('IBX') is None
+    assert index.lookup('ibm').name == 'IBM'
+    assert index.lookup('Acme Robotic') is None
+
+def test_threshold_controls_fuzzy_matches():
+    index = CompanyIndex(['International Business Machines'], threshold=0.95)
+    assert index.lookup('International Busines Machines') is None
+    assert CompanyIndex(['Palantir Technologies']).lookup('Palantir Technolgies') is None
+    assert CompanyIndex(['Palantir Technologies'], threshold=0.85).lookup('Palantir Technolgies') is not None
+
+def test_index_stops_growing_at_max_names():
+    index = CompanyIndex(['OpenAI'], max_names=2)
+    assert index.resolve('Stripe').name == 'Stripe'
+    assert index.resolve('Globex Corp').name == 'Globex Corp'
+    assert index.resolve('globex corp').name == 'globex corp'
+    assert index.resolve('openai.com').name == 'OpenAI'
+    assert len(index) == 2
+
+def test_each_batch_gets_its_own_seeded_index(tmp_path, monkeypatch):
+    cache = ProfileCache(str(tmp_path / 'profiles.sqlite'))
+    cache.put('OpenAI', {'company_name': 'OpenAI'})
+    monkeypatch.setattr(leadgen_resolve, 'get_profile_cache', lambda: cache)
+    first, second = batch_company_index(), batch_company_index()
+    assert first is not second
+    assert first.resolve('openai.com').name == 'OpenAI'
+    first.resolve('Stripe')
+    assert second.lookup('Stripe') is None
+
+def test_empty_input_is_passed_through():
+    index = CompanyIndex()
+    resolution = index.resolve('  ')
+    assert resolution.name == ''
+    assert len(index) == 0
@@ -0,0 +1,83 @@
+import pandas as pd
+import pytest
+
+import leadgen_scoring
+from leadgen_cache import ProfileCache, ProfileCacheMixin
+from leadgen_pipeline import SourcePipelineMixin
+from leadgen_progress import ProgressMixin
+from leadgen_scoring import (
+    BASE_SCORE, SCORE_KEY, ScoringMixin, feature_frame, profile_score, score_frame, score_profile,
+)
+
+def lead(name='Acme', **fields):
+    return dict({
+        'company_name': name,
+        'founded_year': 2020,
+        'funding_rounds': [{'type': 'Seed', 'amount': '$2M'}],
+        'growth_signals': 'Hiring, Expansion',
+        'valuation': '$50M',
+        'team_size': 'N/A',
+    }, **fields)
+
+class FakeLeadGenAI:
+    calls = 0
+
+    def extract_company_profile(self, company_name):
+        FakeLeadGenAI.calls += 1
+        return lead(company_name, why_invest='Strong team. Investment score: 87/100')
+
+class Service(ProfileCacheMixin, ScoringMixin, SourcePipelineMixin, ProgressMixin, FakeLeadGenAI):
+    """LeadGenService's layers over a stand-in LeadGenAI."""
+
+    def __init__(self, cache):
+        self.profile_cache = cache
+
+def test_score_profile_sub_scores():
+    score = score_profile(lead(), now_year=2025)
+    assert score.sub_scores == {
+        'funding_rounds': 5, 'growth_signals': 10, 'growth_window': 10,
+        'early_stage': 0, 'valuation': 5, 'team_size': 0,
+    }
+    assert score.total == BASE_SCORE + 30
+    assert 'valued at $50M' in score.reasons
+
+def test_weights_change_the_total():
+    assert score_profile(lead(), {'valuation': 20}, now_year=2025).total == BASE_SCORE + 45
+
+def test_stated_score_is_folded_in_once_and_cached(tmp_path, monkeypatch):
+    FakeLeadGenAI.calls = 0
+    service = Service(ProfileCache(str(tmp_path / 'profiles.sqlite')))
+    profile = service.extract_company_profile('Acme')
+    stored = profile[SCORE_KEY]
+    assert stored['total'] == stored['stated'] == 87
+    assert stored['heuristic_total'] == score_profile(profile).total
+    monkeypatch.setattr(leadgen_scoring, 'score_profile', pytest.fail)
+    hit = service.extract_company_profile('Acme')
+    assert FakeLeadGenAI.calls == 1
+    assert hit[SCORE_KEY] == stored
+    assert profile_score(hit) == 87
+
+def test_profile_score_prefers_the_structured_total():
+    profile = lead(why_invest='Investment score: 10/100', **{SCORE_KEY: {'total': 64}})
+    assert profile_score(profile) == 64
+
+def test_profile_score_falls_back_for_legacy_profiles():
+    assert profile_score(lead(why_invest='Investment score: 55/100')) == 55
+    assert profile_score(lead()) == score_profile(lead()).total
+
+def test_score_frame_matches_score_profile():
+    profiles = [lead(), lead(founded_year=2025, funding_rounds=[]), lead(growth_signals='N/A', valuation='N/A')]
+    scores = score_frame(feature_frame(profiles, now_year=2025), {'growth_signals': 8})
+    expected = [score_profile(p, {'growth_signals': 8}, now_year=2025).total for p in profiles]
+    assert scores['investment_score'].tolist() == expected
+
+def test_score_frame_keeps_stated_scores():
+    stated = lead(**{SCORE_KEY: {'total': 87, 'stated': 87}})
+    scores = score_frame(feature_frame([stated, lead()], now_year=2025), {'valuation': 20})
+    assert scores['investment_score'].tolist() == [87, BASE_SCORE + 45]
+    assert scores['investment_score'].tolist()[0] == profile_score(stated)
+
+def test_score_frame_accepts_frames_without_stated_scores():
+    features = feature_frame([lead()], now_year=2025).drop(columns='stated_score')
+    assert score_frame(features)['investment_score'].tolist() == [BASE_SCORE + 30]
+    assert isinstance(score_frame(features), pd.DataFrame)
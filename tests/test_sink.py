@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+import leadgen_sink
+from leadgen_sink import ResultSink, count_rows, read_page, result_bytes
+
+def profile(i):
+    return {'company_name': f'Company {i}', 'industry': 'AI', 'funding_rounds': [{'type': 'Seed', 'amount': '$1M'}]}
+
+@pytest.mark.parametrize('fmt', ['csv', 'jsonl'])
+def test_text_sinks_write_each_row_at_once(tmp_path, fmt):
+    path = str(tmp_path / f'results.{fmt}')
+    with ResultSink(path, fmt) as sink:
+        assert sink.write(profile(0), 0) == [0]
+        assert sink.write(profile(1), 1) == [1]
+        assert count_rows(path) == 2
+    rows = read_page(path, 0, 10)
+    assert [row['company_name'] for row in rows] == ['Company 0', 'Company 1']
+    assert rows[0]['funding_rounds'] == 'Seed: $1M'
+
+@pytest.mark.parametrize('fmt', ['csv', 'jsonl'])
+def test_text_sinks_append_on_resume(tmp_path, fmt):
+    path = str(tmp_path / f'results.{fmt}')
+    with ResultSink(path, fmt) as sink:
+        sink.write(profile(0), 0)
+    with ResultSink(path, fmt, append=True) as sink:
+        sink.write(profile(1), 1)
+    assert [row['company_name'] for row in read_page(path)] == ['Company 0', 'Company 1']
+    with ResultSink(path, fmt) as sink:
+        sink.write(profile(2), 2)
+    assert count_rows(path) == 1
+
+def test_csv_rows_with_multiline_fields_count_once(tmp_path):
+    path = str(tmp_path / 'results.csv')
+    with ResultSink(path, 'csv') as sink:
+        for i in range(5):
+            sink.write(dict(profile(i), summary=f'Line one.\nLine two.\nLine {i}.'), i)
+    assert count_rows(path) == 5
+    assert read_page(path, 0, 10)[4]['summary'] == 'Line one.\nLine two.\nLine 4.'
+
+def test_read_page_pages(tmp_path):
+    path = str(tmp_path / 'results.csv')
+    with ResultSink(path, 'csv') as sink:
+        for i in range(25):
+            sink.write(profile(i), i)
+    assert [row['company_name'] for row in read_page(path, 2, 10)] == [f'Company {i}' for i in range(20, 25)]
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ResultSink(str(tmp_path / 'results.xml'), 'xml')
+
+@pytest.fixture
+def parquet(monkeypatch):
+    pytest.importorskip('pyarrow')
+    monkeypatch.setattr(leadgen_sink, 'PARQUET_ROW_GROUP', 4)
+
+def test_parquet_reports_keys_only_once_their_part_is_written(tmp_path, parquet):
+    path = str(tmp_path / 'results.parquet')
+    sink = ResultSink(path, 'parquet')
+    written = []
+    for i in range(10):
+        keys = sink.write(profile(i), i)
+        written += keys
+        assert count_rows(path) == len(written)
+    assert written == list(range(8))
+    assert sink.close() == [8, 9]
+    assert sink.close() == []
+    assert count_rows(path) == 10
+    assert sorted(os.listdir(path)) == ['part-0000.parquet', 'part-0001.parquet', 'part-0002.parquet']
+    assert [row['company_name'] for row in read_page(path, 1, 3)] == ['Company 3', 'Company 4', 'Company 5']
+
+def test_parquet_crash_loses_only_the_unwritten_tail(tmp_path, parquet):
+    path = str(tmp_path / 'results.parquet')
+    sink = ResultSink(path, 'parquet')
+    for i in range(6):
+        sink.write(profile(i), i)
+    del sink
+    assert count_rows(path) == 4
+    with open(os.path.join(path, 'part-0001.parquet'), 'wb') as f:
+        f.write(b'PAR1 truncated row group')
+    assert count_rows(path) == 4
+    with ResultSink(path, 'parquet', append=True) as sink:
+        for i in range(4, 6):
+            sink.write(profile(i), i)
+    assert 'part-0002.parquet' in os.listdir(path)
+    assert [row['company_name'] for row in read_page(path, 0, 10)] == [f'Company {i}' for i in range(6)]
+
+def test_parquet_download_combines_parts(tmp_path, parquet):
+    import io
+
+    import pyarrow.parquet as pq
+    path = str(tmp_path / 'results.parquet')
+    with ResultSink(path, 'parquet') as sink:
+        for i in range(6):
+            sink.write(profile(i), i)
+    table = pq.read_table(io.BytesIO(result_bytes(path)))
+    assert table.num_rows == 6
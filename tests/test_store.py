@@ -0,0 +1,82 @@
+import gc
+
+import pytest
+
+from leadgen_money import parsed_fields
+from leadgen_store import ProfileStore, ProfileView
+
+def profile(name, **fields):
+    return dict({
+        'company_name': name,
+        'industry': 'AI',
+        'locations': 'San Francisco',
+        'team_size': '51-200 employees',
+        'valuation': '$1B',
+        'summary': f'{name} builds things. ' * 20,
+        'funding_rounds': [{'type': 'Seed', 'amount': '$2M', 'date': '2021'}],
+        'contact_info': {'emails': [f'hello@{name.lower()}.com'], 'phones': []},
+    }, **fields)
+
+@pytest.fixture
+def store(tmp_path):
+    store = ProfileStore(max_bytes=64 * 1024 * 1024, spill_path=str(tmp_path / 'spill.sqlite'))
+    yield store
+    store.close()
+
+def test_put_returns_a_view_with_the_same_content(store):
+    original = profile('Acme')
+    view = store.put(original)
+    assert isinstance(view, ProfileView)
+    assert {key: value for key, value in view.items() if key != '_parsed'} == original
+    assert view.to_dict()['funding_rounds'] == original['funding_rounds']
+    assert parsed_fields(view)['valuation'].low == 1e9
+    assert '_parsed' not in original
+
+def test_identical_profiles_share_one_row(store):
+    first = store.put(profile('Acme'))
+    second = store.put(profile('Acme'))
+    assert second is first
+    assert store.put(first) is first
+    assert store.view(first.digest) is first
+    assert len(store) == 1
+
+def test_repeated_scalars_are_interned_once(store):
+    views = [store.put(profile(f'Company {i}')) for i in range(50)]
+    assert len(store) == 50
+    assert store.stats()['interned_values'] == 50 + len(('industry', 'locations', 'team_size', 'valuation'))
+    assert views[0]['industry'] is views[49]['industry']
+
+def test_dropped_views_free_their_rows(store):
+    kept = store.put(profile('Kept'))
+    for i in range(100):
+        store.put(profile(f'Transient {i}'))
+    gc.collect()
+    store.put(profile('Trigger'))
+    stats = store.stats()
+    assert stats['profiles'] == 1
+    assert stats['interned_values'] == 1 + len(('industry', 'locations', 'team_size', 'valuation'))
+    assert store.view(kept.digest) is kept
+    assert kept['company_name'] == 'Kept'
+
+def test_refresh_metadata_does_not_change_the_digest(store):
+    sources = {'crunchbase': {'source': 'crunchbase', 'fetched_at': 1.0, 'status': 'updated',
+                              'etag': '"a"', 'fields': {'industry': 'AI'}}}
+    first = store.put(profile('Acme', _sources=sources))
+    refreshed = profile('Acme', _sources={'crunchbase': dict(sources['crunchbase'], fetched_at=2.0,
+                                                             status='not_modified', etag='"b"')})
+    assert store.put(refreshed) is first
+    assert first['_sources']['crunchbase']['fetched_at'] == 2.0
+    changed = profile('Acme', _sources={'crunchbase': dict(sources['crunchbase'], fields={'industry': 'ML'})})
+    assert store.put(changed) is not first
+
+def test_over_the_cap_blobs_spill_and_read_back(store):
+    views = [store.put(profile(f'Company {i}')) for i in range(40)]
+    store.set_max_bytes(store.nbytes() // 2)
+    stats = store.stats()
+    assert stats['spilled'] > 0
+    assert stats['resident_blobs'] + stats['spilled'] == 40
+    assert [view['summary'].split()[1] for view in views] == [str(i) for i in range(40)]
+    del views
+    gc.collect()
+    store.put(profile('Trigger'))
+    assert store.stats()['spilled'] == 0
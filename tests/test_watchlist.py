@@ -0,0 +1,128 @@
+import pytest
+
+from leadgen_cache import DAY, ProfileCache
+from leadgen_watchlist import (
+    QUEUE_OWNER, WatchlistScheduler, WatchlistStore, describe_change, next_slot, refresh_watched,
+    watch_changes,
+)
+
+def profile(name='Acme', rounds=(), signals='Hiring', **fields):
+    return dict({
+        'company_name': name,
+        'funding_rounds': [{'type': t, 'amount': a} for t, a in rounds],
+        'growth_signals': signals,
+        'valuation': '$50M',
+    }, **fields)
+
+class Extractor:
+    """Stand-in for a queue worker's LeadGenService that records each call."""
+
+    use_source_pipeline = False
+
+    def __init__(self):
+        self.calls = []
+
+    def extract_company_profile(self, company_name, refresh=False, progress=None, pipeline=None):
+        self.calls.append(('extract', pipeline))
+        return profile(company_name, rounds=[('Seed', '$2M'), ('Series A', '$10M')])
+
+    def refresh_company_profile(self, previous, progress=None, revalidate=False):
+        self.calls.append(('refresh', revalidate))
+        return dict(previous, valuation='$80M'), []
+
+@pytest.fixture
+def store():
+    return WatchlistStore(':memory:')
+
+@pytest.fixture
+def cache(tmp_path):
+    return ProfileCache(str(tmp_path / 'profiles.sqlite'))
+
+def test_watch_changes_reports_new_rounds_and_signals():
+    old = profile(rounds=[('Seed', '$2M')], signals='Hiring, Expansion')
+    new = profile(rounds=[('Seed', '$2M'), ('Series A', '$10M')], signals='Hiring, New product')
+    changes = watch_changes(old, new)
+    assert ('funding_rounds', 'new_round', None, {'type': 'Series A', 'amount': '$10M'}) in changes
+    assert ('growth_signals', 'signals', ['Expansion'], ['New product']) in changes
+    assert len(changes) == 2
+
+def test_watch_changes_ignores_unwatched_fields_and_first_profiles():
+    assert watch_changes(profile(summary='Old'), profile(summary='New')) == []
+    assert watch_changes(None, profile()) == []
+
+def test_next_slot_is_strictly_after_now():
+    assert next_slot(10, 100, 5) == 10
+    assert next_slot(10, 100, 10) == 110
+    assert next_slot(10, 100, 250) == 310
+
+def test_companies_are_spread_over_their_interval(store):
+    for i in range(20):
+        store.add(f'Company {i}', DAY, now=0)
+    due = sorted(w.next_due for w in store.list())
+    gaps = [b - a for a, b in zip(due, due[1:])]
+    assert all(0 < d <= DAY for d in due)
+    assert max(gaps) < DAY / 10
+    assert store.refresh_rate() == pytest.approx(20 / DAY)
+
+def test_claim_due_moves_companies_to_their_next_slot(store):
+    store.add('Acme', DAY, now=0)
+    (watched,) = store.list()
+    assert store.claim_due(now=watched.next_due - 1) == []
+    assert store.claim_due(now=watched.next_due) == ['Acme']
+    assert store.claim_due(now=watched.next_due) == []
+    assert store.list()[0].next_due == watched.next_due + DAY
+    store.refresh_now('acme', now=watched.next_due + 5)
+    assert store.claim_due(now=watched.next_due + 5) == ['Acme']
+
+def test_feed_filters_by_company_field_and_time(store):
+    store.add('Acme', now=0)
+    store.add('Globex', now=0)
+    store.mark_refreshed('Acme', 'done', changes=[('valuation', 'changed', '$50M', '$80M')], now=10)
+    store.mark_refreshed('Globex', 'done', changes=[('team_size', 'changed', '10', '20')], now=20)
+    assert [c.company_name for c in store.feed()] == ['Globex', 'Acme']
+    assert [c.field for c in store.feed(company_name='acme')] == ['valuation']
+    assert [c.company_name for c in store.feed(fields=['team_size'])] == ['Globex']
+    assert [c.company_name for c in store.feed(since=10)] == ['Globex']
+    assert describe_change(store.feed(company_name='Acme')[0]) == 'Valuation: $50M → $80M'
+    assert {w.company_name: w.changes for w in store.list()} == {'Acme': 1, 'Globex': 1}
+
+def test_pipeline_profiles_are_refreshed_through_the_pipeline(cache):
+    cache.put('Acme', profile(_sources={'crunchbase': {'fields': {}}}))
+    extractor = Extractor()
+    refreshed, changes = refresh_watched(extractor, 'Acme', cache=cache)
+    assert extractor.calls == [('refresh', True)]
+    assert refreshed['valuation'] == '$80M'
+    assert changes == [('valuation', 'changed', '$50M', '$80M')]
+    assert extractor.use_source_pipeline is False
+
+def test_default_profiles_are_refreshed_without_the_pipeline(cache):
+    cache.put('Acme', profile(rounds=[('Seed', '$2M')]))
+    extractor = Extractor()
+    extractor.use_source_pipeline = True
+    _, changes = refresh_watched(extractor, 'Acme', cache=cache)
+    assert extractor.calls == [('extract', False)]
+    assert [kind for _, kind, _, _ in changes] == ['new_round']
+    assert extractor.use_source_pipeline is True
+
+def test_first_refresh_uses_the_extractors_own_setting(cache):
+    extractor = Extractor()
+    _, changes = refresh_watched(extractor, 'Acme', cache=cache)
+    assert extractor.calls == [('extract', None)]
+    assert changes == []
+
+class Queue:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, owner, key, task, label=None, keep_result=True):
+        self.submitted.append((owner, key, label))
+
+def test_scheduler_caps_claims_per_tick(store):
+    for i in range(10):
+        store.add(f'Company {i}', DAY, now=0)
+    queue = Queue()
+    scheduler = WatchlistScheduler(store, queue, tick=DAY / 5)
+    assert scheduler.run_once(now=10 * DAY) == 4
+    assert queue.submitted[0][0] == QUEUE_OWNER
+    assert scheduler.run_once(now=10 * DAY) == 4
+    assert scheduler.run_once(now=10 * DAY) == 2